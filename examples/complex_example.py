@@ -9,6 +9,8 @@ and multiple simultaneous connections.
 from python_tcp.core import *
 from python_tcp.server import EventDrivenTCPServer
 from python_tcp.client import EventDrivenTCPClient
+from python_tcp.routing import MessageRouter, RouteError
+from python_tcp.caching import ResponseCache
 import threading
 import time
 import json
@@ -48,75 +50,76 @@ def run_server(port=8000):
         Colors.BLUE
     ))
     
-    # Set up a custom message handler that processes JSON
-    def message_handler(conn_id, data):
+    # Route JSON commands to their handlers
+    def error_response(request, reason):
+        return {
+            'status': 'error',
+            'message': reason,
+            'timestamp': time.time()
+        }
+    
+    router = MessageRouter(key='command', on_error=error_response)
+    
+    @router.route('echo')
+    def echo_command(request):
+        # Simple echo response
+        return {
+            'status': 'success',
+            'command': 'echo',
+            'data': request.message.get('data', ''),
+            'timestamp': time.time()
+        }
+    
+    @router.route('random')
+    def random_command(request):
+        # Generate a random number within the given range
         try:
-            # Try to parse as JSON
-            message = json.loads(data.decode('utf-8'))
+            min_val = request.message.get('min', 1)
+            max_val = request.message.get('max', 100)
+            random_num = random.randint(min_val, max_val)
             
-            if isinstance(message, dict) and 'command' in message:
-                command = message['command']
-                
-                if command == 'echo':
-                    # Simple echo response
-                    return json.dumps({
-                        'status': 'success',
-                        'command': 'echo',
-                        'data': message.get('data', ''),
-                        'timestamp': time.time()
-                    }).encode('utf-8')
-                
-                elif command == 'random':
-                    # Generate a random number within the given range
-                    try:
-                        min_val = message.get('min', 1)
-                        max_val = message.get('max', 100)
-                        random_num = random.randint(min_val, max_val)
-                        
-                        return json.dumps({
-                            'status': 'success',
-                            'command': 'random',
-                            'result': random_num,
-                            'timestamp': time.time()
-                        }).encode('utf-8')
-                    except Exception as e:
-                        return json.dumps({
-                            'status': 'error',
-                            'command': 'random',
-                            'message': str(e),
-                            'timestamp': time.time()
-                        }).encode('utf-8')
-                
-                elif command == 'time':
-                    # Return the current server time
-                    current_time = time.strftime('%Y-%m-%d %H:%M:%S')
-                    return json.dumps({
-                        'status': 'success',
-                        'command': 'time',
-                        'result': current_time,
-                        'timestamp': time.time()
-                    }).encode('utf-8')
-                
-                else:
-                    # Unknown command
-                    return json.dumps({
-                        'status': 'error',
-                        'message': f"Unknown command: {command}",
-                        'timestamp': time.time()
-                    }).encode('utf-8')
-            else:
-                # Not a valid command format
-                return json.dumps({
-                    'status': 'error',
-                    'message': "Invalid message format. Expected JSON with 'command' field.",
-                    'timestamp': time.time()
-                }).encode('utf-8')
-                
-        except json.JSONDecodeError:
-            # Not JSON, just echo it back
-            return data
+            return {
+                'status': 'success',
+                'command': 'random',
+                'result': random_num,
+                'timestamp': time.time()
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'command': 'random',
+                'message': str(e),
+                'timestamp': time.time()
+            }
+    
+    @router.route('time')
+    def time_command(request):
+        # Return the current server time
+        current_time = time.strftime('%Y-%m-%d %H:%M:%S')
+        return {
+            'status': 'success',
+            'command': 'time',
+            'result': current_time,
+            'timestamp': time.time()
+        }
+    
+    def unknown_command(request):
+        if isinstance(request.message, dict) and 'command' in request.message:
+            raise RouteError(f"Unknown command: {request.route}")
+        # Not a valid command format
+        raise RouteError("Invalid message format. Expected JSON with 'command' field.")
+    
+    router.set_default_handler(unknown_command)
+    
+    # Not JSON, just echo it back
+    router.set_invalid_handler(lambda request: request.data)
+    
+    # The time command is read-only and only changes once a second, so cache it
+    # briefly; every other command goes straight to the router
+    def cache_key(conn_id, data):
+        return data if data == b'{"command": "time"}' else None
     
-    server.set_message_handler(message_handler)
+    server.set_message_handler(ResponseCache(router, max_entries=16, ttl=1.0, key=cache_key))
     server.start()
     return server
 
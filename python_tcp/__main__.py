@@ -0,0 +1,8 @@
+"""Run the command line interface with `python -m python_tcp`."""
+
+import sys
+
+from python_tcp.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,15 +5,83 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://Matthew-Redrup.github.io',
                 'git_url': 'https://github.com/Matthew-Redrup/python-tcp',
                 'lib_path': 'python_tcp'},
-  'syms': { 'python_tcp.chat_app': { 'python_tcp.chat_app.ChatClient': ('chat_app.html#chatclient', 'python_tcp/chat_app.py'),
+  'syms': { 'python_tcp.benchmarks': { 'python_tcp.benchmarks._PerMessageZlib': ( 'benchmarks.html#_permessagezlib',
+                                                                                  'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._PerMessageZlib.compress': ( 'benchmarks.html#_permessagezlib.compress',
+                                                                                           'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._PerMessageZlib.decompress': ( 'benchmarks.html#_permessagezlib.decompress',
+                                                                                             'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._chat_room': ('benchmarks.html#_chat_room', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._connect_loop': ('benchmarks.html#_connect_loop', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._echo_round_trips': ( 'benchmarks.html#_echo_round_trips',
+                                                                                    'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._echo_throughput': ( 'benchmarks.html#_echo_throughput',
+                                                                                   'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._open_many': ('benchmarks.html#_open_many', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._pipelined_requests': ( 'benchmarks.html#_pipelined_requests',
+                                                                                      'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks._shared_memory_server': ( 'benchmarks.html#_shared_memory_server',
+                                                                                        'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_accept': ('benchmarks.html#bench_accept', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_batching': ( 'benchmarks.html#bench_batching',
+                                                                                 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_chat_batching': ( 'benchmarks.html#bench_chat_batching',
+                                                                                      'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_compression': ( 'benchmarks.html#bench_compression',
+                                                                                    'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_connections': ( 'benchmarks.html#bench_connections',
+                                                                                    'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_proxy': ('benchmarks.html#bench_proxy', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_shared_memory': ( 'benchmarks.html#bench_shared_memory',
+                                                                                      'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.bench_transports': ( 'benchmarks.html#bench_transports',
+                                                                                   'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.print_results': ('benchmarks.html#print_results', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.quiet': ('benchmarks.html#quiet', 'python_tcp/benchmarks.py'),
+                                       'python_tcp.benchmarks.sample_messages': ( 'benchmarks.html#sample_messages',
+                                                                                  'python_tcp/benchmarks.py')},
+            'python_tcp.caching': { 'python_tcp.caching.ResponseCache': ('caching.html#responsecache', 'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache.__call__': ( 'caching.html#responsecache.__call__',
+                                                                                   'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache.__init__': ( 'caching.html#responsecache.__init__',
+                                                                                   'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache._compute': ( 'caching.html#responsecache._compute',
+                                                                                   'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache._store': ( 'caching.html#responsecache._store',
+                                                                                 'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache.clear': ('caching.html#responsecache.clear', 'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache.invalidate': ( 'caching.html#responsecache.invalidate',
+                                                                                     'python_tcp/caching.py'),
+                                    'python_tcp.caching.ResponseCache.stats': ('caching.html#responsecache.stats', 'python_tcp/caching.py'),
+                                    'python_tcp.caching._PendingResponse': ('caching.html#_pendingresponse', 'python_tcp/caching.py'),
+                                    'python_tcp.caching._PendingResponse.__init__': ( 'caching.html#_pendingresponse.__init__',
+                                                                                      'python_tcp/caching.py'),
+                                    'python_tcp.caching._PendingResponse.result': ( 'caching.html#_pendingresponse.result',
+                                                                                    'python_tcp/caching.py'),
+                                    'python_tcp.caching.payload_key': ('caching.html#payload_key', 'python_tcp/caching.py')},
+            'python_tcp.chat_app': { 'python_tcp.chat_app.ChatClient': ('chat_app.html#chatclient', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient.__init__': ( 'chat_app.html#chatclient.__init__',
                                                                                   'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_batch': ( 'chat_app.html#chatclient._handle_batch',
+                                                                                       'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient._handle_chat_message': ( 'chat_app.html#chatclient._handle_chat_message',
                                                                                               'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient._handle_error': ( 'chat_app.html#chatclient._handle_error',
                                                                                        'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient._handle_goodbye': ( 'chat_app.html#chatclient._handle_goodbye',
                                                                                          'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_join': ( 'chat_app.html#chatclient._handle_join',
+                                                                                      'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_leave': ( 'chat_app.html#chatclient._handle_leave',
+                                                                                       'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_resume_failed': ( 'chat_app.html#chatclient._handle_resume_failed',
+                                                                                               'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_resumed': ( 'chat_app.html#chatclient._handle_resumed',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_search_results': ( 'chat_app.html#chatclient._handle_search_results',
+                                                                                                'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._handle_unknown': ( 'chat_app.html#chatclient._handle_unknown',
+                                                                                         'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient._handle_users': ( 'chat_app.html#chatclient._handle_users',
                                                                                        'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient._handle_welcome': ( 'chat_app.html#chatclient._handle_welcome',
@@ -26,112 +94,701 @@ d = { 'settings': { 'branch': 'main',
                                                                                           'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient._on_error': ( 'chat_app.html#chatclient._on_error',
                                                                                    'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._on_message_error': ( 'chat_app.html#chatclient._on_message_error',
+                                                                                           'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._on_reconnected': ( 'chat_app.html#chatclient._on_reconnected',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient._track_sequence': ( 'chat_app.html#chatclient._track_sequence',
+                                                                                         'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient.connect': ( 'chat_app.html#chatclient.connect',
                                                                                  'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient.join': ('chat_app.html#chatclient.join', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient.leave': ('chat_app.html#chatclient.leave', 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient.request_users': ( 'chat_app.html#chatclient.request_users',
+                                                                                       'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatClient.search': ('chat_app.html#chatclient.search', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient.send_message': ( 'chat_app.html#chatclient.send_message',
                                                                                       'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatClient.set_message_callback': ( 'chat_app.html#chatclient.set_message_callback',
                                                                                               'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory': ('chat_app.html#chathistory', 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory.__init__': ( 'chat_app.html#chathistory.__init__',
+                                                                                   'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory.__len__': ( 'chat_app.html#chathistory.__len__',
+                                                                                  'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory._contains': ( 'chat_app.html#chathistory._contains',
+                                                                                    'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory._evict_oldest': ( 'chat_app.html#chathistory._evict_oldest',
+                                                                                        'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory._unindex': ( 'chat_app.html#chathistory._unindex',
+                                                                                   'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory.add': ('chat_app.html#chathistory.add', 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory.search': ( 'chat_app.html#chathistory.search',
+                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatHistory.tokenize': ( 'chat_app.html#chathistory.tokenize',
+                                                                                   'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer': ('chat_app.html#chatserver', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer.__init__': ( 'chat_app.html#chatserver.__init__',
                                                                                   'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._all_usernames': ( 'chat_app.html#chatserver._all_usernames',
+                                                                                        'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._broadcast': ( 'chat_app.html#chatserver._broadcast',
                                                                                     'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._broadcast_message': ( 'chat_app.html#chatserver._broadcast_message',
                                                                                             'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._broadcast_presence_delta': ( 'chat_app.html#chatserver._broadcast_presence_delta',
+                                                                                                   'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._broadcast_user_join': ( 'chat_app.html#chatserver._broadcast_user_join',
                                                                                               'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._broadcast_user_leave': ( 'chat_app.html#chatserver._broadcast_user_leave',
                                                                                                'python_tcp/chat_app.py'),
-                                     'python_tcp.chat_app.ChatServer._broadcast_user_list': ( 'chat_app.html#chatserver._broadcast_user_list',
-                                                                                              'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._create_error_response': ( 'chat_app.html#chatserver._create_error_response',
                                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._deliver': ( 'chat_app.html#chatserver._deliver',
+                                                                                  'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._detach_session': ( 'chat_app.html#chatserver._detach_session',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._end_session': ( 'chat_app.html#chatserver._end_session',
+                                                                                      'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._expire_session': ( 'chat_app.html#chatserver._expire_session',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._flush_broadcasts': ( 'chat_app.html#chatserver._flush_broadcasts',
+                                                                                           'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._handle_ack': ( 'chat_app.html#chatserver._handle_ack',
+                                                                                     'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._handle_chat_message': ( 'chat_app.html#chatserver._handle_chat_message',
                                                                                               'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._handle_join': ( 'chat_app.html#chatserver._handle_join',
                                                                                       'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._handle_leave': ( 'chat_app.html#chatserver._handle_leave',
                                                                                        'python_tcp/chat_app.py'),
-                                     'python_tcp.chat_app.ChatServer._handle_message': ( 'chat_app.html#chatserver._handle_message',
-                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._handle_resume': ( 'chat_app.html#chatserver._handle_resume',
+                                                                                        'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._handle_search': ( 'chat_app.html#chatserver._handle_search',
+                                                                                        'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._handle_users_request': ( 'chat_app.html#chatserver._handle_users_request',
+                                                                                               'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._is_framed': ( 'chat_app.html#chatserver._is_framed',
+                                                                                    'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._move_user': ( 'chat_app.html#chatserver._move_user',
+                                                                                    'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._on_client_connect': ( 'chat_app.html#chatserver._on_client_connect',
                                                                                             'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._on_client_disconnect': ( 'chat_app.html#chatserver._on_client_disconnect',
                                                                                                'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer._on_data_received': ( 'chat_app.html#chatserver._on_data_received',
                                                                                            'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._queue_broadcast': ( 'chat_app.html#chatserver._queue_broadcast',
+                                                                                          'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._schedule_presence_update': ( 'chat_app.html#chatserver._schedule_presence_update',
+                                                                                                   'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._send_to_all': ( 'chat_app.html#chatserver._send_to_all',
+                                                                                      'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._send_user_snapshot': ( 'chat_app.html#chatserver._send_user_snapshot',
+                                                                                             'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._start_session': ( 'chat_app.html#chatserver._start_session',
+                                                                                        'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer._username_taken': ( 'chat_app.html#chatserver._username_taken',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer.set_batch_window': ( 'chat_app.html#chatserver.set_batch_window',
+                                                                                          'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer.set_history': ( 'chat_app.html#chatserver.set_history',
+                                                                                     'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatServer.set_sessions': ( 'chat_app.html#chatserver.set_sessions',
+                                                                                      'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer.start': ('chat_app.html#chatserver.start', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.ChatServer.stop': ('chat_app.html#chatserver.stop', 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatSession': ('chat_app.html#chatsession', 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatSession.__init__': ( 'chat_app.html#chatsession.__init__',
+                                                                                   'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatSession.acknowledge': ( 'chat_app.html#chatsession.acknowledge',
+                                                                                      'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatSession.add': ('chat_app.html#chatsession.add', 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.ChatSession.replay': ( 'chat_app.html#chatsession.replay',
+                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer': ( 'chat_app.html#federatedchatserver',
+                                                                                  'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer.__init__': ( 'chat_app.html#federatedchatserver.__init__',
+                                                                                           'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._all_usernames': ( 'chat_app.html#federatedchatserver._all_usernames',
+                                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._claim_remote': ( 'chat_app.html#federatedchatserver._claim_remote',
+                                                                                                'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._close_link': ( 'chat_app.html#federatedchatserver._close_link',
+                                                                                              'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._evict': ( 'chat_app.html#federatedchatserver._evict',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._handle_chat_message': ( 'chat_app.html#federatedchatserver._handle_chat_message',
+                                                                                                       'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._handle_join': ( 'chat_app.html#federatedchatserver._handle_join',
+                                                                                               'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._handle_leave': ( 'chat_app.html#federatedchatserver._handle_leave',
+                                                                                                'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._handle_peer_hello': ( 'chat_app.html#federatedchatserver._handle_peer_hello',
+                                                                                                     'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._handle_peer_welcome': ( 'chat_app.html#federatedchatserver._handle_peer_welcome',
+                                                                                                       'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._handle_relay': ( 'chat_app.html#federatedchatserver._handle_relay',
+                                                                                                'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._mark_seen': ( 'chat_app.html#federatedchatserver._mark_seen',
+                                                                                             'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._move_user': ( 'chat_app.html#federatedchatserver._move_user',
+                                                                                             'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._new_event': ( 'chat_app.html#federatedchatserver._new_event',
+                                                                                             'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._on_client_disconnect': ( 'chat_app.html#federatedchatserver._on_client_disconnect',
+                                                                                                        'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._open_link': ( 'chat_app.html#federatedchatserver._open_link',
+                                                                                             'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._relay': ( 'chat_app.html#federatedchatserver._relay',
+                                                                                         'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._relay_join': ( 'chat_app.html#federatedchatserver._relay_join',
+                                                                                              'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._relay_leave': ( 'chat_app.html#federatedchatserver._relay_leave',
+                                                                                               'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._relay_message': ( 'chat_app.html#federatedchatserver._relay_message',
+                                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._relay_users': ( 'chat_app.html#federatedchatserver._relay_users',
+                                                                                               'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._send_snapshot': ( 'chat_app.html#federatedchatserver._send_snapshot',
+                                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._send_to_links': ( 'chat_app.html#federatedchatserver._send_to_links',
+                                                                                                 'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer._username_taken': ( 'chat_app.html#federatedchatserver._username_taken',
+                                                                                                  'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer.add_peer': ( 'chat_app.html#federatedchatserver.add_peer',
+                                                                                           'python_tcp/chat_app.py'),
+                                     'python_tcp.chat_app.FederatedChatServer.stop': ( 'chat_app.html#federatedchatserver.stop',
+                                                                                       'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.run_chat_client': ('chat_app.html#run_chat_client', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.run_chat_server': ('chat_app.html#run_chat_server', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.start_client': ('chat_app.html#start_client', 'python_tcp/chat_app.py'),
                                      'python_tcp.chat_app.start_server': ('chat_app.html#start_server', 'python_tcp/chat_app.py')},
+            'python_tcp.cli': { 'python_tcp.cli._env': ('cli.html#_env', 'python_tcp/cli.py'),
+                                'python_tcp.cli._is_true': ('cli.html#_is_true', 'python_tcp/cli.py'),
+                                'python_tcp.cli._load_handler': ('cli.html#_load_handler', 'python_tcp/cli.py'),
+                                'python_tcp.cli._profile_on_signal': ('cli.html#_profile_on_signal', 'python_tcp/cli.py'),
+                                'python_tcp.cli._serve_until_stopped': ('cli.html#_serve_until_stopped', 'python_tcp/cli.py'),
+                                'python_tcp.cli._stop_on_sigterm': ('cli.html#_stop_on_sigterm', 'python_tcp/cli.py'),
+                                'python_tcp.cli.build_parser': ('cli.html#build_parser', 'python_tcp/cli.py'),
+                                'python_tcp.cli.cmd_bench': ('cli.html#cmd_bench', 'python_tcp/cli.py'),
+                                'python_tcp.cli.cmd_chat_client': ('cli.html#cmd_chat_client', 'python_tcp/cli.py'),
+                                'python_tcp.cli.cmd_chat_server': ('cli.html#cmd_chat_server', 'python_tcp/cli.py'),
+                                'python_tcp.cli.cmd_replay': ('cli.html#cmd_replay', 'python_tcp/cli.py'),
+                                'python_tcp.cli.cmd_serve': ('cli.html#cmd_serve', 'python_tcp/cli.py'),
+                                'python_tcp.cli.main': ('cli.html#main', 'python_tcp/cli.py')},
             'python_tcp.client': { 'python_tcp.client.AsyncTCPClient': ('tcp_client.html#asynctcpclient', 'python_tcp/client.py'),
                                    'python_tcp.client.AsyncTCPClient.__init__': ( 'tcp_client.html#asynctcpclient.__init__',
                                                                                   'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._abort_connection': ( 'tcp_client.html#asynctcpclient._abort_connection',
+                                                                                           'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._delivery_worker': ( 'tcp_client.html#asynctcpclient._delivery_worker',
+                                                                                          'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._end_delivery': ( 'tcp_client.html#asynctcpclient._end_delivery',
+                                                                                       'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._heartbeat_loop': ( 'tcp_client.html#asynctcpclient._heartbeat_loop',
+                                                                                         'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._on_connection_lost': ( 'tcp_client.html#asynctcpclient._on_connection_lost',
+                                                                                             'python_tcp/client.py'),
                                    'python_tcp.client.AsyncTCPClient._receive_loop': ( 'tcp_client.html#asynctcpclient._receive_loop',
                                                                                        'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._run_receive_callback': ( 'tcp_client.html#asynctcpclient._run_receive_callback',
+                                                                                               'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._start_delivery': ( 'tcp_client.html#asynctcpclient._start_delivery',
+                                                                                         'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient._wants_protocol': ( 'tcp_client.html#asynctcpclient._wants_protocol',
+                                                                                         'python_tcp/client.py'),
                                    'python_tcp.client.AsyncTCPClient.close': ( 'tcp_client.html#asynctcpclient.close',
                                                                                'python_tcp/client.py'),
                                    'python_tcp.client.AsyncTCPClient.connect': ( 'tcp_client.html#asynctcpclient.connect',
                                                                                  'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient.messages': ( 'tcp_client.html#asynctcpclient.messages',
+                                                                                  'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient.set_delivery_queue': ( 'tcp_client.html#asynctcpclient.set_delivery_queue',
+                                                                                            'python_tcp/client.py'),
                                    'python_tcp.client.AsyncTCPClient.set_error_callback': ( 'tcp_client.html#asynctcpclient.set_error_callback',
                                                                                             'python_tcp/client.py'),
+                                   'python_tcp.client.AsyncTCPClient.set_heartbeat': ( 'tcp_client.html#asynctcpclient.set_heartbeat',
+                                                                                       'python_tcp/client.py'),
                                    'python_tcp.client.AsyncTCPClient.set_receive_callback': ( 'tcp_client.html#asynctcpclient.set_receive_callback',
                                                                                               'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue': ('tcp_client.html#deliveryqueue', 'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.__init__': ( 'tcp_client.html#deliveryqueue.__init__',
+                                                                                 'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.__iter__': ( 'tcp_client.html#deliveryqueue.__iter__',
+                                                                                 'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.__len__': ( 'tcp_client.html#deliveryqueue.__len__',
+                                                                                'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.close': ('tcp_client.html#deliveryqueue.close', 'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.get': ('tcp_client.html#deliveryqueue.get', 'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.interrupt': ( 'tcp_client.html#deliveryqueue.interrupt',
+                                                                                  'python_tcp/client.py'),
+                                   'python_tcp.client.DeliveryQueue.put': ('tcp_client.html#deliveryqueue.put', 'python_tcp/client.py'),
                                    'python_tcp.client.EventDrivenTCPClient': ( 'tcp_client.html#eventdriventcpclient',
                                                                                'python_tcp/client.py'),
                                    'python_tcp.client.EventDrivenTCPClient.__init__': ( 'tcp_client.html#eventdriventcpclient.__init__',
                                                                                         'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient._end_delivery': ( 'tcp_client.html#eventdriventcpclient._end_delivery',
+                                                                                             'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient._on_connection_lost': ( 'tcp_client.html#eventdriventcpclient._on_connection_lost',
+                                                                                                   'python_tcp/client.py'),
                                    'python_tcp.client.EventDrivenTCPClient._on_data_received': ( 'tcp_client.html#eventdriventcpclient._on_data_received',
                                                                                                  'python_tcp/client.py'),
                                    'python_tcp.client.EventDrivenTCPClient._on_error': ( 'tcp_client.html#eventdriventcpclient._on_error',
                                                                                          'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient._queue_outbound': ( 'tcp_client.html#eventdriventcpclient._queue_outbound',
+                                                                                               'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient._reconnect': ( 'tcp_client.html#eventdriventcpclient._reconnect',
+                                                                                          'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient._replay_outbound': ( 'tcp_client.html#eventdriventcpclient._replay_outbound',
+                                                                                                'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient._trigger_disconnect': ( 'tcp_client.html#eventdriventcpclient._trigger_disconnect',
+                                                                                                   'python_tcp/client.py'),
                                    'python_tcp.client.EventDrivenTCPClient.close': ( 'tcp_client.html#eventdriventcpclient.close',
                                                                                      'python_tcp/client.py'),
                                    'python_tcp.client.EventDrivenTCPClient.connect': ( 'tcp_client.html#eventdriventcpclient.connect',
                                                                                        'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient.send': ( 'tcp_client.html#eventdriventcpclient.send',
+                                                                                    'python_tcp/client.py'),
+                                   'python_tcp.client.EventDrivenTCPClient.set_reconnect_policy': ( 'tcp_client.html#eventdriventcpclient.set_reconnect_policy',
+                                                                                                    'python_tcp/client.py'),
+                                   'python_tcp.client.HashRing': ('tcp_client.html#hashring', 'python_tcp/client.py'),
+                                   'python_tcp.client.HashRing.__init__': ('tcp_client.html#hashring.__init__', 'python_tcp/client.py'),
+                                   'python_tcp.client.HashRing._hash': ('tcp_client.html#hashring._hash', 'python_tcp/client.py'),
+                                   'python_tcp.client.HashRing.add': ('tcp_client.html#hashring.add', 'python_tcp/client.py'),
+                                   'python_tcp.client.HashRing.get': ('tcp_client.html#hashring.get', 'python_tcp/client.py'),
+                                   'python_tcp.client.HashRing.remove': ('tcp_client.html#hashring.remove', 'python_tcp/client.py'),
+                                   'python_tcp.client.ReconnectPolicy': ('tcp_client.html#reconnectpolicy', 'python_tcp/client.py'),
+                                   'python_tcp.client.ReconnectPolicy.delay': ( 'tcp_client.html#reconnectpolicy.delay',
+                                                                                'python_tcp/client.py'),
+                                   'python_tcp.client.Shard': ('tcp_client.html#shard', 'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient': ('tcp_client.html#shardedtcpclient', 'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.__init__': ( 'tcp_client.html#shardedtcpclient.__init__',
+                                                                                    'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient._call': ( 'tcp_client.html#shardedtcpclient._call',
+                                                                                 'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient._shard_for': ( 'tcp_client.html#shardedtcpclient._shard_for',
+                                                                                      'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.add_endpoint': ( 'tcp_client.html#shardedtcpclient.add_endpoint',
+                                                                                        'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.close': ( 'tcp_client.html#shardedtcpclient.close',
+                                                                                 'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.endpoint_for': ( 'tcp_client.html#shardedtcpclient.endpoint_for',
+                                                                                        'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.remove_endpoint': ( 'tcp_client.html#shardedtcpclient.remove_endpoint',
+                                                                                           'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.request': ( 'tcp_client.html#shardedtcpclient.request',
+                                                                                   'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.send': ( 'tcp_client.html#shardedtcpclient.send',
+                                                                                'python_tcp/client.py'),
+                                   'python_tcp.client.ShardedTCPClient.stats': ( 'tcp_client.html#shardedtcpclient.stats',
+                                                                                 'python_tcp/client.py'),
                                    'python_tcp.client.TCPClient': ('tcp_client.html#tcpclient', 'python_tcp/client.py'),
                                    'python_tcp.client.TCPClient.__init__': ('tcp_client.html#tcpclient.__init__', 'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._close_socket': ( 'tcp_client.html#tcpclient._close_socket',
+                                                                                  'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._configure_socket': ( 'tcp_client.html#tcpclient._configure_socket',
+                                                                                      'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._connect_socket': ( 'tcp_client.html#tcpclient._connect_socket',
+                                                                                    'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._decode': ('tcp_client.html#tcpclient._decode', 'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._hello_options': ( 'tcp_client.html#tcpclient._hello_options',
+                                                                                   'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._negotiate': ( 'tcp_client.html#tcpclient._negotiate',
+                                                                               'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._send_data': ( 'tcp_client.html#tcpclient._send_data',
+                                                                               'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._send_frame': ( 'tcp_client.html#tcpclient._send_frame',
+                                                                                'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient._wants_protocol': ( 'tcp_client.html#tcpclient._wants_protocol',
+                                                                                    'python_tcp/client.py'),
                                    'python_tcp.client.TCPClient.close': ('tcp_client.html#tcpclient.close', 'python_tcp/client.py'),
                                    'python_tcp.client.TCPClient.connect': ('tcp_client.html#tcpclient.connect', 'python_tcp/client.py'),
                                    'python_tcp.client.TCPClient.receive': ('tcp_client.html#tcpclient.receive', 'python_tcp/client.py'),
-                                   'python_tcp.client.TCPClient.send': ('tcp_client.html#tcpclient.send', 'python_tcp/client.py')},
-            'python_tcp.core': { 'python_tcp.core.SocketState': ('core.html#socketstate', 'python_tcp/core.py'),
+                                   'python_tcp.client.TCPClient.rtt': ('tcp_client.html#tcpclient.rtt', 'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient.send': ('tcp_client.html#tcpclient.send', 'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient.send_many': ('tcp_client.html#tcpclient.send_many', 'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient.set_compression': ( 'tcp_client.html#tcpclient.set_compression',
+                                                                                    'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient.set_connect_timeout': ( 'tcp_client.html#tcpclient.set_connect_timeout',
+                                                                                        'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient.set_keepalive': ( 'tcp_client.html#tcpclient.set_keepalive',
+                                                                                  'python_tcp/client.py'),
+                                   'python_tcp.client.TCPClient.set_shared_memory': ( 'tcp_client.html#tcpclient.set_shared_memory',
+                                                                                      'python_tcp/client.py')},
+            'python_tcp.core': { 'python_tcp.core.DNSCache': ('core.html#dnscache', 'python_tcp/core.py'),
+                                 'python_tcp.core.DNSCache.__init__': ('core.html#dnscache.__init__', 'python_tcp/core.py'),
+                                 'python_tcp.core.DNSCache.invalidate': ('core.html#dnscache.invalidate', 'python_tcp/core.py'),
+                                 'python_tcp.core.DNSCache.resolve': ('core.html#dnscache.resolve', 'python_tcp/core.py'),
+                                 'python_tcp.core.SocketState': ('core.html#socketstate', 'python_tcp/core.py'),
                                  'python_tcp.core.TCPConnection': ('core.html#tcpconnection', 'python_tcp/core.py'),
                                  'python_tcp.core.TCPConnection.__str__': ('core.html#tcpconnection.__str__', 'python_tcp/core.py'),
                                  'python_tcp.core.TCPConnection.update_state': ( 'core.html#tcpconnection.update_state',
                                                                                  'python_tcp/core.py'),
-                                 'python_tcp.core.get_free_port': ('core.html#get_free_port', 'python_tcp/core.py')},
+                                 'python_tcp.core._interleave_families': ('core.html#_interleave_families', 'python_tcp/core.py'),
+                                 'python_tcp.core.close_loopback': ('core.html#close_loopback', 'python_tcp/core.py'),
+                                 'python_tcp.core.configure_keepalive': ('core.html#configure_keepalive', 'python_tcp/core.py'),
+                                 'python_tcp.core.configure_listener': ('core.html#configure_listener', 'python_tcp/core.py'),
+                                 'python_tcp.core.connect_happy_eyeballs': ('core.html#connect_happy_eyeballs', 'python_tcp/core.py'),
+                                 'python_tcp.core.connect_loopback': ('core.html#connect_loopback', 'python_tcp/core.py'),
+                                 'python_tcp.core.format_address': ('core.html#format_address', 'python_tcp/core.py'),
+                                 'python_tcp.core.get_free_port': ('core.html#get_free_port', 'python_tcp/core.py'),
+                                 'python_tcp.core.is_loopback_address': ('core.html#is_loopback_address', 'python_tcp/core.py'),
+                                 'python_tcp.core.is_unix_address': ('core.html#is_unix_address', 'python_tcp/core.py'),
+                                 'python_tcp.core.listen_loopback': ('core.html#listen_loopback', 'python_tcp/core.py'),
+                                 'python_tcp.core.percentile': ('core.html#percentile', 'python_tcp/core.py'),
+                                 'python_tcp.core.resolve_address': ('core.html#resolve_address', 'python_tcp/core.py'),
+                                 'python_tcp.core.send_buffers': ('core.html#send_buffers', 'python_tcp/core.py'),
+                                 'python_tcp.core.socket_address': ('core.html#socket_address', 'python_tcp/core.py')},
+            'python_tcp.loadtest': { 'python_tcp.loadtest.LoadProfile': ('load_testing.html#loadprofile', 'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest.LoadProfile.ramp_time': ( 'load_testing.html#loadprofile.ramp_time',
+                                                                                    'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder': ('load_testing.html#_loadrecorder', 'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.__init__': ( 'load_testing.html#_loadrecorder.__init__',
+                                                                                     'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder._window': ( 'load_testing.html#_loadrecorder._window',
+                                                                                    'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.delivered': ( 'load_testing.html#_loadrecorder.delivered',
+                                                                                      'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.failed': ( 'load_testing.html#_loadrecorder.failed',
+                                                                                   'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.joined': ( 'load_testing.html#_loadrecorder.joined',
+                                                                                   'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.joining': ( 'load_testing.html#_loadrecorder.joining',
+                                                                                    'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.results': ( 'load_testing.html#_loadrecorder.results',
+                                                                                    'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._LoadRecorder.sending': ( 'load_testing.html#_loadrecorder.sending',
+                                                                                    'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._SimulatedUser': ('load_testing.html#_simulateduser', 'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._SimulatedUser.__init__': ( 'load_testing.html#_simulateduser.__init__',
+                                                                                      'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._SimulatedUser._handle_chat_message': ( 'load_testing.html#_simulateduser._handle_chat_message',
+                                                                                                  'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._SimulatedUser._handle_welcome': ( 'load_testing.html#_simulateduser._handle_welcome',
+                                                                                             'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._load_worker': ('load_testing.html#_load_worker', 'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest._summarize_load': ('load_testing.html#_summarize_load', 'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest.print_load_report': ( 'load_testing.html#print_load_report',
+                                                                                'python_tcp/loadtest.py'),
+                                     'python_tcp.loadtest.run_chat_load': ('load_testing.html#run_chat_load', 'python_tcp/loadtest.py')},
+            'python_tcp.profiling': { 'python_tcp.profiling.CPUAccounting': ('profiling.html#cpuaccounting', 'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.CPUAccounting.__init__': ( 'profiling.html#cpuaccounting.__init__',
+                                                                                       'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.CPUAccounting.measure': ( 'profiling.html#cpuaccounting.measure',
+                                                                                      'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.CPUAccounting.record': ( 'profiling.html#cpuaccounting.record',
+                                                                                     'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.CPUAccounting.report': ( 'profiling.html#cpuaccounting.report',
+                                                                                     'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.CPUAccounting.reset': ( 'profiling.html#cpuaccounting.reset',
+                                                                                    'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler': ( 'profiling.html#samplingprofiler',
+                                                                                 'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.__init__': ( 'profiling.html#samplingprofiler.__init__',
+                                                                                          'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler._sample_loop': ( 'profiling.html#samplingprofiler._sample_loop',
+                                                                                              'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.running': ( 'profiling.html#samplingprofiler.running',
+                                                                                         'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.sample': ( 'profiling.html#samplingprofiler.sample',
+                                                                                        'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.start': ( 'profiling.html#samplingprofiler.start',
+                                                                                       'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.stop': ( 'profiling.html#samplingprofiler.stop',
+                                                                                      'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.top': ( 'profiling.html#samplingprofiler.top',
+                                                                                     'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.SamplingProfiler.write_folded': ( 'profiling.html#samplingprofiler.write_folded',
+                                                                                              'python_tcp/profiling.py'),
+                                      'python_tcp.profiling._frame_label': ('profiling.html#_frame_label', 'python_tcp/profiling.py'),
+                                      'python_tcp.profiling._frame_stack': ('profiling.html#_frame_stack', 'python_tcp/profiling.py'),
+                                      'python_tcp.profiling._release_switch_interval': ( 'profiling.html#_release_switch_interval',
+                                                                                         'python_tcp/profiling.py'),
+                                      'python_tcp.profiling._request_switch_interval': ( 'profiling.html#_request_switch_interval',
+                                                                                         'python_tcp/profiling.py'),
+                                      'python_tcp.profiling._thread_cpu_time': ( 'profiling.html#_thread_cpu_time',
+                                                                                 'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.json_field_key': ('profiling.html#json_field_key', 'python_tcp/profiling.py'),
+                                      'python_tcp.profiling.profile_to_file': ( 'profiling.html#profile_to_file',
+                                                                                'python_tcp/profiling.py')},
+            'python_tcp.protocol': { 'python_tcp.protocol.Compressor': ('protocol.html#compressor', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.Compressor.compress': ( 'protocol.html#compressor.compress',
+                                                                                  'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.Compressor.decompress': ( 'protocol.html#compressor.decompress',
+                                                                                    'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.FrameType': ('protocol.html#frametype', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol': ('protocol.html#messageprotocol', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol.__init__': ( 'protocol.html#messageprotocol.__init__',
+                                                                                       'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol.compression_name': ( 'protocol.html#messageprotocol.compression_name',
+                                                                                               'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol.compression_ratio': ( 'protocol.html#messageprotocol.compression_ratio',
+                                                                                                'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol.encode': ( 'protocol.html#messageprotocol.encode',
+                                                                                     'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol.feed': ( 'protocol.html#messageprotocol.feed',
+                                                                                   'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.MessageProtocol.ping': ( 'protocol.html#messageprotocol.ping',
+                                                                                   'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.RTTStats': ('protocol.html#rttstats', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.RTTStats.__init__': ('protocol.html#rttstats.__init__', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.RTTStats.add': ('protocol.html#rttstats.add', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.RTTStats.percentile': ( 'protocol.html#rttstats.percentile',
+                                                                                  'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.RTTStats.summary': ('protocol.html#rttstats.summary', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.ZlibCompressor': ('protocol.html#zlibcompressor', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.ZlibCompressor.__init__': ( 'protocol.html#zlibcompressor.__init__',
+                                                                                      'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.ZlibCompressor.compress': ( 'protocol.html#zlibcompressor.compress',
+                                                                                      'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.ZlibCompressor.decompress': ( 'protocol.html#zlibcompressor.decompress',
+                                                                                        'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.build_hello': ('protocol.html#build_hello', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.choose_compressor': ('protocol.html#choose_compressor', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.create_protocol': ('protocol.html#create_protocol', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.read_hello': ('protocol.html#read_hello', 'python_tcp/protocol.py'),
+                                     'python_tcp.protocol.register_compressor': ( 'protocol.html#register_compressor',
+                                                                                  'python_tcp/protocol.py')},
+            'python_tcp.proxy': { 'python_tcp.proxy.Backend': ('proxy.html#backend', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.Backend.name': ('proxy.html#backend.name', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.Backend.record_latency': ('proxy.html#backend.record_latency', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.BalanceStrategy': ('proxy.html#balancestrategy', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy': ('proxy.html#tcpproxy', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy.__init__': ('proxy.html#tcpproxy.__init__', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy._connect_backend': ( 'proxy.html#tcpproxy._connect_backend',
+                                                                                  'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy._forward': ('proxy.html#tcpproxy._forward', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy._handle_client': ('proxy.html#tcpproxy._handle_client', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy._pick_least_connections': ( 'proxy.html#tcpproxy._pick_least_connections',
+                                                                                         'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy._pick_least_latency': ( 'proxy.html#tcpproxy._pick_least_latency',
+                                                                                     'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy._pick_round_robin': ( 'proxy.html#tcpproxy._pick_round_robin',
+                                                                                   'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy.backend_stats': ('proxy.html#tcpproxy.backend_stats', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.TCPProxy.set_strategy': ('proxy.html#tcpproxy.set_strategy', 'python_tcp/proxy.py'),
+                                  'python_tcp.proxy.set_nodelay': ('proxy.html#set_nodelay', 'python_tcp/proxy.py')},
+            'python_tcp.recording': { 'python_tcp.recording.RecordKind': ('recording.html#recordkind', 'python_tcp/recording.py'),
+                                      'python_tcp.recording.RecordedEvent': ('recording.html#recordedevent', 'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder': ('recording.html#trafficrecorder', 'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.__init__': ( 'recording.html#trafficrecorder.__init__',
+                                                                                         'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder._append': ( 'recording.html#trafficrecorder._append',
+                                                                                        'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder._write_loop': ( 'recording.html#trafficrecorder._write_loop',
+                                                                                            'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.connection_closed': ( 'recording.html#trafficrecorder.connection_closed',
+                                                                                                  'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.connection_opened': ( 'recording.html#trafficrecorder.connection_opened',
+                                                                                                  'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.flush': ( 'recording.html#trafficrecorder.flush',
+                                                                                      'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.messages_received': ( 'recording.html#trafficrecorder.messages_received',
+                                                                                                  'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.stats': ( 'recording.html#trafficrecorder.stats',
+                                                                                      'python_tcp/recording.py'),
+                                      'python_tcp.recording.TrafficRecorder.stop': ( 'recording.html#trafficrecorder.stop',
+                                                                                     'python_tcp/recording.py'),
+                                      'python_tcp.recording._ConnectionScript': ( 'recording.html#_connectionscript',
+                                                                                  'python_tcp/recording.py'),
+                                      'python_tcp.recording._ReplayConnection': ( 'recording.html#_replayconnection',
+                                                                                  'python_tcp/recording.py'),
+                                      'python_tcp.recording._ReplayConnection.__init__': ( 'recording.html#_replayconnection.__init__',
+                                                                                           'python_tcp/recording.py'),
+                                      'python_tcp.recording._ReplayConnection._read_responses': ( 'recording.html#_replayconnection._read_responses',
+                                                                                                  'python_tcp/recording.py'),
+                                      'python_tcp.recording._ReplayConnection._wait_until': ( 'recording.html#_replayconnection._wait_until',
+                                                                                              'python_tcp/recording.py'),
+                                      'python_tcp.recording._ReplayConnection.run': ( 'recording.html#_replayconnection.run',
+                                                                                      'python_tcp/recording.py'),
+                                      'python_tcp.recording._build_scripts': ('recording.html#_build_scripts', 'python_tcp/recording.py'),
+                                      'python_tcp.recording.read_recording': ('recording.html#read_recording', 'python_tcp/recording.py'),
+                                      'python_tcp.recording.replay_recording': ( 'recording.html#replay_recording',
+                                                                                 'python_tcp/recording.py')},
+            'python_tcp.routing': { 'python_tcp.routing.MessageRouter': ('routing.html#messagerouter', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.__call__': ( 'routing.html#messagerouter.__call__',
+                                                                                   'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.__init__': ( 'routing.html#messagerouter.__init__',
+                                                                                   'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter._dispatch': ( 'routing.html#messagerouter._dispatch',
+                                                                                    'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.build': ('routing.html#messagerouter.build', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.dispatch': ( 'routing.html#messagerouter.dispatch',
+                                                                                   'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.route': ('routing.html#messagerouter.route', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.set_default_handler': ( 'routing.html#messagerouter.set_default_handler',
+                                                                                              'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.set_invalid_handler': ( 'routing.html#messagerouter.set_invalid_handler',
+                                                                                              'python_tcp/routing.py'),
+                                    'python_tcp.routing.MessageRouter.use': ('routing.html#messagerouter.use', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.RateLimiter': ('routing.html#ratelimiter', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.RateLimiter.__call__': ( 'routing.html#ratelimiter.__call__',
+                                                                                 'python_tcp/routing.py'),
+                                    'python_tcp.routing.RateLimiter.__init__': ( 'routing.html#ratelimiter.__init__',
+                                                                                 'python_tcp/routing.py'),
+                                    'python_tcp.routing.RateLimiter.forget': ('routing.html#ratelimiter.forget', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.Request': ('routing.html#request', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.RouteError': ('routing.html#routeerror', 'python_tcp/routing.py'),
+                                    'python_tcp.routing._encode_response': ('routing.html#_encode_response', 'python_tcp/routing.py'),
+                                    'python_tcp.routing._wrap': ('routing.html#_wrap', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.chain': ('routing.html#chain', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.error_response': ('routing.html#error_response', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.require': ('routing.html#require', 'python_tcp/routing.py'),
+                                    'python_tcp.routing.require_fields': ('routing.html#require_fields', 'python_tcp/routing.py')},
             'python_tcp.server': { 'python_tcp.server.EnhancedTCPServer': ('tcp_server.html#enhancedtcpserver', 'python_tcp/server.py'),
                                    'python_tcp.server.EnhancedTCPServer.__init__': ( 'tcp_server.html#enhancedtcpserver.__init__',
                                                                                      'python_tcp/server.py'),
+                                   'python_tcp.server.EnhancedTCPServer._handle_batch': ( 'tcp_server.html#enhancedtcpserver._handle_batch',
+                                                                                          'python_tcp/server.py'),
                                    'python_tcp.server.EnhancedTCPServer._handle_client': ( 'tcp_server.html#enhancedtcpserver._handle_client',
                                                                                            'python_tcp/server.py'),
+                                   'python_tcp.server.EnhancedTCPServer._send_batch': ( 'tcp_server.html#enhancedtcpserver._send_batch',
+                                                                                        'python_tcp/server.py'),
+                                   'python_tcp.server.EnhancedTCPServer.set_batch_handler': ( 'tcp_server.html#enhancedtcpserver.set_batch_handler',
+                                                                                              'python_tcp/server.py'),
                                    'python_tcp.server.EnhancedTCPServer.set_message_handler': ( 'tcp_server.html#enhancedtcpserver.set_message_handler',
                                                                                                 'python_tcp/server.py'),
                                    'python_tcp.server.EventDrivenTCPServer': ( 'tcp_server.html#eventdriventcpserver',
                                                                                'python_tcp/server.py'),
                                    'python_tcp.server.EventDrivenTCPServer.__init__': ( 'tcp_server.html#eventdriventcpserver.__init__',
                                                                                         'python_tcp/server.py'),
-                                   'python_tcp.server.EventDrivenTCPServer._accept_connections': ( 'tcp_server.html#eventdriventcpserver._accept_connections',
-                                                                                                   'python_tcp/server.py'),
                                    'python_tcp.server.EventDrivenTCPServer._close_connection': ( 'tcp_server.html#eventdriventcpserver._close_connection',
                                                                                                  'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer._connection_opened': ( 'tcp_server.html#eventdriventcpserver._connection_opened',
+                                                                                                  'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer._cpu_account_name': ( 'tcp_server.html#eventdriventcpserver._cpu_account_name',
+                                                                                                 'python_tcp/server.py'),
                                    'python_tcp.server.EventDrivenTCPServer._handle_client': ( 'tcp_server.html#eventdriventcpserver._handle_client',
                                                                                               'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer._handle_event_batch': ( 'tcp_server.html#eventdriventcpserver._handle_event_batch',
+                                                                                                   'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer._record_span': ( 'tcp_server.html#eventdriventcpserver._record_span',
+                                                                                            'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer._trigger_on_data': ( 'tcp_server.html#eventdriventcpserver._trigger_on_data',
+                                                                                                'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer.set_cpu_accounting': ( 'tcp_server.html#eventdriventcpserver.set_cpu_accounting',
+                                                                                                  'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer.set_recorder': ( 'tcp_server.html#eventdriventcpserver.set_recorder',
+                                                                                            'python_tcp/server.py'),
+                                   'python_tcp.server.EventDrivenTCPServer.set_tracer': ( 'tcp_server.html#eventdriventcpserver.set_tracer',
+                                                                                          'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer': ('tcp_server.html#tcpserver', 'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer.__init__': ('tcp_server.html#tcpserver.__init__', 'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer.__str__': ('tcp_server.html#tcpserver.__str__', 'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer._accept_connections': ( 'tcp_server.html#tcpserver._accept_connections',
                                                                                         'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._accept_pending': ( 'tcp_server.html#tcpserver._accept_pending',
+                                                                                    'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._accept_shared_memory': ( 'tcp_server.html#tcpserver._accept_shared_memory',
+                                                                                          'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer._close_connection': ( 'tcp_server.html#tcpserver._close_connection',
                                                                                       'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._configure_client_socket': ( 'tcp_server.html#tcpserver._configure_client_socket',
+                                                                                             'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._connection_opened': ( 'tcp_server.html#tcpserver._connection_opened',
+                                                                                       'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._decode_messages': ( 'tcp_server.html#tcpserver._decode_messages',
+                                                                                     'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer._handle_client': ( 'tcp_server.html#tcpserver._handle_client',
                                                                                    'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._heartbeat_loop': ( 'tcp_server.html#tcpserver._heartbeat_loop',
+                                                                                    'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._listen': ('tcp_server.html#tcpserver._listen', 'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._negotiate': ( 'tcp_server.html#tcpserver._negotiate',
+                                                                               'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._peer_address': ( 'tcp_server.html#tcpserver._peer_address',
+                                                                                  'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._protocol_options': ( 'tcp_server.html#tcpserver._protocol_options',
+                                                                                      'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._receive_messages': ( 'tcp_server.html#tcpserver._receive_messages',
+                                                                                      'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._remove_socket_file': ( 'tcp_server.html#tcpserver._remove_socket_file',
+                                                                                        'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._send_data': ( 'tcp_server.html#tcpserver._send_data',
+                                                                               'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._send_frame': ( 'tcp_server.html#tcpserver._send_frame',
+                                                                                'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer._start_connection': ( 'tcp_server.html#tcpserver._start_connection',
+                                                                                      'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.get_rtt': ('tcp_server.html#tcpserver.get_rtt', 'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.profile': ('tcp_server.html#tcpserver.profile', 'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.rtt_summary': ( 'tcp_server.html#tcpserver.rtt_summary',
+                                                                                'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer.send': ('tcp_server.html#tcpserver.send', 'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.set_accept_options': ( 'tcp_server.html#tcpserver.set_accept_options',
+                                                                                       'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.set_compression': ( 'tcp_server.html#tcpserver.set_compression',
+                                                                                    'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.set_heartbeat': ( 'tcp_server.html#tcpserver.set_heartbeat',
+                                                                                  'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.set_keepalive': ( 'tcp_server.html#tcpserver.set_keepalive',
+                                                                                  'python_tcp/server.py'),
+                                   'python_tcp.server.TCPServer.set_shared_memory': ( 'tcp_server.html#tcpserver.set_shared_memory',
+                                                                                      'python_tcp/server.py'),
                                    'python_tcp.server.TCPServer.start': ('tcp_server.html#tcpserver.start', 'python_tcp/server.py'),
-                                   'python_tcp.server.TCPServer.stop': ('tcp_server.html#tcpserver.stop', 'python_tcp/server.py')}}}
+                                   'python_tcp.server.TCPServer.stop': ('tcp_server.html#tcpserver.stop', 'python_tcp/server.py'),
+                                   'python_tcp.server._handler_name': ('tcp_server.html#_handler_name', 'python_tcp/server.py')},
+            'python_tcp.shm': { 'python_tcp.shm.SPSCRing': ('shm.html#spscring', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing.__init__': ('shm.html#spscring.__init__', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing._counter': ('shm.html#spscring._counter', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing._flag': ('shm.html#spscring._flag', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing._set_flag': ('shm.html#spscring._set_flag', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing.available': ('shm.html#spscring.available', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing.read': ('shm.html#spscring.read', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SPSCRing.write': ('shm.html#spscring.write', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemoryMode': ('shm.html#sharedmemorymode', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket': ('shm.html#sharedmemorysocket', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket.__init__': ('shm.html#sharedmemorysocket.__init__', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket._wait': ('shm.html#sharedmemorysocket._wait', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket._wake_peer': ( 'shm.html#sharedmemorysocket._wake_peer',
+                                                                                  'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket.close': ('shm.html#sharedmemorysocket.close', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket.recv': ('shm.html#sharedmemorysocket.recv', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket.sendall': ('shm.html#sharedmemorysocket.sendall', 'python_tcp/shm.py'),
+                                'python_tcp.shm.SharedMemorySocket.shutdown': ('shm.html#sharedmemorysocket.shutdown', 'python_tcp/shm.py'),
+                                'python_tcp.shm._open_untracked': ('shm.html#_open_untracked', 'python_tcp/shm.py'),
+                                'python_tcp.shm.attach_shared_channel': ('shm.html#attach_shared_channel', 'python_tcp/shm.py'),
+                                'python_tcp.shm.check_ring_size': ('shm.html#check_ring_size', 'python_tcp/shm.py'),
+                                'python_tcp.shm.create_shared_channel': ('shm.html#create_shared_channel', 'python_tcp/shm.py'),
+                                'python_tcp.shm.is_local_peer': ('shm.html#is_local_peer', 'python_tcp/shm.py'),
+                                'python_tcp.shm.is_same_host': ('shm.html#is_same_host', 'python_tcp/shm.py'),
+                                'python_tcp.shm.open_shared_socket': ('shm.html#open_shared_socket', 'python_tcp/shm.py'),
+                                'python_tcp.shm.unlink_shared_channel': ('shm.html#unlink_shared_channel', 'python_tcp/shm.py')},
+            'python_tcp.tracing': { 'python_tcp.tracing.HistogramTracer': ('tracing.html#histogramtracer', 'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.HistogramTracer.__init__': ( 'tracing.html#histogramtracer.__init__',
+                                                                                     'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.HistogramTracer.record': ( 'tracing.html#histogramtracer.record',
+                                                                                   'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.HistogramTracer.report': ( 'tracing.html#histogramtracer.report',
+                                                                                   'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram': ('tracing.html#latencyhistogram', 'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram.__init__': ( 'tracing.html#latencyhistogram.__init__',
+                                                                                      'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram._bucket': ( 'tracing.html#latencyhistogram._bucket',
+                                                                                     'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram._bucket_value': ( 'tracing.html#latencyhistogram._bucket_value',
+                                                                                           'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram.merge': ( 'tracing.html#latencyhistogram.merge',
+                                                                                   'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram.percentile': ( 'tracing.html#latencyhistogram.percentile',
+                                                                                        'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram.record': ( 'tracing.html#latencyhistogram.record',
+                                                                                    'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.LatencyHistogram.summary': ( 'tracing.html#latencyhistogram.summary',
+                                                                                     'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.MessageSpan': ('tracing.html#messagespan', 'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.MessageSpan.stages': ('tracing.html#messagespan.stages', 'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.Tracer': ('tracing.html#tracer', 'python_tcp/tracing.py'),
+                                    'python_tcp.tracing.Tracer.record': ('tracing.html#tracer.record', 'python_tcp/tracing.py')},
+            'python_tcp.workers': { 'python_tcp.workers.ProcessPoolHandler': ('workers.html#processpoolhandler', 'python_tcp/workers.py'),
+                                    'python_tcp.workers.ProcessPoolHandler.__call__': ( 'workers.html#processpoolhandler.__call__',
+                                                                                        'python_tcp/workers.py'),
+                                    'python_tcp.workers.ProcessPoolHandler.__init__': ( 'workers.html#processpoolhandler.__init__',
+                                                                                        'python_tcp/workers.py'),
+                                    'python_tcp.workers.ProcessPoolHandler.close': ( 'workers.html#processpoolhandler.close',
+                                                                                     'python_tcp/workers.py'),
+                                    'python_tcp.workers._run_handler': ('workers.html#_run_handler', 'python_tcp/workers.py'),
+                                    'python_tcp.workers._share': ('workers.html#_share', 'python_tcp/workers.py'),
+                                    'python_tcp.workers._take': ('workers.html#_take', 'python_tcp/workers.py'),
+                                    'python_tcp.workers._unlink': ('workers.html#_unlink', 'python_tcp/workers.py')}}}
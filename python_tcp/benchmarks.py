@@ -0,0 +1,549 @@
+"""Measuring the cost and benefit of our TCP implementation's features"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/06_benchmarks.ipynb.
+
+# %% auto 0
+__all__ = ['SAMPLE_USERNAMES', 'SAMPLE_WORDS', 'COMPRESSION_BENCHMARKS', 'print_results', 'quiet', 'sample_messages',
+           'bench_compression', 'bench_transports', 'bench_connections', 'bench_shared_memory', 'bench_batching',
+           'bench_chat_batching', 'bench_proxy', 'bench_accept']
+
+# %% ../nbs/06_benchmarks.ipynb 3
+from .core import *
+from .protocol import *
+from .server import *
+from .client import *
+from .proxy import *
+from .chat_app import ChatServer
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/06_benchmarks.ipynb 5
+def print_results(results: List[Dict[str, Any]], title: Optional[str] = None) -> None:
+    """Print benchmark results as an aligned table."""
+    if title:
+        print(f"=== {title} ===")
+    if not results:
+        print("(no results)")
+        return
+
+    columns = list(results[0].keys())
+    cells = [[f"{r[c]:.2f}" if isinstance(r[c], float) else str(r[c]) for c in columns] for r in results]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+# %% ../nbs/06_benchmarks.ipynb 7
+@contextlib.contextmanager
+def quiet():
+    """Suppress printed output while benchmarking."""
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        yield
+
+# %% ../nbs/06_benchmarks.ipynb 9
+SAMPLE_USERNAMES = ['Alice', 'Bob', 'Charlie', 'Dave', 'Eve', 'Mallory', 'Oscar', 'Peggy']
+SAMPLE_WORDS = ('the quick brown fox jumps over a lazy dog hello everyone how are you '
+                'doing today see you later meeting at noon deploy finished tests green').split()
+
+def sample_messages(n: int = 1000, seed: int = 0) -> List[bytes]:
+    """Generate `n` chat and command messages like the ones our examples send."""
+    rng = random.Random(seed)
+    timestamp = 1700000000.0
+    messages = []
+
+    for _ in range(n):
+        timestamp += rng.random()
+        username = rng.choice(SAMPLE_USERNAMES)
+        kind = rng.random()
+
+        if kind < 0.8:
+            content = " ".join(rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(2, 20)))
+            message = {'type': 'message', 'username': username, 'content': content, 'timestamp': timestamp}
+        elif kind < 0.85:
+            message = {'type': 'join', 'username': username, 'timestamp': timestamp}
+        elif kind < 0.9:
+            message = {'type': 'leave', 'username': username, 'timestamp': timestamp}
+        else:
+            message = {'command': rng.choice(['echo', 'time', 'random']), 'data': username}
+
+        messages.append(json.dumps(message).encode('utf-8'))
+
+    return messages
+
+# %% ../nbs/06_benchmarks.ipynb 11
+class _PerMessageZlib(Compressor):
+    """Compress each message independently (a baseline for the streaming compressor)."""
+    name = 'zlib-per-message'
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a message on its own."""
+        return zlib.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a message on its own."""
+        return zlib.decompress(data)
+
+# %% ../nbs/06_benchmarks.ipynb 12
+COMPRESSION_BENCHMARKS: Dict[str, Callable[[], Optional[Compressor]]] = {
+    'none': lambda: None,
+    'zlib': ZlibCompressor,
+    'zlib (no dictionary)': lambda: ZlibCompressor(zdict=None),
+    'zlib (per message)': _PerMessageZlib,
+}
+
+def bench_compression(messages: Optional[List[bytes]] = None,
+                      threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+                      compressors: Optional[Dict[str, Callable[[], Optional[Compressor]]]] = None,
+                      verbose: bool = True) -> List[Dict[str, Any]]:
+    """Measure compression ratio and per-message CPU cost of each compressor."""
+    messages = messages if messages is not None else sample_messages()
+    compressors = compressors or COMPRESSION_BENCHMARKS
+    results = []
+
+    for name, factory in compressors.items():
+        sender = MessageProtocol(factory(), threshold)
+        receiver = MessageProtocol(factory(), threshold)
+
+        start = time.perf_counter()
+        frames = [sender.encode(message) for message in messages]
+        encode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = [m for frame in frames for m in receiver.feed(frame)]
+        decode_time = time.perf_counter() - start
+
+        assert decoded == messages, f"{name} did not round-trip"
+
+        results.append({
+            'compressor': name,
+            'payload_bytes': sender.bytes_sent,
+            'wire_bytes': sender.wire_bytes_sent,
+            'ratio': sender.compression_ratio,
+            'encode_us': encode_time / len(messages) * 1e6,
+            'decode_us': decode_time / len(messages) * 1e6,
+        })
+
+    if verbose:
+        print_results(results, f"Compression ({len(messages)} messages, threshold {threshold} bytes)")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 16
+def _echo_round_trips(host: str, port: int, count: int, size: int,
+                      configure: Optional[Callable[[TCPClient], None]] = None) -> List[float]:
+    """Send `count` messages one at a time and return each round-trip time in seconds."""
+    client = TCPClient()
+    if configure:
+        configure(client)
+    client.connect(host, port)
+    payload = b'x' * size
+    samples = []
+    
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            client.send(payload)
+            received = 0
+            while received < size:
+                received += len(client.receive())
+            samples.append(time.perf_counter() - start)
+    finally:
+        client.close()
+    return samples
+
+def _echo_throughput(host: str, port: int, total: int, size: int,
+                     configure: Optional[Callable[[TCPClient], None]] = None) -> float:
+    """Stream `total` bytes through an echo server and return the elapsed seconds."""
+    client = TCPClient(buffer_size=size)
+    if configure:
+        configure(client)
+    client.connect(host, port)
+    payload = b'x' * size
+    
+    def sender():
+        for _ in range(total // size):
+            client.send(payload)
+    
+    try:
+        start = time.perf_counter()
+        thread = threading.Thread(target=sender, daemon=True)
+        thread.start()
+        received = 0
+        while received < total // size * size:
+            received += len(client.receive())
+        elapsed = time.perf_counter() - start
+        thread.join()
+    finally:
+        client.close()
+    return elapsed
+
+# %% ../nbs/06_benchmarks.ipynb 17
+def bench_transports(round_trips: int = 2000, message_size: int = 64,
+                     total_bytes: int = 64 * 1024 * 1024, chunk_size: int = 64 * 1024,
+                     verbose: bool = True) -> List[Dict[str, Any]]:
+    """Compare latency and throughput of TCP loopback, Unix domain sockets and in-process loopback."""
+    socket_dir = tempfile.mkdtemp()
+    transports = [('tcp 127.0.0.1', LOCALHOST),
+                  ('unix socket file', UNIX_SCHEME + os.path.join(socket_dir, 'bench.sock'))]
+    if sys.platform.startswith('linux'):
+        transports.append(('unix abstract', f"{UNIX_SCHEME}@python-tcp-bench-{os.getpid()}"))
+    transports.append(('in-process loopback', f"{LOOPBACK_SCHEME}python-tcp-bench"))
+    
+    results = []
+    for name, host in transports:
+        with quiet():
+            server = EventDrivenTCPServer(host=host, buffer_size=chunk_size)
+            server.start()
+            try:
+                rtts = _echo_round_trips(host, server.port, round_trips, message_size)
+                elapsed = _echo_throughput(host, server.port, total_bytes, chunk_size)
+            finally:
+                server.stop()
+        
+        results.append({
+            'transport': name,
+            'rtt_p50_us': percentile(rtts, 50) * 1e6,
+            'rtt_p99_us': percentile(rtts, 99) * 1e6,
+            'throughput_mb_s': total_bytes / elapsed / 1e6,
+        })
+    
+    os.rmdir(socket_dir)
+    if verbose:
+        print_results(results, f"Transports ({round_trips} x {message_size} byte round trips, "
+                               f"{total_bytes // (1024 * 1024)} MiB streamed)")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 21
+def _open_many(host: str, port: int, connections: int) -> Tuple[float, float]:
+    """Open connections and do one round trip on each; return (connect, round-trip) seconds."""
+    clients = []
+    try:
+        start = time.perf_counter()
+        for _ in range(connections):
+            client = TCPClient()
+            if not client.connect(host, port):
+                raise ConnectionError(f"Could not connect to {format_address(host, port)}")
+            clients.append(client)
+        connected = time.perf_counter()
+        for client in clients:
+            client.send(b'ping')
+            client.receive()
+        return connected - start, time.perf_counter() - connected
+    finally:
+        for client in clients:
+            client.close()
+
+def bench_connections(connections: int = 500, verbose: bool = True) -> List[Dict[str, Any]]:
+    """Compare opening many connections over TCP and over the in-process loopback."""
+    results = []
+    for name, host in [('tcp 127.0.0.1', LOCALHOST), ('in-process loopback', f"{LOOPBACK_SCHEME}bench-connections")]:
+        with quiet():
+            server = EventDrivenTCPServer(host=host)
+            server.start()
+            try:
+                connect_time, rtt_time = _open_many(host, server.port, connections)
+            finally:
+                server.stop()
+        
+        results.append({
+            'transport': name,
+            'connects_per_s': connections / connect_time,
+            'connect_us': connect_time / connections * 1e6,
+            'round_trip_us': rtt_time / connections * 1e6,
+            'total_us': (connect_time + rtt_time) / connections * 1e6,
+        })
+    
+    if verbose:
+        print_results(results, f"Opening {connections} connections")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 24
+def _shared_memory_server(host: str, ready: Any, stop: Any, mode: str) -> None:
+    """Run an echo server that accepts shared memory, in a process of its own."""
+    with quiet():
+        server = EventDrivenTCPServer(host=host, buffer_size=64 * 1024)
+        server.set_shared_memory(mode=mode)
+        server.start()
+        ready.put(server.port)
+        stop.wait()
+        server.stop()
+
+def bench_shared_memory(round_trips: int = 2000, message_size: int = 64,
+                        total_bytes: int = 16 * 1024 * 1024, chunk_size: int = 64 * 1024,
+                        verbose: bool = True) -> List[Dict[str, Any]]:
+    """Compare framed socket connections with shared memory, to a server in another process."""
+    from python_tcp.shm import SharedMemoryMode
+    
+    def framed(mode):
+        def configure(client):
+            client.set_compression([])
+            client.set_shared_memory(mode)
+        return configure
+    
+    socket_dir = tempfile.mkdtemp()
+    unix_host = UNIX_SCHEME + os.path.join(socket_dir, 'bench.sock')
+    poll_host = UNIX_SCHEME + os.path.join(socket_dir, 'poll.sock')  # A server that polls too
+    transports = [('tcp 127.0.0.1', LOCALHOST, None),
+                  ('unix socket', unix_host, None),
+                  ('shared memory (wakeup)', unix_host, SharedMemoryMode.WAKEUP),
+                  ('shared memory (poll)', poll_host, SharedMemoryMode.POLL)]
+    
+    context = multiprocessing.get_context('spawn')
+    results = []
+    servers = {}
+    try:
+        for name, host, mode in transports:
+            if host not in servers:
+                ready, stop = context.Queue(), context.Event()
+                process = context.Process(target=_shared_memory_server,
+                                          args=(host, ready, stop, mode or SharedMemoryMode.WAKEUP), daemon=True)
+                process.start()
+                servers[host] = (process, stop, ready.get(timeout=30))
+            port = servers[host][2]
+            
+            with quiet():
+                rtts = _echo_round_trips(host, port, round_trips, message_size, framed(mode))
+                elapsed = _echo_throughput(host, port, total_bytes, chunk_size, framed(mode))
+            results.append({
+                'transport': name,
+                'rtt_p50_us': percentile(rtts, 50) * 1e6,
+                'rtt_p99_us': percentile(rtts, 99) * 1e6,
+                'throughput_mb_s': total_bytes / elapsed / 1e6,
+            })
+    finally:
+        for process, stop, _ in servers.values():
+            stop.set()
+            process.join(timeout=5)
+        os.rmdir(socket_dir)
+    
+    if verbose:
+        print_results(results, f"Shared memory ({round_trips} x {message_size} byte round trips, "
+                               f"{total_bytes // (1024 * 1024)} MiB streamed, {os.cpu_count()} CPUs)")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 28
+def _pipelined_requests(host: str, port: int, count: int, depth: int, size: int) -> float:
+    """Send `count` requests in pipelined groups of `depth` and return the elapsed seconds."""
+    client = TCPClient(buffer_size=64 * 1024)
+    client.set_compression([])  # Framing, so pipelined messages stay separate
+    client.connect(host, port)
+    payload = b'x' * size
+    
+    try:
+        start = time.perf_counter()
+        for _ in range(count // depth):
+            client.send_many([payload] * depth)
+            for _ in range(depth):
+                client.receive()
+        return time.perf_counter() - start
+    finally:
+        client.close()
+
+def bench_batching(count: int = 20000, depth: int = 50, message_size: int = 32,
+                   call_cost: float = 20e-6, verbose: bool = True) -> List[Dict[str, Any]]:
+    """Compare per-message and batch handlers for a pipelining client."""
+    def spend(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+    
+    def message_handler(conn_id, data):
+        spend(call_cost)
+        return data
+    
+    def batch_handler(conn_id, messages):
+        spend(call_cost)
+        return messages
+    
+    results = []
+    for name, install in [('message handler', lambda s: s.set_message_handler(message_handler)),
+                          ('batch handler', lambda s: s.set_batch_handler(batch_handler))]:
+        with quiet():
+            server = EventDrivenTCPServer(buffer_size=64 * 1024)
+            install(server)
+            server.start()
+            try:
+                elapsed = _pipelined_requests(LOCALHOST, server.port, count, depth, message_size)
+            finally:
+                server.stop()
+        
+        results.append({'handler': name, 'requests_per_s': count // depth * depth / elapsed})
+    
+    if verbose:
+        print_results(results, f"Batching ({count} requests, pipeline depth {depth}, "
+                               f"{call_cost * 1e6:.0f}us per handler call)")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 32
+def _chat_room(port: int, users: int) -> Tuple[List[EventDrivenTCPClient], Dict[str, Any]]:
+    """Join `users` framed clients to a chat server and count what they receive."""
+    stats = {'frames': 0, 'messages': 0, 'latencies': []}
+    lock = threading.Lock()
+    
+    def on_data(data):
+        now = time.time()
+        message = json.loads(data)
+        lines = message['messages'] if message.get('type') == 'batch' else [message]
+        with lock:
+            stats['frames'] += 1
+            for line in lines:
+                if line.get('type') == 'message':
+                    stats['messages'] += 1
+                    stats['latencies'].append(now - line['timestamp'])
+    
+    clients = []
+    for i in range(users):
+        client = EventDrivenTCPClient()
+        client.set_compression([])  # Framing, so each send arrives as one message
+        client.on_data = on_data
+        if not client.connect(LOCALHOST, port):
+            raise ConnectionError(f"Could not connect to {format_address(LOCALHOST, port)}")
+        client.send(json.dumps({'type': 'join', 'username': f"user{i}"}).encode('utf-8'))
+        clients.append(client)
+    return clients, stats
+
+def bench_chat_batching(users: int = 50, messages: int = 1000, rate: float = 1000.0,
+                        windows: Tuple[Optional[float], ...] = (None, 0.005, 0.02),
+                        verbose: bool = True) -> List[Dict[str, Any]]:
+    """Compare sends, CPU and latency of chat broadcasts for several batching windows."""
+    results = []
+    for window in windows:
+        with quiet():
+            server = ChatServer()
+            server.set_batch_window(window)
+            server.start()
+            clients = []
+            try:
+                clients, stats = _chat_room(server.port, users)
+                time.sleep(0.5)  # Let the joins and user list updates settle
+                stats['frames'] = 0
+                
+                cpu_start, start = time.process_time(), time.perf_counter()
+                for i in range(messages):
+                    # Send at a steady rate, catching up if we fall behind
+                    delay = start + i / rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    clients[0].send(json.dumps({'type': 'message', 'content': f"message {i}"}).encode('utf-8'))
+                
+                deadline = time.monotonic() + 10 + messages / rate
+                while stats['messages'] < users * messages and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                cpu = time.process_time() - cpu_start
+            finally:
+                for client in clients:
+                    client.close()
+                server.stop()
+        
+        latencies = stats['latencies']
+        results.append({
+            'window_ms': window * 1000 if window else 0,
+            'sends_per_user': stats['frames'] / users,
+            'delivered': stats['messages'] / (users * messages),
+            'cpu_us_per_delivery': cpu / max(stats['messages'], 1) * 1e6,
+            'latency_p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+            'latency_p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+        })
+    
+    if verbose:
+        print_results(results, f"Chat batching ({users} users, {messages} messages at {rate:.0f}/s)")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 36
+def bench_proxy(round_trips: int = 2000, message_size: int = 64,
+                total_bytes: int = 64 * 1024 * 1024, chunk_size: int = 64 * 1024,
+                verbose: bool = True) -> List[Dict[str, Any]]:
+    """Compare latency and throughput of direct and proxied connections."""
+    results = []
+    with quiet():
+        backend = EventDrivenTCPServer(buffer_size=chunk_size)
+        backend.start()
+        proxy = TCPProxy([(LOCALHOST, backend.port)], buffer_size=chunk_size)
+        proxy.start()
+        try:
+            for name, port in [('direct', backend.port), ('via proxy', proxy.port)]:
+                rtts = _echo_round_trips(LOCALHOST, port, round_trips, message_size)
+                elapsed = _echo_throughput(LOCALHOST, port, total_bytes, chunk_size)
+                results.append({
+                    'path': name,
+                    'rtt_p50_us': percentile(rtts, 50) * 1e6,
+                    'rtt_p99_us': percentile(rtts, 99) * 1e6,
+                    'throughput_mb_s': total_bytes / elapsed / 1e6,
+                })
+        finally:
+            proxy.stop()
+            backend.stop()
+    
+    direct = results[0]
+    for row in results:
+        for key in ('rtt_p50_us', 'rtt_p99_us'):
+            row[f"added_{key[4:]}"] = row[key] - direct[key]
+    
+    if verbose:
+        print_results(results, f"Proxy ({round_trips} x {message_size} byte round trips, "
+                               f"{total_bytes // (1024 * 1024)} MiB streamed)")
+    return results
+
+# %% ../nbs/06_benchmarks.ipynb 40
+def _connect_loop(host: str, port: int, stop_at: float, samples: List[float], errors: List[int]) -> None:
+    """Open, use and close connections until `stop_at`, timing each connect()."""
+    while time.perf_counter() < stop_at:
+        try:
+            start = time.perf_counter()
+            with socket.create_connection((host, port), timeout=5) as sock:
+                samples.append(time.perf_counter() - start)
+                sock.sendall(b'x')
+                sock.recv(16)
+        except OSError:
+            errors.append(1)
+
+def bench_accept(duration: float = 3.0, clients: int = 16,
+                 verbose: bool = True) -> List[Dict[str, Any]]:
+    """Measure sustained connections per second for different accept settings."""
+    configurations = [
+        ('backlog 5, 1 per wakeup', 5, {'batch_size': 1}),
+        ('backlog SOMAXCONN, batched', DEFAULT_BACKLOG, {}),
+        ('batched + TCP_DEFER_ACCEPT', DEFAULT_BACKLOG, {'defer_accept': 1}),
+    ]
+    
+    results = []
+    for name, backlog, options in configurations:
+        samples, errors = [], []
+        with quiet():
+            server = EnhancedTCPServer(backlog=backlog)
+            server.set_accept_options(**options)
+            server.start()
+            try:
+                stop_at = time.perf_counter() + duration
+                threads = [threading.Thread(target=_connect_loop,
+                                            args=(LOCALHOST, server.port, stop_at, samples, errors))
+                           for _ in range(clients)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                server.stop()
+        
+        results.append({
+            'accept': name,
+            'connects_per_s': len(samples) / duration,
+            'connect_p50_us': percentile(samples, 50) * 1e6 if samples else 0.0,
+            'connect_p99_us': percentile(samples, 99) * 1e6 if samples else 0.0,
+            'errors': len(errors),
+        })
+    
+    if verbose:
+        print_results(results, f"Accepting ({clients} client threads, {duration:.0f}s each)")
+    return results
@@ -0,0 +1,143 @@
+"""Reusing the responses of read-only message handlers"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/11_caching.ipynb.
+
+# %% auto 0
+__all__ = ['payload_key', 'ResponseCache']
+
+# %% ../nbs/11_caching.ipynb 3
+from .core import *
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable, Hashable
+
+# %% ../nbs/11_caching.ipynb 5
+def payload_key(connection_id: str, data: bytes) -> bytes:
+    """Key a request on a hash of its data, whichever connection sent it."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+# %% ../nbs/11_caching.ipynb 7
+class _PendingResponse:
+    """A response that one thread is computing and others are waiting for."""
+
+    def __init__(self):
+        """Start with no response, and nobody notified."""
+        self.done = threading.Event()
+        self.response: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+    def result(self) -> Optional[bytes]:
+        """Wait for the response, raising the handler's exception if it failed."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+# %% ../nbs/11_caching.ipynb 9
+class ResponseCache:
+    """Wrap a message handler with an LRU + TTL cache of its responses."""
+
+    def __init__(self, handler: Callable[[str, bytes], Optional[bytes]],
+                 max_entries: int = 1024, ttl: Optional[float] = 60.0,
+                 key: Callable[[str, bytes], Optional[Hashable]] = payload_key):
+        """Cache up to `max_entries` responses for `ttl` seconds each (None: no expiry)."""
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.handler = handler
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.key = key
+        self.entries: OrderedDict = OrderedDict()  # {key: (response, expires_at)}
+        self._pending: Dict[Hashable, _PendingResponse] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bypassed = 0
+
+    def __call__(self, connection_id: str, data: bytes) -> Optional[bytes]:
+        """Get a response from the cache, or from the handler on a miss."""
+        key = self.key(connection_id, data)
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return self.handler(connection_id, data)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self.entries[key]
+                self.expirations += 1
+
+            self.misses += 1
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _PendingResponse()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return pending.result()
+        return self._compute(key, pending, connection_id, data)
+
+    def _compute(self, key: Hashable, pending: _PendingResponse,
+                 connection_id: str, data: bytes) -> Optional[bytes]:
+        """Run the handler for a miss and share the response with waiting threads."""
+        try:
+            pending.response = self.handler(connection_id, data)
+        except BaseException as e:
+            pending.error = e
+            raise
+        else:
+            self._store(key, pending.response)
+            return pending.response
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.done.set()
+
+    def _store(self, key: Hashable, response: Optional[bytes]) -> None:
+        """Add a response, evicting the least recently used entries if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self.entries[key] = (response, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, connection_id: str, data: bytes) -> bool:
+        """Drop the cached response for a request; returns True if there was one."""
+        key = self.key(connection_id, data)
+        with self._lock:
+            return self.entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache's size, hit rate and counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'bypassed': self.bypassed,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -3,38 +3,137 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/04_chat_app.ipynb.
 
 # %% auto 0
-__all__ = ['ChatServer', 'ChatClient', 'run_chat_client', 'run_chat_server', 'start_server', 'start_client']
+__all__ = ['ChatServer', 'ChatClient', 'run_chat_client', 'run_chat_server', 'start_server', 'start_client',
+           'FederatedChatServer', 'ChatHistory', 'ChatSession']
+
+# %% ../nbs/04_chat_app.ipynb 3
+from .core import *
+from .server import EventDrivenTCPServer
+from .client import EventDrivenTCPClient, ReconnectPolicy
+from .routing import MessageRouter, require, require_fields
+from collections import OrderedDict, deque
+from bisect import bisect_left
+import itertools
+import secrets
+import threading
+import time
+import json
+import datetime
+import re
+import uuid
 
 # %% ../nbs/04_chat_app.ipynb 5
 class ChatServer:
     """A simple chat server using our TCP implementation."""
     
-    def __init__(self, host=LOCALHOST, port=0):
-        """Initialize the chat server."""
+    def __init__(self, host=LOCALHOST, port=0, heartbeat_interval=None, presence_window=0.05):
+        """Initialize the chat server.
+        
+        With a heartbeat_interval, framed clients are pinged regularly and
+        dropped (with a leave notification) when they stop answering. User
+        list changes within presence_window seconds are sent as one update.
+        """
         self.host = host
         self.port = port
         self.server = EventDrivenTCPServer(host, port)
         
+        if heartbeat_interval:
+            self.server.set_heartbeat(heartbeat_interval)
+        
         # Track connected users: {connection_id: username}
         self.users = {}
         
+        # The user list as last sent to clients, and its version
+        self.presence_window = presence_window
+        self.presence_version = 0
+        self.published_users = set()
+        self.presence_lock = threading.Lock()
+        self.presence_timer = None
+        
+        # Searchable message history, off until set_history() is called
+        self.history = None
+        
+        # Chat messages waiting to be broadcast together, when batching is on
+        self.batch_window = None
+        self.pending_broadcasts = []
+        self.batch_lock = threading.Lock()
+        self.batch_timer = None
+        
+        # Resumable sessions, off until set_sessions() is called
+        self.session_grace = None
+        self.session_buffer = 1000
+        self.sessions = {}             # {token: ChatSession}
+        self.connection_sessions = {}  # {connection_id or session key: ChatSession}
+        self.session_lock = threading.Lock()
+        
         # Set up event handlers
         self.server.on_connect = self._on_client_connect
         self.server.on_disconnect = self._on_client_disconnect
         self.server.on_data = self._on_data_received
         
+        # Route messages by type; only users who have joined may chat or leave
+        registered = require(lambda request: request.connection_id in self.users,
+                             "You are not registered in the chat")
+        self.router = MessageRouter(key='type')
+        self.router.route('join', self._handle_join, [require_fields('username')])
+        self.router.route('message', self._handle_chat_message, [registered])
+        self.router.route('leave', self._handle_leave, [registered])
+        self.router.route('users', self._handle_users_request, [registered])
+        self.router.route('search', self._handle_search,
+                          [registered, require(lambda request: self.history is not None,
+                                               "Search is not enabled on this server")])
+        self.router.route('resume', self._handle_resume, [require_fields('token')])
+        self.router.route('ack', self._handle_ack, [registered])
+        
         # Set up message handler
-        self.server.set_message_handler(self._handle_message)
+        self.server.set_message_handler(self.router)
     
     def start(self):
         """Start the chat server."""
         self.server.start()
-        print(f"Chat server running at {self.host}:{self.port}")
+        self.port = self.server.port  # The actual port, if we asked for any free one
+        print(f"Chat server running at {format_address(self.host, self.port)}")
         return self.port
     
+    def set_history(self, history):
+        """Keep chat messages in a ChatHistory so users can search them (None disables)."""
+        self.history = history
+    
+    def set_batch_window(self, window):
+        """Send the chat messages of each `window` seconds as one batch (None disables).
+        
+        Batching trades up to `window` seconds of latency for one send per
+        user per window, instead of one per message.
+        """
+        self.batch_window = window
+        if not window:
+            self._flush_broadcasts()
+    
+    def set_sessions(self, grace_period=30.0, max_buffered=1000):
+        """Let users whose connection drops resume within `grace_period` seconds (None disables).
+        
+        Each session keeps up to `max_buffered` unacknowledged broadcasts
+        to replay when its user comes back.
+        """
+        self.session_grace = grace_period
+        self.session_buffer = max_buffered
+    
     def stop(self):
         """Stop the chat server."""
+        with self.presence_lock:
+            if self.presence_timer:
+                self.presence_timer.cancel()
+                self.presence_timer = None
+        self._flush_broadcasts()
         self.server.stop()
+        
+        # Closing the connections ends their sessions rather than detaching them,
+        # but users who were already away still have timers running
+        with self.session_lock:
+            for session in self.sessions.values():
+                if session.timer:
+                    session.timer.cancel()
+                    session.timer = None
         print("Chat server stopped")
     
     def _on_client_connect(self, conn_id, addr):
@@ -44,16 +143,20 @@ class ChatServer:
     
     def _on_client_disconnect(self, conn_id):
         """Handle a client disconnection."""
+        if self._detach_session(conn_id):
+            return  # The user may still come back
+        
         if conn_id in self.users:
             username = self.users[conn_id]
             del self.users[conn_id]
+            self._end_session(conn_id)
             print(f"User {username} disconnected")
             
             # Notify other users about the departure
             self._broadcast_user_leave(username)
             
-            # Send updated user list
-            self._broadcast_user_list()
+            # Update everyone's user list
+            self._schedule_presence_update()
     
     def _on_data_received(self, conn_id, data):
         """Handle received data."""
@@ -63,61 +166,42 @@ class ChatServer:
         except json.JSONDecodeError:
             print(f"Received invalid JSON: {data.decode('utf-8')}")
     
-    def _handle_message(self, conn_id, data):
-        """Process a message and return a response."""
-        try:
-            message = json.loads(data.decode('utf-8'))
-            message_type = message.get('type')
-            
-            if message_type == 'join':
-                return self._handle_join(conn_id, message)
-            elif message_type == 'message':
-                return self._handle_chat_message(conn_id, message)
-            elif message_type == 'leave':
-                return self._handle_leave(conn_id, message)
-            else:
-                return self._create_error_response("Unknown message type")
-                
-        except json.JSONDecodeError:
-            return self._create_error_response("Invalid JSON format")
-        except Exception as e:
-            return self._create_error_response(str(e))
-    
-    def _handle_join(self, conn_id, message):
+    def _handle_join(self, request):
         """Handle a join message."""
-        username = message.get('username')
-        
-        if not username:
-            return self._create_error_response("Username is required")
+        conn_id = request.connection_id
+        username = request.message['username']
         
         # Check if username is already taken
-        if username in self.users.values():
+        if self._username_taken(username):
             return self._create_error_response("Username already taken")
         
-        # Register the user
+        # Register the user, with a session to resume if sessions are on
         self.users[conn_id] = username
+        session = (self._start_session(conn_id, username)
+                   if self.session_grace and self._is_framed(conn_id) else None)
         print(f"User {username} joined")
         
         # Broadcast join message to all users
         self._broadcast_user_join(username)
         
-        # Send updated user list to all
-        self._broadcast_user_list()
+        # Give the new user the full user list, and everyone else the change
+        self._send_user_snapshot(conn_id)
+        self._schedule_presence_update()
         
         # Send welcome message to the new user
-        return json.dumps({
+        welcome = {
             'type': 'welcome',
             'content': f"Welcome to the chat, {username}!",
             'timestamp': time.time()
-        }).encode('utf-8')
+        }
+        if session:
+            welcome['session'] = session.token
+        return json.dumps(welcome).encode('utf-8')
     
-    def _handle_chat_message(self, conn_id, message):
+    def _handle_chat_message(self, request):
         """Handle a chat message."""
-        if conn_id not in self.users:
-            return self._create_error_response("You are not registered in the chat")
-        
-        username = self.users[conn_id]
-        content = message.get('content', '')
+        username = self.users[request.connection_id]
+        content = request.message.get('content', '')
         
         if not content:
             return self._create_error_response("Message content is required")
@@ -128,21 +212,20 @@ class ChatServer:
         # No need to send a response to the sender
         return None
     
-    def _handle_leave(self, conn_id, message):
+    def _handle_leave(self, request):
         """Handle a leave message."""
-        if conn_id not in self.users:
-            return self._create_error_response("You are not registered in the chat")
-        
+        conn_id = request.connection_id
         username = self.users[conn_id]
         
         # Broadcast leave message
         self._broadcast_user_leave(username)
         
-        # Remove the user
+        # Remove the user and their session
         del self.users[conn_id]
+        self._end_session(conn_id)
         
-        # Send updated user list
-        self._broadcast_user_list()
+        # Update everyone's user list
+        self._schedule_presence_update()
         
         # Send goodbye message
         return json.dumps({
@@ -151,16 +234,173 @@ class ChatServer:
             'timestamp': time.time()
         }).encode('utf-8')
     
-    def _broadcast_message(self, username, content):
+    def _handle_resume(self, request):
+        """Reattach a returning user to their session and replay what they missed."""
+        conn_id = request.connection_id
+        if conn_id in self.users:
+            return self._create_error_response("You are already in the chat")
+        if not self._is_framed(conn_id):
+            return json.dumps({
+                'type': 'resume_failed',
+                'content': "Sessions can only be resumed over a framed connection",
+                'timestamp': time.time()
+            }).encode('utf-8')
+        
+        with self.session_lock:
+            session = self.sessions.get(request.message['token'])
+            if session is None:
+                return json.dumps({
+                    'type': 'resume_failed',
+                    'content': "Your session has expired, please join again",
+                    'timestamp': time.time()
+                }).encode('utf-8')
+            if session.timer:
+                session.timer.cancel()
+                session.timer = None
+            # While detached the user is registered under the session key; otherwise the old
+            # connection hasn't noticed it's dead yet, and we take the user over from it
+            old_key = session.conn_id or session.key
+            self.connection_sessions[conn_id] = session
+        
+        with session.lock:
+            session.conn_id = None  # Stop sending to the old connection
+        self._move_user(old_key, conn_id)
+        with self.session_lock:
+            self.connection_sessions.pop(old_key, None)
+        
+        try:
+            ack = int(request.message.get('ack', 0))
+        except (TypeError, ValueError):
+            ack = 0
+        
+        with session.lock:
+            lost, replay = session.replay(ack)
+            self.server.send(conn_id, json.dumps({
+                'type': 'resumed',
+                'username': session.username,
+                'replayed': len(replay),
+                'lost': lost,
+                'timestamp': time.time()
+            }).encode('utf-8'))
+            for data in replay:
+                self.server.send(conn_id, data)
+            session.conn_id = conn_id
+        
+        # The user list may have changed while they were away
+        self._send_user_snapshot(conn_id)
+        print(f"User {session.username} resumed their session")
+        return None
+    
+    def _handle_ack(self, request):
+        """Forget the broadcasts a user has received."""
+        session = self.connection_sessions.get(request.connection_id)
+        if session:
+            try:
+                seq = int(request.message.get('seq', 0))
+            except (TypeError, ValueError):
+                return self._create_error_response("seq must be an integer")
+            with session.lock:
+                session.acknowledge(seq)
+        return None
+    
+    def _is_framed(self, conn_id):
+        """Check whether a connection uses the framed protocol.
+        
+        Sessions need it: without frames, the messages sent together on a
+        join or resume can run together into one unreadable read.
+        """
+        connection = self.server.connections.get(conn_id)
+        return connection is not None and connection.protocol is not None
+    
+    def _start_session(self, conn_id, username):
+        """Give a user who just joined a session they can resume."""
+        session = ChatSession(username, self.session_buffer)
+        session.conn_id = conn_id
+        with self.session_lock:
+            self.sessions[session.token] = session
+            self.connection_sessions[conn_id] = session
+        return session
+    
+    def _detach_session(self, conn_id):
+        """Keep the session of a user whose connection dropped for the grace period.
+        
+        Returns whether the user was kept.
+        """
+        session = self.connection_sessions.get(conn_id)
+        if session is None or not self.session_grace or session.conn_id != conn_id:
+            return False
+        if not self.server.running:
+            return False  # We're stopping, so there's nothing to come back to
+        
+        with session.lock:
+            session.conn_id = None  # Buffer broadcasts until the user comes back
+        with self.session_lock:
+            self.connection_sessions[session.key] = session
+        self._move_user(conn_id, session.key)
+        with self.session_lock:
+            self.connection_sessions.pop(conn_id, None)
+            session.timer = threading.Timer(self.session_grace, self._expire_session, (session,))
+            session.timer.daemon = True
+            session.timer.start()
+        
+        print(f"User {session.username} disconnected, keeping their session for {self.session_grace}s")
+        return True
+    
+    def _expire_session(self, session):
+        """Remove a user who didn't come back within the grace period."""
+        with self.session_lock:
+            if session.timer is None or self.sessions.get(session.token) is not session:
+                return  # Resumed just in time
+            session.timer = None
+            del self.sessions[session.token]
+        
+        print(f"Session of {session.username} expired")
+        self._on_client_disconnect(session.key)
+        with self.session_lock:
+            self.connection_sessions.pop(session.key, None)
+    
+    def _end_session(self, key):
+        """Forget the session of a user who has left."""
+        with self.session_lock:
+            session = self.connection_sessions.pop(key, None)
+            if session:
+                self.sessions.pop(session.token, None)
+                if session.timer:
+                    session.timer.cancel()
+                    session.timer = None
+    
+    def _move_user(self, old_key, new_key):
+        """Move a user from one connection (or session key) to another."""
+        username = self.users.pop(old_key, None)
+        if username is not None:
+            self.users[new_key] = username
+    
+    def _username_taken(self, username):
+        """Check whether a username is in use."""
+        return username in self.users.values()
+    
+    def _all_usernames(self):
+        """Get the names of everyone in the chat."""
+        return list(self.users.values())
+    
+    def _broadcast_message(self, username, content, timestamp=None):
         """Broadcast a chat message to all users."""
         message = {
             'type': 'message',
             'username': username,
             'content': content,
-            'timestamp': time.time()
+            'timestamp': timestamp or time.time()
         }
         
-        self._broadcast(json.dumps(message).encode('utf-8'))
+        history = self.history
+        if history is not None:
+            history.add(username, content, message['timestamp'])
+        
+        data = json.dumps(message).encode('utf-8')
+        if self.batch_window:
+            self._queue_broadcast(data)
+        else:
+            self._broadcast(data)
     
     def _broadcast_user_join(self, username):
         """Broadcast a user join notification."""
@@ -182,23 +422,125 @@ class ChatServer:
         
         self._broadcast(json.dumps(message).encode('utf-8'))
     
-    def _broadcast_user_list(self):
-        """Broadcast the current user list."""
-        message = {
-            'type': 'users',
-            'users': list(self.users.values()),
+    def _handle_search(self, request):
+        """Search the message history and return one page of results."""
+        message = request.message
+        try:
+            limit = min(int(message.get('limit', 20)), 100)
+            before = message.get('before')
+            before = int(before) if before is not None else None
+        except (TypeError, ValueError):
+            return self._create_error_response("limit and before must be integers")
+        
+        results, next_before = self.history.search(message.get('query', ''), message.get('username'),
+                                                   limit, before)
+        return json.dumps({
+            'type': 'search_results',
+            'results': results,
+            'next': next_before,
             'timestamp': time.time()
-        }
+        }).encode('utf-8')
+    
+    def _handle_users_request(self, request):
+        """Send a user who missed an update a fresh snapshot."""
+        self._send_user_snapshot(request.connection_id)
+        return None
+    
+    def _send_user_snapshot(self, conn_id):
+        """Send one user the full user list, as of the latest update."""
+        # Holding the lock keeps the snapshot ordered with the deltas
+        with self.presence_lock:
+            message = {
+                'type': 'users',
+                'users': sorted(self.published_users),
+                'version': self.presence_version,
+                'timestamp': time.time()
+            }
+            self.server.send(conn_id, json.dumps(message).encode('utf-8'))
+    
+    def _schedule_presence_update(self):
+        """Send the user list changes at the end of the coalescing window."""
+        if not self.presence_window:
+            self._broadcast_presence_delta()
+            return
         
-        self._broadcast(json.dumps(message).encode('utf-8'))
+        with self.presence_lock:
+            if self.presence_timer is None:
+                self.presence_timer = threading.Timer(self.presence_window, self._broadcast_presence_delta)
+                self.presence_timer.daemon = True
+                self.presence_timer.start()
+    
+    def _broadcast_presence_delta(self):
+        """Broadcast the users added and removed since the last update."""
+        with self.presence_lock:
+            self.presence_timer = None
+            current = set(self._all_usernames())
+            added = current - self.published_users
+            removed = self.published_users - current
+            if not added and not removed:
+                return
+            
+            self.presence_version += 1
+            self.published_users = current
+            message = {
+                'type': 'users',
+                'version': self.presence_version,
+                'added': sorted(added),
+                'removed': sorted(removed),
+                'timestamp': time.time()
+            }
+            self._broadcast(json.dumps(message).encode('utf-8'))
+    
+    def _queue_broadcast(self, data):
+        """Add a message to the next batch, starting its window if it is the first."""
+        with self.batch_lock:
+            self.pending_broadcasts.append(data)
+            if self.batch_timer is None:
+                self.batch_timer = threading.Timer(self.batch_window, self._flush_broadcasts)
+                self.batch_timer.daemon = True
+                self.batch_timer.start()
+    
+    def _flush_broadcasts(self):
+        """Broadcast the waiting messages, as one batch if there are several."""
+        with self.batch_lock:
+            if self.batch_timer:
+                self.batch_timer.cancel()
+                self.batch_timer = None
+            pending, self.pending_broadcasts = self.pending_broadcasts, []
+            if len(pending) == 1:
+                self._send_to_all(pending[0])
+            elif pending:
+                # The messages are already JSON, so we splice them in rather than re-encoding
+                self._send_to_all(b'{"type": "batch", "messages": [' + b', '.join(pending) + b']}')
     
     def _broadcast(self, data):
-        """Send data to all connected clients."""
+        """Send data to all connected clients, after any chat messages waiting in a batch."""
+        if self.pending_broadcasts:
+            self._flush_broadcasts()
+        self._send_to_all(data)
+    
+    def _send_to_all(self, data):
+        """Send data to all connected clients, numbered for those with sessions."""
         for conn_id in list(self.users.keys()):
+            if conn_id in self.connection_sessions:
+                continue  # Sent through the session below
             try:
                 self.server.send(conn_id, data)
             except Exception as e:
                 print(f"Error broadcasting to {conn_id}: {e}")
+        
+        for session in list(self.sessions.values()):
+            self._deliver(session, data)
+    
+    def _deliver(self, session, data):
+        """Number a broadcast for one session, and send it if its user is connected."""
+        with session.lock:
+            data = session.add(data)
+            if session.conn_id is not None:
+                try:
+                    self.server.send(session.conn_id, data)
+                except Exception as e:
+                    print(f"Error broadcasting to {session.conn_id}: {e}")
     
     def _create_error_response(self, error_message):
         """Create an error response."""
@@ -212,23 +554,65 @@ class ChatServer:
 class ChatClient:
     """A simple chat client using our TCP implementation."""
     
-    def __init__(self, username):
-        """Initialize the chat client."""
+    def __init__(self, username, compression=None, heartbeat_interval=None, reconnect_policy=None):
+        """Initialize the chat client.
+        
+        Pass a list of compressor names (e.g. ['zlib']) to negotiate
+        compression with the server when connecting, a heartbeat_interval
+        to ping the server and measure round-trip times, and a
+        ReconnectPolicy to reconnect (and resume our session) if the
+        connection drops. Resuming needs the framed protocol, so with a
+        reconnect_policy we always negotiate it, without compression
+        unless asked for.
+        """
         self.username = username
         self.client = EventDrivenTCPClient()
         self.connected = False
         
+        if compression is None and reconnect_policy is not None:
+            compression = []
+        if compression is not None:
+            self.client.set_compression(compression)
+        if heartbeat_interval:
+            self.client.set_heartbeat(heartbeat_interval)
+        if reconnect_policy is not None:
+            self.client.set_reconnect_policy(reconnect_policy)
+        
         # Set up event handlers
         self.client.on_connect = self._on_connected
+        self.client.on_reconnect = self._on_reconnected
         self.client.on_disconnect = self._on_disconnected
         self.client.on_data = self._on_data_received
         self.client.on_error = self._on_error
         
+        # Route messages from the server by type
+        self.router = MessageRouter(key='type', on_error=self._on_message_error)
+        self.router.use(self._track_sequence)
+        self.router.route('message', self._handle_chat_message)
+        self.router.route('join', self._handle_join)
+        self.router.route('leave', self._handle_leave)
+        self.router.route('users', self._handle_users)
+        self.router.route('search_results', self._handle_search_results)
+        self.router.route('batch', self._handle_batch)
+        self.router.route('welcome', self._handle_welcome)
+        self.router.route('resumed', self._handle_resumed)
+        self.router.route('resume_failed', self._handle_resume_failed)
+        self.router.route('goodbye', self._handle_goodbye)
+        self.router.route('error', self._handle_error)
+        self.router.set_default_handler(self._handle_unknown)
+        
         # Callback for message display
         self.message_callback = None
         
-        # Current user list
+        # Current user list, and the version of the last update applied
         self.users = []
+        self.users_version = None
+        
+        # Our session, if the server keeps them, and the last broadcast we received
+        self.session_token = None
+        self.last_seq = 0
+        self.unacked = 0
+        self.ack_interval = 32  # Acknowledge broadcasts after this many
     
     def connect(self, host, port):
         """Connect to the chat server."""
@@ -240,6 +624,11 @@ class ChatClient:
             print("Not connected to a server")
             return False
         
+        # A new join starts a new session
+        self.session_token = None
+        self.last_seq = 0
+        self.unacked = 0
+        
         # Send join message
         message = {
             'type': 'join',
@@ -285,6 +674,25 @@ class ChatClient:
         self.client.close()
         return result
     
+    def search(self, query='', username=None, limit=20, before=None):
+        """Search the chat history; pass a page's `next` as `before` for the following page."""
+        if not self.connected:
+            print("Not connected to a server")
+            return False
+        
+        message = {'type': 'search', 'query': query, 'limit': limit}
+        if username:
+            message['username'] = username
+        if before is not None:
+            message['before'] = before
+        return self.client.send(json.dumps(message).encode('utf-8'))
+    
+    def request_users(self):
+        """Ask the server for a fresh snapshot of the user list."""
+        if not self.connected:
+            return False
+        return self.client.send(json.dumps({'type': 'users'}).encode('utf-8'))
+    
     def set_message_callback(self, callback):
         """Set the callback for displaying messages."""
         self.message_callback = callback
@@ -292,9 +700,26 @@ class ChatClient:
     def _on_connected(self, host, port):
         """Handle successful connection."""
         self.connected = True
+        self.users_version = None  # A snapshot comes when we join
         if self.message_callback:
             self.message_callback(f"Connected to {host}:{port}")
     
+    def _on_reconnected(self, host, port):
+        """Resume our session after the connection came back, or join again."""
+        self.connected = True
+        self.users_version = None  # A snapshot comes when we resume or join
+        if self.message_callback:
+            self.message_callback(f"Reconnected to {host}:{port}")
+        
+        if self.session_token:
+            self.client.send(json.dumps({
+                'type': 'resume',
+                'token': self.session_token,
+                'ack': self.last_seq
+            }).encode('utf-8'))
+        else:
+            self.join()
+    
     def _on_disconnected(self):
         """Handle disconnection."""
         self.connected = False
@@ -308,55 +733,112 @@ class ChatClient:
     
     def _on_data_received(self, data):
         """Handle received data."""
-        try:
-            message = json.loads(data.decode('utf-8'))
-            message_type = message.get('type')
-            
-            if message_type == 'message':
-                self._handle_chat_message(message)
-            elif message_type == 'join':
-                self._handle_join(message)
-            elif message_type == 'leave':
-                self._handle_leave(message)
-            elif message_type == 'users':
-                self._handle_users(message)
-            elif message_type == 'welcome':
-                self._handle_welcome(message)
-            elif message_type == 'goodbye':
-                self._handle_goodbye(message)
-            elif message_type == 'error':
-                self._handle_error(message)
+        self.router.dispatch(data)
+    
+    def _on_message_error(self, request, reason):
+        """Report a message that couldn't be handled."""
+        if self.message_callback:
+            if not request.decoded:
+                self.message_callback(f"Received invalid JSON: {request.data.decode('utf-8', 'replace')}")
             else:
-                if self.message_callback:
-                    self.message_callback(f"Received unknown message type: {message_type}")
+                self.message_callback(f"Error processing message: {reason}")
+    
+    def _track_sequence(self, request, next_handler):
+        """Skip numbered broadcasts we already have, and acknowledge the rest now and then."""
+        seq = request.message.get('seq') if isinstance(request.message, dict) else None
+        if seq is None:
+            return next_handler(request)
+        if seq <= self.last_seq:
+            return None  # Replayed after a reconnect, but it had already arrived
         
-        except json.JSONDecodeError:
-            if self.message_callback:
-                self.message_callback(f"Received invalid JSON: {data.decode('utf-8')}")
-        except Exception as e:
-            if self.message_callback:
-                self.message_callback(f"Error processing message: {e}")
+        self.last_seq = seq
+        response = next_handler(request)
+        self.unacked += 1
+        if self.unacked >= self.ack_interval:
+            self.unacked = 0
+            self.client.send(json.dumps({'type': 'ack', 'seq': seq}).encode('utf-8'))
+        return response
+    
+    def _handle_unknown(self, request):
+        """Handle a message of a type we don't know."""
+        if self.message_callback:
+            self.message_callback(f"Received unknown message type: {request.route}")
     
-    def _handle_chat_message(self, message):
+    def _handle_chat_message(self, request):
         """Handle a chat message."""
+        message = request.message
         username = message.get('username')
         content = message.get('content')
         timestamp = message.get('timestamp')
         
+        if self.message_callback:
+            time_str = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
+            self.message_callback(f"[{time_str}] {username}: {content}")
+    
+    def _handle_batch(self, request):
+        """Handle each message of a batch in turn, as if it had arrived alone."""
+        for message in request.message.get('messages', []):
+            self.router.dispatch(json.dumps(message).encode('utf-8'))
+    
+    def _handle_join(self, request):
+        """Handle a user join notification."""
+        message = request.message
+        username = message.get('username')
+        timestamp = message.get('timestamp')
+        
+        if self.message_callback:
+            time_str = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
+            self.message_callback(f"[{time_str}] {username} joined the chat")
+    
+    def _handle_leave(self, request):
+        """Handle a user leave notification."""
+        message = request.message
+        username = message.get('username')
+        timestamp = message.get('timestamp')
+        
         if self.message_callback:
             time_str = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
             self.message_callback(f"[{time_str}] {username} left the chat")
     
-    def _handle_users(self, message):
-        """Handle a users list update."""
-        self.users = message.get('users', [])
+    def _handle_users(self, request):
+        """Handle a user list snapshot or delta."""
+        message = request.message
+        version = message.get('version')
+        
+        if 'users' in message:
+            self.users = list(message['users'])
+            self.users_version = version
+        elif self.users_version is None or version is None or version <= self.users_version:
+            return  # Our snapshot is on its way, or we already have this update
+        elif version != self.users_version + 1:
+            self.request_users()  # We missed an update
+            return
+        else:
+            removed = set(message.get('removed', []))
+            self.users = [name for name in self.users if name not in removed]
+            self.users += [name for name in message.get('added', []) if name not in self.users]
+            self.users_version = version
         
         if self.message_callback:
             users_str = ", ".join(self.users)
             self.message_callback(f"Users in chat: {users_str}")
     
-    def _handle_welcome(self, message):
+    def _handle_search_results(self, request):
+        """Handle a page of search results."""
+        message = request.message
+        results = message.get('results', [])
+        
+        if self.message_callback:
+            self.message_callback(f"Found {len(results)} message(s)"
+                                  + (f" (more before #{message['next']})" if message.get('next') else ""))
+            for result in results:
+                time_str = datetime.datetime.fromtimestamp(result['timestamp']).strftime('%H:%M:%S')
+                self.message_callback(f"  #{result['id']} [{time_str}] {result['username']}: {result['content']}")
+    
+    def _handle_welcome(self, request):
         """Handle a welcome message."""
+        message = request.message
+        self.session_token = message.get('session')
         content = message.get('content')
         timestamp = message.get('timestamp')
         
@@ -364,8 +846,27 @@ class ChatClient:
             time_str = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
             self.message_callback(f"[{time_str}] Server: {content}")
     
-    def _handle_goodbye(self, message):
+    def _handle_resumed(self, request):
+        """Handle the server taking us back into our session."""
+        message = request.message
+        replayed = message.get('replayed', 0)
+        lost = message.get('lost', 0)
+        
+        if self.message_callback:
+            self.message_callback(f"Resumed the chat as {message.get('username')}, "
+                                  f"{replayed} message(s) arrived while we were away"
+                                  + (f", {lost} more were lost" if lost else ""))
+    
+    def _handle_resume_failed(self, request):
+        """Join again when our session is gone."""
+        self.session_token = None
+        if self.message_callback:
+            self.message_callback(f"Server: {request.message.get('content')}")
+        self.join()
+    
+    def _handle_goodbye(self, request):
         """Handle a goodbye message."""
+        message = request.message
         content = message.get('content')
         timestamp = message.get('timestamp')
         
@@ -373,8 +874,9 @@ class ChatClient:
             time_str = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
             self.message_callback(f"[{time_str}] Server: {content}")
     
-    def _handle_error(self, message):
+    def _handle_error(self, request):
         """Handle an error message."""
+        message = request.message
         content = message.get('content')
         timestamp = message.get('timestamp')
         
@@ -382,18 +884,21 @@ class ChatClient:
             time_str = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
             self.message_callback(f"[{time_str}] Error: {content}")
 
-# %% ../nbs/04_chat_app.ipynb 11
-def run_chat_client():
-    """Run a command-line chat client."""
+# %% ../nbs/04_chat_app.ipynb 12
+def run_chat_client(username=None, host=None, port=None):
+    """Run a command-line chat client, prompting for any settings not given."""
     print("=== Chat Client ===")
-    username = input("Enter your username: ")
+    if username is None:
+        username = input("Enter your username: ")
     
-    host = input("Enter server host (default: localhost): ") or LOCALHOST
-    port_str = input("Enter server port (default: 8000): ") or "8000"
-    port = int(port_str)
+    if host is None:
+        host = input("Enter server host (default: localhost): ") or LOCALHOST
+    if port is None:
+        port_str = input("Enter server port (default: 8000): ") or "8000"
+        port = int(port_str)
     
-    # Create the chat client
-    client = ChatClient(username)
+    # Create the chat client, reconnecting if the connection drops
+    client = ChatClient(username, reconnect_policy=ReconnectPolicy())
     
     # Define the message callback
     def display_message(msg):
@@ -412,6 +917,7 @@ def run_chat_client():
     
     print("\nChat commands:")
     print("/users - Show current users")
+    print("/search <words> - Search recent messages")
     print("/exit or /quit - Leave the chat")
     print("Any other text will be sent as a message")
     print("Start typing your messages:\n")
@@ -425,23 +931,33 @@ def run_chat_client():
             elif message.lower() == "/users":
                 users_str = ", ".join(client.users)
                 print(f"Users in chat: {users_str}")
+            elif message.lower().startswith("/search "):
+                client.search(message[len("/search "):])
             else:
                 client.send_message(message)
+    except EOFError:
+        pass  # Input closed, e.g. the end of a piped file
     except KeyboardInterrupt:
         print("\nInterrupted by user")
     finally:
         print("Leaving chat...")
         client.leave()
 
-# %% ../nbs/04_chat_app.ipynb 12
-def run_chat_server():
-    """Run a chat server."""
+# %% ../nbs/04_chat_app.ipynb 13
+def run_chat_server(port=None, host=LOCALHOST, heartbeat_interval=None, history=0, batch_window=None,
+                    session_grace=None):
+    """Run a chat server until interrupted, prompting for the port if not given."""
     print("=== Chat Server ===")
-    port_str = input("Enter server port (default: 8000): ") or "8000"
-    port = int(port_str)
+    if port is None:
+        port_str = input("Enter server port (default: 8000): ") or "8000"
+        port = int(port_str)
     
     # Create and start the chat server
-    server = ChatServer(port=port)
+    server = ChatServer(host=host, port=port, heartbeat_interval=heartbeat_interval)
+    if history:
+        server.set_history(ChatHistory(max_messages=history))
+    server.set_batch_window(batch_window)
+    server.set_sessions(session_grace)
     server.start()
     
     print("\nServer is running. Press Ctrl+C to stop.")
@@ -453,12 +969,421 @@ def run_chat_server():
     finally:
         server.stop()
 
-# %% ../nbs/04_chat_app.ipynb 14
+# %% ../nbs/04_chat_app.ipynb 15
 def start_server():
     """Entry point for starting a chat server."""
     run_chat_server()
 
-# %% ../nbs/04_chat_app.ipynb 15
+# %% ../nbs/04_chat_app.ipynb 16
 def start_client():
     """Entry point for starting a chat client."""
     run_chat_client()
+
+# %% ../nbs/04_chat_app.ipynb 18
+class FederatedChatServer(ChatServer):
+    """A chat server that shares its users and messages with peer servers."""
+    
+    def __init__(self, host=LOCALHOST, port=0, heartbeat_interval=None, node_id=None, max_seen=10000,
+                 presence_window=0.05):
+        """Initialize the server; node_id defaults to a random ID."""
+        super().__init__(host, port, heartbeat_interval, presence_window)
+        self.node_id = node_id or uuid.uuid4().hex[:8]
+        self.lock = threading.RLock()
+        
+        # Peer links: {link_id: {'node': peer node_id, 'send': callable}}
+        self.links = {}
+        self.peer_clients = {}
+        
+        # Users on other servers: {username: (node_id, joined_at)}
+        self.remote_users = {}
+        self.join_times = {}
+        
+        # Recently seen event IDs, for loop suppression
+        self.seen = OrderedDict()
+        self.max_seen = max_seen
+        self.sequence = itertools.count()
+        
+        # Peers talk to us through the same router as clients
+        is_link = require(lambda request: request.connection_id in self.links, "Not a peer server")
+        self.router.route('peer_hello', self._handle_peer_hello, [require_fields('node')])
+        self.router.route('peer_welcome', self._handle_peer_welcome, [is_link])
+        self.router.route('relay', self._handle_relay, [is_link])
+        
+        # Relayed events, by kind
+        self.relay_handlers = {
+            'join': self._relay_join,
+            'leave': self._relay_leave,
+            'message': self._relay_message,
+            'users': self._relay_users,
+        }
+    
+    def add_peer(self, host, port):
+        """Open a persistent link to another federated server."""
+        link_id = f"peer:{format_address(host, port)}"
+        client = EventDrivenTCPClient()
+        client.set_compression([])
+        client.set_reconnect_policy(ReconnectPolicy(max_delay=5.0))
+        
+        client.on_connect = lambda host, port: self._open_link(link_id, client)
+        client.on_reconnect = lambda host, port: self._open_link(link_id, client)
+        client.on_disconnect = lambda: self._close_link(link_id)
+        client.on_data = lambda data: self.router.dispatch(data, link_id)
+        
+        self.peer_clients[link_id] = client
+        return client.connect(host, port)
+    
+    def stop(self):
+        """Close the peer links and stop the server."""
+        for client in self.peer_clients.values():
+            client.close()
+        self.peer_clients.clear()
+        super().stop()
+    
+    def _open_link(self, link_id, client):
+        """Register an outgoing peer link and introduce ourselves."""
+        with self.lock:
+            self.links[link_id] = {'node': None, 'send': client.send}
+        client.send(json.dumps({'type': 'peer_hello', 'node': self.node_id}).encode('utf-8'))
+    
+    def _close_link(self, link_id):
+        """Forget a peer link, and the users of its server if no other link reaches it."""
+        with self.lock:
+            link = self.links.pop(link_id, None)
+            node = link['node'] if link else None
+            if not node or any(other['node'] == node for other in self.links.values()):
+                return
+            gone = [name for name, (origin, _) in self.remote_users.items() if origin == node]
+            for name in gone:
+                del self.remote_users[name]
+        
+        print(f"Lost peer {node}")
+        for name in gone:
+            self._broadcast_user_leave(name)
+        if gone:
+            self._schedule_presence_update()
+    
+    def _handle_peer_hello(self, request):
+        """Accept an incoming peer link."""
+        conn_id = request.connection_id
+        with self.lock:
+            self.links[conn_id] = {'node': request.message['node'],
+                                   'send': lambda data: self.server.send(conn_id, data)}
+        print(f"Peer {request.message['node']} linked")
+        self._send_snapshot(conn_id)
+        return {'type': 'peer_welcome', 'node': self.node_id}
+    
+    def _handle_peer_welcome(self, request):
+        """Our outgoing peer link was accepted."""
+        with self.lock:
+            self.links[request.connection_id]['node'] = request.message.get('node')
+        print(f"Peer {request.message.get('node')} linked")
+        self._send_snapshot(request.connection_id)
+    
+    def _send_snapshot(self, link_id):
+        """Send a peer the users we know about, grouped by the server they are on."""
+        with self.lock:
+            by_node = {self.node_id: [[name, self.join_times.get(conn_id, 0)]
+                                      for conn_id, name in self.users.items()]}
+            for name, (origin, joined_at) in self.remote_users.items():
+                by_node.setdefault(origin, []).append([name, joined_at])
+            link = self.links.get(link_id)
+        
+        for origin, users in by_node.items():
+            event = self._new_event('users', origin=origin, users=users)
+            if link:
+                link['send'](json.dumps(event).encode('utf-8'))
+    
+    def _new_event(self, kind, origin=None, **fields):
+        """Create a relay event with a fresh ID and remember that we've seen it."""
+        event_id = f"{self.node_id}:{next(self.sequence)}"
+        with self.lock:
+            self._mark_seen(event_id)
+        return {'type': 'relay', 'id': event_id, 'origin': origin or self.node_id, 'event': kind, **fields}
+    
+    def _mark_seen(self, event_id):
+        """Remember an event ID, forgetting the oldest beyond max_seen."""
+        self.seen[event_id] = True
+        if len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+    
+    def _relay(self, kind, **fields):
+        """Send an event that happened on this server to all peers."""
+        if self.links:
+            self._send_to_links(json.dumps(self._new_event(kind, **fields)).encode('utf-8'))
+    
+    def _send_to_links(self, data, exclude=None):
+        """Send data to every peer link except `exclude`."""
+        with self.lock:
+            links = [link for link_id, link in self.links.items() if link_id != exclude]
+        for link in links:
+            try:
+                link['send'](data)
+            except Exception as e:
+                print(f"Error relaying to peer {link['node']}: {e}")
+    
+    def _handle_relay(self, request):
+        """Apply an event from a peer and pass it on to the other peers."""
+        event = request.message
+        with self.lock:
+            if event.get('id') in self.seen:
+                return None  # Already seen: it went around a loop
+            self._mark_seen(event.get('id'))
+        
+        self._send_to_links(request.data, exclude=request.connection_id)
+        
+        handler = self.relay_handlers.get(event.get('event'))
+        if handler:
+            handler(event)
+        return None
+    
+    def _claim_remote(self, username, origin, joined_at):
+        """Record a remote user unless an earlier claim on the name stands.
+        
+        Returns whether the username is newly visible here.
+        """
+        claim = (joined_at, origin)
+        current = self.remote_users.get(username)
+        if current and (current[1], current[0]) <= claim:
+            return False
+        
+        local = next((conn_id for conn_id, name in self.users.items() if name == username), None)
+        if local:
+            if (self.join_times.get(local, 0), self.node_id) <= claim:
+                return False
+            self._evict(local)
+        
+        self.remote_users[username] = (origin, joined_at)
+        return current is None and local is None
+    
+    def _evict(self, conn_id):
+        """Unregister a local user who lost a username conflict."""
+        username = self.users.pop(conn_id)
+        self.join_times.pop(conn_id, None)
+        self._end_session(conn_id)
+        print(f"User {username} lost the name to another server")
+        self.server.send(conn_id, self._create_error_response("Username already taken"))
+    
+    def _relay_join(self, event):
+        """A user joined on another server."""
+        with self.lock:
+            announce = self._claim_remote(event['username'], event['origin'], event['joined_at'])
+        if announce:
+            self._broadcast_user_join(event['username'])
+        self._schedule_presence_update()
+    
+    def _relay_leave(self, event):
+        """A user left another server."""
+        username = event['username']
+        with self.lock:
+            current = self.remote_users.get(username)
+            if not current or current[0] != event['origin']:
+                return
+            del self.remote_users[username]
+        self._broadcast_user_leave(username)
+        self._schedule_presence_update()
+    
+    def _relay_message(self, event):
+        """A user on another server sent a chat message."""
+        self._broadcast_message(event['username'], event['content'], event.get('timestamp'))
+    
+    def _relay_users(self, event):
+        """Replace what we know about the users of one server with its snapshot."""
+        origin = event['origin']
+        if origin == self.node_id:
+            return
+        
+        with self.lock:
+            before = {name for name, (node, _) in self.remote_users.items() if node == origin}
+            for name in before:
+                del self.remote_users[name]
+            for name, joined_at in event['users']:
+                self._claim_remote(name, origin, joined_at)
+            after = {name for name, (node, _) in self.remote_users.items() if node == origin}
+        
+        for name in before - after:
+            self._broadcast_user_leave(name)
+        for name in after - before:
+            self._broadcast_user_join(name)
+        if before != after:
+            self._schedule_presence_update()
+    
+    def _username_taken(self, username):
+        """Names are unique across all federated servers."""
+        return super()._username_taken(username) or username in self.remote_users
+    
+    def _all_usernames(self):
+        """Include the users on other servers."""
+        return super()._all_usernames() + list(self.remote_users)
+    
+    def _handle_join(self, request):
+        """Handle a join and announce it to our peers."""
+        conn_id = request.connection_id
+        with self.lock:
+            joined_at = time.time()
+            response = super()._handle_join(request)
+            joined = conn_id in self.users and conn_id not in self.join_times
+            if joined:
+                self.join_times[conn_id] = joined_at
+        
+        if joined:
+            self._relay('join', username=self.users[conn_id], joined_at=joined_at)
+        return response
+    
+    def _handle_chat_message(self, request):
+        """Handle a chat message and relay it to our peers."""
+        response = super()._handle_chat_message(request)
+        if response is None:
+            self._relay('message', username=self.users.get(request.connection_id),
+                        content=request.message.get('content'), timestamp=time.time())
+        return response
+    
+    def _handle_leave(self, request):
+        """Handle a leave and announce it to our peers."""
+        username = self.users.get(request.connection_id)
+        response = super()._handle_leave(request)
+        self.join_times.pop(request.connection_id, None)
+        self._relay('leave', username=username)
+        return response
+    
+    def _on_client_disconnect(self, conn_id):
+        """Handle a user or a peer server disconnecting."""
+        if conn_id in self.links:
+            self._close_link(conn_id)
+            return
+        
+        username = self.users.get(conn_id)
+        super()._on_client_disconnect(conn_id)
+        if username and username not in self.users.values():  # Not kept for a resume
+            self.join_times.pop(conn_id, None)
+            self._relay('leave', username=username)
+    
+    def _move_user(self, old_key, new_key):
+        """Move a user's join time along with them."""
+        with self.lock:
+            super()._move_user(old_key, new_key)
+            if old_key in self.join_times:
+                self.join_times[new_key] = self.join_times.pop(old_key)
+
+# %% ../nbs/04_chat_app.ipynb 23
+class ChatHistory:
+    """A bounded, searchable store of recent chat messages."""
+    
+    def __init__(self, max_messages=10000):
+        """Keep up to max_messages messages, evicting the oldest first."""
+        if max_messages < 1:
+            raise ValueError("max_messages must be at least 1")
+        self.max_messages = max_messages
+        self.messages = OrderedDict()  # {message_id: (username, content, timestamp, tokens)}
+        self.tokens = {}               # {token: [message_id, ...]}, oldest first
+        self.by_user = {}              # {username: [message_id, ...]}, oldest first
+        self.next_id = 1
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def tokenize(text):
+        """Split text into its distinct lower-case words."""
+        return set(re.findall(r"\w+", text.lower()))
+    
+    def add(self, username, content, timestamp=None):
+        """Store and index a message, returning its ID."""
+        tokens = self.tokenize(content)
+        with self.lock:
+            message_id = self.next_id
+            self.next_id += 1
+            self.messages[message_id] = (username, content, timestamp or time.time(), tokens)
+            for token in tokens:
+                self.tokens.setdefault(token, []).append(message_id)
+            self.by_user.setdefault(username, []).append(message_id)
+            
+            while len(self.messages) > self.max_messages:
+                self._evict_oldest()
+        return message_id
+    
+    def _evict_oldest(self):
+        """Drop the oldest message and its index entries (call with the lock held)."""
+        message_id, (username, _, _, tokens) = self.messages.popitem(last=False)
+        for token in tokens:
+            self._unindex(self.tokens, token, message_id)
+        self._unindex(self.by_user, username, message_id)
+    
+    @staticmethod
+    def _unindex(index, key, message_id):
+        """Remove a message from one index entry, dropping the entry if it's now empty."""
+        postings = index[key]
+        del postings[bisect_left(postings, message_id)]
+        if not postings:
+            del index[key]
+    
+    def search(self, query='', username=None, limit=20, before=None):
+        """Find messages containing every word of query (and by username, if given), newest first.
+        
+        Returns a page of at most limit results, and the cursor for the next page (or None).
+        """
+        tokens = self.tokenize(query or '')
+        with self.lock:
+            postings = [self.tokens.get(token, []) for token in tokens]
+            if username:
+                postings.append(self.by_user.get(username, []))
+            if not postings:
+                # No filters: the most recent messages, whose IDs are consecutive
+                postings = [range(self.next_id - len(self.messages), self.next_id)]
+            
+            postings.sort(key=len)
+            shortest, others = postings[0], postings[1:]
+            
+            # Start the walk at the cursor rather than skipping the newer IDs one by one
+            end = len(shortest) if before is None else bisect_left(shortest, before)
+            results = []
+            for index in range(end - 1, -1, -1):
+                message_id = shortest[index]
+                if all(self._contains(other, message_id) for other in others):
+                    if len(results) == limit:
+                        return results, results[-1]['id']
+                    author, content, timestamp, _ = self.messages[message_id]
+                    results.append({'id': message_id, 'username': author,
+                                    'content': content, 'timestamp': timestamp})
+            return results, None
+    
+    @staticmethod
+    def _contains(postings, message_id):
+        """Check whether a sorted list of IDs holds message_id."""
+        index = bisect_left(postings, message_id)
+        return index < len(postings) and postings[index] == message_id
+    
+    def __len__(self):
+        """Get the number of stored messages."""
+        return len(self.messages)
+
+# %% ../nbs/04_chat_app.ipynb 29
+class ChatSession:
+    """A user's place in the chat, kept for a while after their connection drops."""
+    
+    def __init__(self, username, max_buffered=1000):
+        """Create a session with a new random token."""
+        self.username = username
+        self.token = secrets.token_urlsafe(16)
+        self.key = f"session:{self.token}"  # Stands in for the connection ID while disconnected
+        self.conn_id = None
+        self.last_seq = 0
+        self.buffer = deque(maxlen=max_buffered)  # (seq, data) of unacknowledged broadcasts
+        self.lock = threading.Lock()
+        self.timer = None
+    
+    def add(self, data):
+        """Number a broadcast and keep it until acknowledged; returns the numbered message."""
+        self.last_seq += 1
+        # The message is already JSON, so we splice the number in rather than re-encoding
+        data = b'{"seq": %d, ' % self.last_seq + data[1:]
+        self.buffer.append((self.last_seq, data))
+        return data
+    
+    def acknowledge(self, seq):
+        """Forget the broadcasts up to seq, which the user has received."""
+        while self.buffer and self.buffer[0][0] <= seq:
+            self.buffer.popleft()
+    
+    def replay(self, after):
+        """Get how many broadcasts after seq `after` were lost to the buffer limit, and the rest."""
+        self.acknowledge(after)
+        first = self.buffer[0][0] if self.buffer else self.last_seq + 1
+        return max(0, first - after - 1), [data for _, data in self.buffer]
@@ -0,0 +1,257 @@
+"""Running servers, clients and benchmarks with `python -m python_tcp`"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/13_cli.ipynb.
+
+# %% auto 0
+__all__ = ['ENV_PREFIX', 'BENCHMARKS', 'cmd_serve', 'cmd_chat_server', 'cmd_chat_client', 'cmd_bench', 'cmd_replay',
+           'build_parser', 'main']
+
+# %% ../nbs/13_cli.ipynb 3
+import argparse
+import importlib
+import os
+import signal
+import sys
+import time
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/13_cli.ipynb 5
+ENV_PREFIX = 'PYTHON_TCP_'
+
+def _env(name: str, default: Any = None, convert: Callable[[str], Any] = str) -> Any:
+    """Get an option's value from its environment variable, if set."""
+    value = os.environ.get(ENV_PREFIX + name.upper())
+    if value in (None, ''):
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        raise SystemExit(f"Invalid value for {ENV_PREFIX}{name.upper()}: {value!r}")
+
+def _is_true(value: str) -> bool:
+    """Convert a flag's environment variable, such as '1' or 'yes', to a bool."""
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+# %% ../nbs/13_cli.ipynb 7
+def _stop_on_sigterm() -> None:
+    """Treat SIGTERM like Ctrl+C, so servers shut down cleanly under a supervisor."""
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+def _serve_until_stopped(server: Any) -> None:
+    """Keep a started server running until the process is interrupted."""
+    print("Server is running. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nStopping server...")
+    finally:
+        server.stop()
+
+def _profile_on_signal(server: Any, seconds: float, accounting: Any = None) -> None:
+    """Profile a server for `seconds` (and print its CPU accounts) on each SIGUSR1."""
+    if not hasattr(signal, 'SIGUSR1'):
+        return  # Not available on Windows
+
+    def handler(signum, frame):
+        path = f"profile-{os.getpid()}-{int(time.time())}.folded"
+        try:
+            server.profile(seconds, path)
+            print(f"Profiling for {seconds:g}s into {path}")
+        except RuntimeError as e:
+            print(e)
+        if accounting is not None:
+            from python_tcp.benchmarks import print_results
+            print_results(accounting.report(), "CPU time by handler")
+
+    signal.signal(signal.SIGUSR1, handler)
+
+# %% ../nbs/13_cli.ipynb 9
+def _load_handler(spec: str) -> Callable[[str, bytes], Optional[bytes]]:
+    """Import a message handler given as 'module:function'."""
+    module_name, _, function_name = spec.partition(':')
+    if not module_name or not function_name:
+        raise SystemExit(f"Handler must be given as module:function, not {spec!r}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Run an event-driven server that echoes messages or runs a handler."""
+    from python_tcp.core import DEFAULT_BACKLOG
+    from python_tcp.server import EventDrivenTCPServer
+
+    server = EventDrivenTCPServer(host=args.host, port=args.port,
+                                  backlog=args.backlog or DEFAULT_BACKLOG,
+                                  buffer_size=args.buffer_size)
+    server.set_accept_options(args.accept_batch, args.defer_accept, args.fastopen)
+    if args.heartbeat:
+        server.set_heartbeat(args.heartbeat)
+    if args.shared_memory:
+        server.set_shared_memory()
+    pool = None
+    if args.handler:
+        handler = _load_handler(args.handler)
+        if args.processes:
+            from python_tcp.workers import ProcessPoolHandler
+            handler = pool = ProcessPoolHandler(handler, max_workers=args.processes)
+        server.set_message_handler(handler)
+    recorder = None
+    if args.record:
+        from python_tcp.recording import TrafficRecorder
+        recorder = TrafficRecorder(args.record)
+        server.set_recorder(recorder)
+    accounting = None
+    if args.cpu_accounting:
+        from python_tcp.profiling import CPUAccounting
+        accounting = CPUAccounting()
+        server.set_cpu_accounting(accounting)
+    _profile_on_signal(server, args.profile_seconds, accounting)
+
+    server.start()
+    try:
+        _serve_until_stopped(server)
+    finally:
+        if pool is not None:
+            pool.close()
+        if recorder is not None:
+            recorder.stop()
+    return 0
+
+def cmd_chat_server(args: argparse.Namespace) -> int:
+    """Run a chat server."""
+    from python_tcp.chat_app import run_chat_server
+    run_chat_server(port=args.port, host=args.host, heartbeat_interval=args.heartbeat,
+                    history=args.history, batch_window=args.batch_window / 1000 if args.batch_window else None,
+                    session_grace=args.session_grace or None)
+    return 0
+
+def cmd_chat_client(args: argparse.Namespace) -> int:
+    """Run the command-line chat client."""
+    from python_tcp.chat_app import run_chat_client
+    if not args.username:
+        raise SystemExit("A username is required: pass --username or set PYTHON_TCP_USERNAME")
+    run_chat_client(username=args.username, host=args.host, port=args.port)
+    return 0
+
+# %% ../nbs/13_cli.ipynb 11
+BENCHMARKS = ('compression', 'transports', 'shared_memory', 'connections', 'accept', 'batching', 'chat_batching',
+              'proxy', 'load')
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Run a benchmark or a chat load test."""
+    if args.benchmark == 'load':
+        from python_tcp.loadtest import LoadProfile, run_chat_load
+        profile = LoadProfile(users=args.users, processes=args.workers, duration=args.duration)
+        run_chat_load(profile, host=args.host if args.port else None, port=args.port)
+        return 0
+
+    from python_tcp import benchmarks
+    getattr(benchmarks, f"bench_{args.benchmark}")()
+    return 0
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    """Replay a traffic recording against a server."""
+    from python_tcp.recording import replay_recording
+    replay_recording(args.recording, host=args.host, port=args.port,
+                     speed=args.speed or None)
+    return 0
+
+# %% ../nbs/13_cli.ipynb 13
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    address = argparse.ArgumentParser(add_help=False)
+    address.add_argument('--host', default=_env('host', '127.0.0.1'),
+                         help="Address to bind or connect to; unix:PATH for a Unix socket "
+                              "(env PYTHON_TCP_HOST, default: %(default)s)")
+    address.add_argument('--port', type=int, default=_env('port', 8000, int),
+                         help="Port to bind or connect to (env PYTHON_TCP_PORT, default: %(default)s)")
+
+    heartbeat = argparse.ArgumentParser(add_help=False)
+    heartbeat.add_argument('--heartbeat', type=float, default=_env('heartbeat', None, float),
+                           help="Seconds between heartbeats; off if not set (env PYTHON_TCP_HEARTBEAT)")
+
+    parser = argparse.ArgumentParser(prog='python -m python_tcp',
+                                     description="Run python_tcp servers, clients and benchmarks.")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+
+    serve = commands.add_parser('serve', parents=[address, heartbeat],
+                                help="Run an echo server, or a server for a message handler")
+    serve.add_argument('--handler', default=_env('handler'),
+                       help="Message handler as module:function (env PYTHON_TCP_HANDLER, default: echo)")
+    serve.add_argument('--processes', type=int, default=_env('processes', 0, int),
+                       help="Run the handler in this many worker processes; 0 runs it in the "
+                            "server's threads (env PYTHON_TCP_PROCESSES, default: %(default)s)")
+    serve.add_argument('--backlog', type=int, default=_env('backlog', None, int),
+                       help="Queued connection limit (env PYTHON_TCP_BACKLOG, default: socket.SOMAXCONN)")
+    serve.add_argument('--accept-batch', type=int, default=_env('accept_batch', 64, int),
+                       help="Most connections accepted per wakeup "
+                            "(env PYTHON_TCP_ACCEPT_BATCH, default: %(default)s)")
+    serve.add_argument('--defer-accept', type=int, default=_env('defer_accept', None, int),
+                       help="Seconds to wait for a client's first data before accepting; "
+                            "Linux only (env PYTHON_TCP_DEFER_ACCEPT)")
+    serve.add_argument('--fastopen', type=int, default=_env('fastopen', None, int),
+                       help="TCP Fast Open queue length (env PYTHON_TCP_FASTOPEN)")
+    serve.add_argument('--buffer-size', type=int, default=_env('buffer_size', 1024, int),
+                       help="Bytes per read (env PYTHON_TCP_BUFFER_SIZE, default: %(default)s)")
+    serve.add_argument('--shared-memory', action='store_true', default=_env('shared_memory', False, _is_true),
+                       help="Let same-host clients use shared memory rings (env PYTHON_TCP_SHARED_MEMORY)")
+    serve.add_argument('--record', default=_env('record'),
+                       help="Record inbound traffic to this file (env PYTHON_TCP_RECORD)")
+    serve.add_argument('--cpu-accounting', action='store_true', default=_env('cpu_accounting', False, _is_true),
+                       help="Keep per-handler CPU totals, printed on SIGUSR1 (env PYTHON_TCP_CPU_ACCOUNTING)")
+    serve.add_argument('--profile-seconds', type=float, default=_env('profile_seconds', 10.0, float),
+                       help="How long SIGUSR1 profiles the server for "
+                            "(env PYTHON_TCP_PROFILE_SECONDS, default: %(default)s)")
+    serve.set_defaults(func=cmd_serve)
+
+    chat_server = commands.add_parser('chat-server', parents=[address, heartbeat],
+                                      help="Run a chat server")
+    chat_server.add_argument('--history', type=int, default=_env('history', 0, int),
+                             help="Keep this many recent messages for searching; 0 disables "
+                                  "search (env PYTHON_TCP_HISTORY, default: %(default)s)")
+    chat_server.add_argument('--batch-window', type=float, default=_env('batch_window', 0.0, float),
+                             help="Batch the chat messages of each window of this many milliseconds; "
+                                  "0 disables (env PYTHON_TCP_BATCH_WINDOW, default: %(default)s)")
+    chat_server.add_argument('--session-grace', type=float, default=_env('session_grace', 0.0, float),
+                             help="Let users whose connection drops resume within this many seconds; "
+                                  "0 disables (env PYTHON_TCP_SESSION_GRACE, default: %(default)s)")
+    chat_server.set_defaults(func=cmd_chat_server)
+
+    chat_client = commands.add_parser('chat-client', parents=[address],
+                                      help="Run the command-line chat client")
+    chat_client.add_argument('--username', default=_env('username'),
+                             help="Name to join the chat as (env PYTHON_TCP_USERNAME)")
+    chat_client.set_defaults(func=cmd_chat_client)
+
+    bench = commands.add_parser('bench', help="Run a benchmark or a chat load test")
+    bench.add_argument('benchmark', choices=BENCHMARKS)
+    bench.add_argument('--host', default=_env('host', '127.0.0.1'),
+                       help="Chat server to load test (env PYTHON_TCP_HOST, default: %(default)s)")
+    bench.add_argument('--port', type=int, default=_env('port', 0, int),
+                       help="Chat server port to load test; 0 starts a server for the test "
+                            "(env PYTHON_TCP_PORT, default: %(default)s)")
+    bench.add_argument('--users', type=int, default=_env('users', 200, int),
+                       help="Simulated chat users (env PYTHON_TCP_USERS, default: %(default)s)")
+    bench.add_argument('--workers', type=int, default=_env('workers', 4, int),
+                       help="Load generator processes (env PYTHON_TCP_WORKERS, default: %(default)s)")
+    bench.add_argument('--duration', type=float, default=_env('duration', 10.0, float),
+                       help="Seconds of load once all users have joined "
+                            "(env PYTHON_TCP_DURATION, default: %(default)s)")
+    bench.set_defaults(func=cmd_bench)
+
+    replay = commands.add_parser('replay', parents=[address],
+                                 help="Replay a traffic recording against a server")
+    replay.add_argument('recording', help="File written by serve --record")
+    replay.add_argument('--speed', type=float, default=_env('speed', 1.0, float),
+                        help="Replay speed relative to the recording; 0 replays as fast as "
+                             "possible (env PYTHON_TCP_SPEED, default: %(default)s)")
+    replay.set_defaults(func=cmd_replay)
+
+    return parser
+
+# %% ../nbs/13_cli.ipynb 15
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface and return its exit code."""
+    args = build_parser().parse_args(argv)
+    _stop_on_sigterm()
+    return args.func(args)
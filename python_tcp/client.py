@@ -3,12 +3,19 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/02_tcp_client.ipynb.
 
 # %% auto 0
-__all__ = ['TCPClient', 'AsyncTCPClient', 'EventDrivenTCPClient']
+__all__ = ['TCPClient', 'AsyncTCPClient', 'DeliveryQueue', 'ReconnectPolicy', 'EventDrivenTCPClient', 'HashRing', 'Shard',
+           'ShardedTCPClient']
 
 # %% ../nbs/02_tcp_client.ipynb 3
 from .core import *
+from .protocol import *
+import bisect
+import hashlib
+import random
 import socket
-from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable, Deque, Iterator
 import threading
 import time
 
@@ -24,26 +31,90 @@ class TCPClient:
         self.connected = False
         self.connection = None
         self.receive_thread = None
+        
+        # Compressors to request when connecting (None means a plain byte stream)
+        self.compression: Optional[List[str]] = None
+        self.compression_threshold = DEFAULT_COMPRESSION_THRESHOLD
+        
+        # TCP keepalive settings (idle, interval, count), off by default
+        self.keepalive: Optional[Tuple[int, int, int]] = None
+        
+        # How long to wait for a connection, and where hostnames are resolved
+        self.connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT
+        self.resolver: Optional[DNSCache] = default_dns_cache
+        
+        # How to wait for data over shared memory, if we offer it to same-host servers
+        self.shared_memory: Optional[str] = None
+        self.shared_memory_size: Optional[int] = None  # None uses DEFAULT_RING_SIZE
+        
+        # Messages already decoded but not yet returned by receive()
+        self._pending: Deque[bytes] = deque()
+    
+    def set_compression(self, compressors: Optional[List[str]] = None,
+                        threshold: int = DEFAULT_COMPRESSION_THRESHOLD) -> None:
+        """Request compression, in order of preference, for the next connect.
+        
+        None offers every registered compressor. Messages shorter than
+        threshold are sent uncompressed.
+        """
+        self.compression = list(compressors if compressors is not None else COMPRESSORS)
+        self.compression_threshold = threshold
+    
+    def set_keepalive(self, idle: Optional[int] = 60, interval: int = 10, count: int = 5) -> None:
+        """Enable TCP keepalive on the next connection (an idle of None disables)."""
+        self.keepalive = (idle, interval, count) if idle is not None else None
+    
+    def set_connect_timeout(self, timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+                            resolver: Optional[DNSCache] = default_dns_cache) -> None:
+        """Give up connecting after `timeout` seconds (None waits as long as the OS does).
+        
+        Hostnames are resolved through `resolver`, a DNSCache shared by all
+        clients by default; None resolves on every connect.
+        """
+        self.connect_timeout = timeout
+        self.resolver = resolver
+    
+    def set_shared_memory(self, mode: Optional[str] = 'wakeup', size: Optional[int] = None) -> None:
+        """Offer same-host servers shared memory rings of `size` bytes on the next connect.
+        
+        `mode` is a SharedMemoryMode saying how our side waits for data
+        (default: WAKEUP); None stops offering shared memory. `size` must be
+        a power of two, and defaults to DEFAULT_RING_SIZE.
+        """
+        if size is not None:
+            from python_tcp.shm import check_ring_size
+            check_ring_size(size)
+        self.shared_memory = mode
+        self.shared_memory_size = size
+    
+    @property
+    def rtt(self) -> Optional[RTTStats]:
+        """Round-trip time measurements for the current connection, if it is framed."""
+        connection = self.connection
+        return connection.protocol.rtt if connection and connection.protocol else None
     
-    def connect(self, host: str, port: int) -> bool:
-        """Connect to a TCP server at the specified host and port."""
+    def connect(self, host: str, port: int = 0) -> bool:
+        """Connect to a TCP server at the specified host and port.
+        
+        A host of `unix:/path` or `unix:@name` connects to a Unix domain
+        socket instead, and `loop:name` to an in-process loopback server; the
+        port is then ignored.
+        """
         if self.connected:
             print("Already connected to a server")
             return False
         
         try:
-            # Create a TCP socket
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            
-            # Set socket options
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            
             # Update state to SYN_SENT (simulating TCP handshake)
             self.state = SocketState.SYN_SENT
-            print(f"Connecting to {host}:{port}...")
+            print(f"Connecting to {format_address(host, port)}...")
             
             # Connect to the server
-            self.sock.connect((host, port))
+            if is_loopback_address(host):
+                # An in-process server hands us our end of a socket pair
+                self.sock = connect_loopback(host)
+            else:
+                self.sock = self._connect_socket(host, port)
             
             # Connected successfully, update state
             self.state = SocketState.ESTABLISHED
@@ -57,13 +128,42 @@ class TCPClient:
                 connection_id="client-connection"
             )
             
-            print(f"Connected to {host}:{port}")
+            # Negotiate framing and compression if requested
+            if self._wants_protocol():
+                self._negotiate()
+            
+            print(f"Connected to {format_address(host, port)}")
             return True
         except Exception as e:
-            print(f"Error connecting to {host}:{port}: {e}")
-            self.close()
+            print(f"Error connecting to {format_address(host, port)}: {e}")
+            self._close_socket()
             return False
     
+    def _connect_socket(self, host: str, port: int) -> socket.socket:
+        """Create a socket and connect it to a TCP or Unix domain server."""
+        # A TCP host may resolve to several IPv4 and IPv6 addresses, which we race
+        if not is_unix_address(host):
+            return connect_happy_eyeballs(host, port, self.connect_timeout,
+                                          resolver=self.resolver, configure=self._configure_socket)
+        
+        family, address = socket_address(host, port)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            self._configure_socket(sock)
+            sock.settimeout(self.connect_timeout)
+            sock.connect(address)
+            sock.settimeout(None)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+    
+    def _configure_socket(self, sock: socket.socket) -> None:
+        """Set socket options before connecting."""
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.keepalive:
+            configure_keepalive(sock, *self.keepalive)
+    
     def send(self, data: bytes) -> bool:
         """Send data to the connected server."""
         if not self.connected or not self.sock:
@@ -71,7 +171,25 @@ class TCPClient:
             return False
         
         try:
-            self.sock.sendall(data)
+            self._send_data(data)
+            return True
+        except Exception as e:
+            print(f"Error sending data: {e}")
+            self.close()
+            return False
+    
+    def send_many(self, messages: List[bytes]) -> bool:
+        """Send several messages at once with a single scatter-gather send."""
+        if not self.connected or not self.sock:
+            print("Not connected to a server")
+            return False
+        
+        try:
+            connection = self.connection
+            with connection.send_lock:
+                if connection.protocol:
+                    messages = [connection.protocol.encode(message) for message in messages]
+                send_buffers(self.sock, messages)
             return True
         except Exception as e:
             print(f"Error sending data: {e}")
@@ -85,21 +203,92 @@ class TCPClient:
             return None
         
         try:
-            data = self.sock.recv(self.buffer_size)
-            if not data:
-                # Empty data means the server closed the connection
-                print("Server closed the connection")
-                self.close()
-                return None
+            # Read until at least one complete message is available
+            while not self._pending:
+                data = self.sock.recv(self.buffer_size)
+                if not data:
+                    # Empty data means the server closed the connection
+                    print("Server closed the connection")
+                    self.close()
+                    return None
+                
+                self._pending.extend(self._decode(data))
             
-            return data
+            return self._pending.popleft()
         except Exception as e:
             print(f"Error receiving data: {e}")
             self.close()
             return None
     
+    def _wants_protocol(self) -> bool:
+        """Check whether we need to negotiate the framed protocol."""
+        return self.compression is not None or self.shared_memory is not None
+    
+    def _hello_options(self) -> Dict[str, Any]:
+        """Build the options to request in our hello."""
+        return {'compression': self.compression}
+    
+    def _negotiate(self) -> None:
+        """Send a hello and set up the protocol the server agreed to."""
+        hello = self._hello_options()
+        
+        # Offer shared memory only when the server is certainly on this host
+        block = None
+        if self.shared_memory is not None:
+            # Imported on first use rather than with the client, as it loads multiprocessing
+            from python_tcp import shm
+            size = self.shared_memory_size or shm.DEFAULT_RING_SIZE
+            if shm.is_same_host(self.connection.remote_address[0]):
+                block = shm.create_shared_channel(size)
+                hello['shm'] = {'name': block.name, 'size': size}
+        
+        try:
+            self.sock.sendall(build_hello(hello))
+            
+            options, _ = read_hello(self.sock)
+            if options is None:
+                raise ConnectionError("Server did not answer the protocol hello")
+            
+            self.connection.protocol = create_protocol(options, self.compression_threshold)
+            self.connection.protocol.reply = self._send_frame
+            self.connection.negotiated = True
+            
+            if block is not None and options.get('shm'):
+                self.sock = shm.open_shared_socket(self.sock, block, size, server=False, mode=self.shared_memory)
+                self.connection.sock = self.sock
+            elif block is not None:
+                block.close()
+        finally:
+            # The server has attached (or declined), so the name is no longer needed
+            if block is not None:
+                shm.unlink_shared_channel(block)
+        print(f"Negotiated {options}")
+    
+    def _decode(self, data: bytes) -> List[bytes]:
+        """Turn received bytes into complete messages."""
+        if self.connection and self.connection.protocol:
+            return self.connection.protocol.feed(data)
+        return [data]
+    
+    def _send_data(self, data: bytes) -> None:
+        """Write a message to the server, framing it if negotiated."""
+        connection = self.connection
+        with connection.send_lock:
+            if connection.protocol:
+                data = connection.protocol.encode(data)
+            self.sock.sendall(data)
+    
+    def _send_frame(self, frame: bytes) -> None:
+        """Write an already encoded control frame to the server."""
+        with self.connection.send_lock:
+            self.sock.sendall(frame)
+    
     def close(self) -> None:
         """Close the connection to the server."""
+        self._close_socket()
+    
+    def _close_socket(self) -> None:
+        """Close the socket and reset the connection state."""
         if self.sock:
             try:
                 # Update state to simulate TCP termination
@@ -114,12 +303,13 @@ class TCPClient:
         self.sock = None
         self.connected = False
         self.state = SocketState.CLOSED
+        self._pending.clear()
         
         if self.connection:
             self.connection.update_state(SocketState.CLOSED)
             self.connection = None
 
-# %% ../nbs/02_tcp_client.ipynb 7
+# %% ../nbs/02_tcp_client.ipynb 8
 class AsyncTCPClient(TCPClient):
     """A TCP client with asynchronous message reception in a background thread."""
     
@@ -129,6 +319,14 @@ class AsyncTCPClient(TCPClient):
         self.receive_callback: Optional[Callable[[bytes], None]] = None
         self.error_callback: Optional[Callable[[Exception], None]] = None
         self.running = False
+        
+        # Heartbeat settings, off by default
+        self.heartbeat_interval: Optional[float] = None
+        self.heartbeat_timeout: Optional[float] = None
+        
+        # Bounded delivery queue settings, off by default (callbacks run on the receive thread)
+        self.delivery_settings: Optional[Tuple[int, int, int]] = None  # (high, low, workers)
+        self.delivery_queue: Optional[DeliveryQueue] = None
     
     def set_receive_callback(self, callback: Callable[[bytes], None]) -> None:
         """Set a callback function to handle received data."""
@@ -138,19 +336,126 @@ class AsyncTCPClient(TCPClient):
         """Set a callback function to handle errors."""
         self.error_callback = callback
     
-    def connect(self, host: str, port: int) -> bool:
+    def set_heartbeat(self, interval: Optional[float] = 5.0, timeout: Optional[float] = None) -> None:
+        """Ping the server every `interval` seconds (None disables).
+        
+        The connection is dropped if nothing arrives from the server for
+        `timeout` seconds (three intervals by default). Heartbeats use the
+        framed protocol, which is negotiated automatically.
+        """
+        self.heartbeat_interval = interval
+        self.heartbeat_timeout = timeout if timeout is not None or interval is None else 3 * interval
+    
+    def set_delivery_queue(self, high_watermark: Optional[int] = 1000,
+                           low_watermark: Optional[int] = None, workers: int = 1) -> None:
+        """Deliver received messages through a bounded queue (None disables).
+        
+        Reading from the socket pauses once `high_watermark` messages are
+        waiting, and resumes when consumers have drained the queue down to
+        `low_watermark` (half the high mark by default). With `workers`
+        threads, the receive callback runs on a pool that drains the queue;
+        with 0, read the messages with `messages()` instead. Call this
+        before `connect()`.
+        """
+        if high_watermark is None:
+            self.delivery_settings = None
+            return
+        if low_watermark is None:
+            low_watermark = high_watermark // 2
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("low_watermark must be at least 0 and below high_watermark")
+        self.delivery_settings = (high_watermark, low_watermark, workers)
+    
+    def messages(self) -> Iterator[bytes]:
+        """Iterate over received messages, blocking until each arrives.
+        
+        Ends once the client is closed and the queued messages are consumed.
+        Requires `set_delivery_queue(..., workers=0)`.
+        """
+        if self.delivery_queue is None:
+            raise RuntimeError("messages() needs a delivery queue; call set_delivery_queue() and connect()")
+        return iter(self.delivery_queue)
+    
+    def _start_delivery(self) -> None:
+        """Create the delivery queue and its callback pool, unless they are running."""
+        running = self.delivery_queue is not None and not self.delivery_queue.closed
+        if self.delivery_settings is None or running:
+            return
+        
+        high_watermark, low_watermark, workers = self.delivery_settings
+        self.delivery_queue = DeliveryQueue(high_watermark, low_watermark)
+        for _ in range(workers):
+            worker = threading.Thread(target=self._delivery_worker, args=(self.delivery_queue,))
+            worker.daemon = True
+            worker.start()
+    
+    def _delivery_worker(self, queue: 'DeliveryQueue') -> None:
+        """Run the receive callback for queued messages until the queue is closed."""
+        for message in queue:
+            self._run_receive_callback(message)
+    
+    def _end_delivery(self) -> None:
+        """Let consumers finish the queued messages, then stop them."""
+        if self.delivery_queue is not None:
+            self.delivery_queue.close()
+    
+    def _wants_protocol(self) -> bool:
+        """Heartbeats need the framed protocol too."""
+        return super()._wants_protocol() or bool(self.heartbeat_interval)
+    
+    def connect(self, host: str, port: int = 0) -> bool:
         """Connect to a server and start the receive thread."""
         if not super().connect(host, port):
             return False
         
+        self._start_delivery()
+        
         # Start the receive thread
         self.running = True
         self.receive_thread = threading.Thread(target=self._receive_loop)
         self.receive_thread.daemon = True
         self.receive_thread.start()
         
+        # Start pinging the server if heartbeats are enabled
+        if self.heartbeat_interval and self.connection.protocol:
+            heartbeat_thread = threading.Thread(target=self._heartbeat_loop, args=(self.connection,))
+            heartbeat_thread.daemon = True
+            heartbeat_thread.start()
+        
         return True
     
+    def _heartbeat_loop(self, connection: TCPConnection) -> None:
+        """Ping the server and drop the connection if it goes quiet."""
+        # Stop when this connection is closed or replaced by a new one
+        while self.running and self.connection is connection:
+            time.sleep(self.heartbeat_interval)
+            if not (self.running and self.connection is connection):
+                break
+            
+            # While reads are paused for a full delivery queue, silence is our own doing
+            paused = self.delivery_queue is not None and self.delivery_queue.paused
+            
+            protocol = connection.protocol
+            if (self.heartbeat_timeout and not paused
+                    and time.monotonic() - protocol.last_received > self.heartbeat_timeout):
+                print("Server stopped responding to heartbeats")
+                self._abort_connection()
+                break
+            
+            try:
+                self._send_frame(protocol.ping())
+            except Exception as e:
+                print(f"Error sending heartbeat: {e}")
+                self._abort_connection()
+                break
+    
+    def _abort_connection(self) -> None:
+        """Shut down a broken socket so the receive loop notices and ends."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+    
     def _receive_loop(self) -> None:
         """Continuously receive data in a background thread."""
         while self.running and self.connected:
@@ -162,34 +467,141 @@ class AsyncTCPClient(TCPClient):
                     print("Server closed the connection")
                     break
                 
-                # Call the receive callback if set
-                if self.receive_callback:
-                    try:
-                        self.receive_callback(data)
-                    except Exception as e:
-                        print(f"Error in receive callback: {e}")
-                        if self.error_callback:
-                            self.error_callback(e)
+                # Queue each complete message, or call the receive callback for it
+                for message in self._decode(data):
+                    if self.delivery_queue is not None:
+                        # Blocks while the queue is full, which stops us reading
+                        if not self.delivery_queue.put(message):
+                            break  # Interrupted by close()
+                    else:
+                        self._run_receive_callback(message)
             except Exception as e:
                 print(f"Error receiving data: {e}")
                 if self.error_callback:
                     self.error_callback(e)
                 break
             
-        # When the loop exits, close the connection
+        # When the loop exits, deal with the lost connection (unless we were closed)
+        if self.running:
+            self._on_connection_lost()
+    
+    def _run_receive_callback(self, message: bytes) -> None:
+        """Pass one message to the receive callback, reporting its errors."""
+        if self.receive_callback:
+            try:
+                self.receive_callback(message)
+            except Exception as e:
+                print(f"Error in receive callback: {e}")
+                if self.error_callback:
+                    self.error_callback(e)
+    
+    def _on_connection_lost(self) -> None:
+        """Called on the receive thread when the connection ends."""
         self.close()
     
     def close(self) -> None:
         """Close the connection and stop the receive thread."""
         self.running = False
         
-        # Wait for the receive thread to finish
-        if self.receive_thread and self.receive_thread.is_alive():
+        # Wake the receive thread from recv() (or a full delivery queue)
+        # and wait for it to finish (unless we are the receive thread)
+        if self.delivery_queue is not None:
+            self.delivery_queue.interrupt()
+        if (self.receive_thread and self.receive_thread.is_alive()
+                and self.receive_thread is not threading.current_thread()):
+            self._abort_connection()
             self.receive_thread.join(timeout=1.0)
         
         super().close()
+        self._end_delivery()
+
+# %% ../nbs/02_tcp_client.ipynb 10
+class DeliveryQueue:
+    """A bounded message queue that pauses its producer between two watermarks."""
+    
+    def __init__(self, high_watermark: int = 1000, low_watermark: int = 500):
+        """Pause puts at `high_watermark` messages until drained to `low_watermark`."""
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.items: Deque[bytes] = deque()
+        self.paused = False
+        self.closed = False
+        self.pauses = 0      # Times the producer was paused
+        self.max_depth = 0   # Most messages queued at once
+        self._interrupts = 0
+        self._condition = threading.Condition()
+    
+    def __len__(self) -> int:
+        """Get the number of queued items."""
+        return len(self.items)
+    
+    def put(self, item: bytes) -> bool:
+        """Add an item, waiting while paused; False if closed or interrupted."""
+        with self._condition:
+            interrupts = self._interrupts
+            while self.paused and not self.closed and self._interrupts == interrupts:
+                self._condition.wait()
+            if self.closed or self._interrupts != interrupts:
+                return False
+            
+            self.items.append(item)
+            self.max_depth = max(self.max_depth, len(self.items))
+            if len(self.items) >= self.high_watermark:
+                self.paused = True
+                self.pauses += 1
+            self._condition.notify_all()
+            return True
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Take the oldest item, waiting for one; None once closed and empty, or on timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.items or self.closed, timeout):
+                return None
+            if not self.items:
+                return None
+            
+            item = self.items.popleft()
+            if self.paused and len(self.items) <= self.low_watermark:
+                self.paused = False
+                self._condition.notify_all()
+            return item
+    
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield items until the queue is closed and empty."""
+        while True:
+            item = self.get()
+            if item is None:
+                return
+            yield item
+    
+    def interrupt(self) -> None:
+        """Make a put that is waiting now give up."""
+        with self._condition:
+            self._interrupts += 1
+            self._condition.notify_all()
+    
+    def close(self) -> None:
+        """Refuse new items; consumers finish the queued ones and then stop."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
 
-# %% ../nbs/02_tcp_client.ipynb 9
+# %% ../nbs/02_tcp_client.ipynb 12
+@dataclass
+class ReconnectPolicy:
+    """Settings for automatic reconnection with exponential backoff and full jitter."""
+    initial_delay: float = 0.5         # Maximum delay before the first attempt, in seconds
+    max_delay: float = 30.0            # Cap on the maximum delay
+    multiplier: float = 2.0            # Growth of the maximum delay per attempt
+    max_attempts: Optional[int] = None # Give up after this many attempts (None retries forever)
+    max_queued: int = 1000             # Messages to buffer while disconnected
+    
+    def delay(self, attempt: int) -> float:
+        """Get a random delay for the given attempt (0-based) using full jitter."""
+        ceiling = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        return random.uniform(0, ceiling)
+
+# %% ../nbs/02_tcp_client.ipynb 14
 class EventDrivenTCPClient(AsyncTCPClient):
     """A TCP client that emits events for connection state changes."""
     
@@ -201,13 +613,28 @@ class EventDrivenTCPClient(AsyncTCPClient):
         self.on_disconnect: Optional[Callable[[], None]] = None
         self.on_data: Optional[Callable[[bytes], None]] = None
         self.on_error: Optional[Callable[[Exception], None]] = None
+        self.on_reconnect: Optional[Callable[[str, int], None]] = None
         
         # Auto-set callbacks based on events
         self.set_receive_callback(lambda data: self._on_data_received(data))
         self.set_error_callback(lambda error: self._on_error(error))
+        
+        # Reconnection state (disabled unless a policy is set)
+        self.reconnect_policy: Optional[ReconnectPolicy] = None
+        self.address: Optional[Tuple[str, int]] = None
+        self._stop_reconnecting = threading.Event()
+        self._outbound: Deque[bytes] = deque()
+        self._outbound_lock = threading.Lock()
     
-    def connect(self, host: str, port: int) -> bool:
+    def set_reconnect_policy(self, policy: Optional[ReconnectPolicy]) -> None:
+        """Reconnect automatically when the server goes away (None disables)."""
+        self.reconnect_policy = policy
+    
+    def connect(self, host: str, port: int = 0) -> bool:
         """Connect to a server and trigger the on_connect event."""
+        self.address = (host, port)
+        self._stop_reconnecting.clear()
+        
         if super().connect(host, port):
             # Trigger on_connect event
             if self.on_connect:
@@ -218,19 +645,123 @@ class EventDrivenTCPClient(AsyncTCPClient):
             return True
         return False
     
+    def send(self, data: bytes) -> bool:
+        """Send data, buffering it while reconnecting if a policy is set."""
+        if self.reconnect_policy is None:
+            return super().send(data)
+        
+        with self._outbound_lock:
+            # Send directly only if nothing is waiting to be replayed first
+            if self.connected and not self._outbound:
+                try:
+                    self._send_data(data)
+                    return True
+                except Exception as e:
+                    print(f"Error sending data: {e}")
+                    self._abort_connection()
+            
+            return self._queue_outbound(data)
+    
     def close(self) -> None:
-        """Close the connection and trigger the on_disconnect event."""
+        """Close the connection, stop reconnecting and trigger the on_disconnect event."""
+        self._stop_reconnecting.set()
+        with self._outbound_lock:
+            self._outbound.clear()
+        
         was_connected = self.connected
         
         super().close()
         
         # Trigger on_disconnect event
-        if was_connected and self.on_disconnect:
+        if was_connected:
+            self._trigger_disconnect()
+    
+    def _trigger_disconnect(self) -> None:
+        """Trigger the on_disconnect event."""
+        if self.on_disconnect:
             try:
                 self.on_disconnect()
             except Exception as e:
                 print(f"Error in on_disconnect callback: {e}")
     
+    def _queue_outbound(self, data: bytes) -> bool:
+        """Buffer a message until we reconnect (call with the outbound lock held)."""
+        if self._stop_reconnecting.is_set() or self.address is None:
+            print("Not connected to a server")
+            return False
+        
+        if len(self._outbound) >= self.reconnect_policy.max_queued:
+            print("Outbound queue is full, dropping message")
+            return False
+        
+        self._outbound.append(data)
+        return True
+    
+    def _end_delivery(self) -> None:
+        """Keep the delivery queue open while we are reconnecting."""
+        if self.reconnect_policy is None or self._stop_reconnecting.is_set():
+            super()._end_delivery()
+    
+    def _on_connection_lost(self) -> None:
+        """Reconnect if a policy is set and the application didn't close us."""
+        if self.reconnect_policy is None or self._stop_reconnecting.is_set():
+            self.close()
+            return
+        
+        # Drop the dead socket but keep our queued messages and settings
+        was_connected = self.connected
+        super().close()
+        if was_connected:
+            self._trigger_disconnect()
+        
+        self._reconnect()
+    
+    def _reconnect(self) -> None:
+        """Retry the connection with exponential backoff and full jitter."""
+        policy = self.reconnect_policy
+        host, port = self.address
+        attempt = 0
+        
+        while policy.max_attempts is None or attempt < policy.max_attempts:
+            delay = policy.delay(attempt)
+            print(f"Reconnecting to {format_address(host, port)} in {delay:.2f}s (attempt {attempt + 1})")
+            
+            # Wait, but give up immediately if the application closes us
+            if self._stop_reconnecting.wait(delay):
+                return
+            
+            attempt += 1
+            if super().connect(host, port):
+                if self._stop_reconnecting.is_set():
+                    # The application closed us while we were connecting
+                    super().close()
+                    return
+                
+                self._replay_outbound()
+                
+                # Trigger on_reconnect event
+                if self.on_reconnect:
+                    try:
+                        self.on_reconnect(host, port)
+                    except Exception as e:
+                        print(f"Error in on_reconnect callback: {e}")
+                return
+        
+        print(f"Giving up reconnecting after {attempt} attempts")
+        self.close()
+    
+    def _replay_outbound(self) -> None:
+        """Send the messages buffered while we were disconnected, in order."""
+        with self._outbound_lock:
+            while self._outbound and self.connected:
+                try:
+                    self._send_data(self._outbound[0])
+                except Exception as e:
+                    print(f"Error replaying buffered data: {e}")
+                    self._abort_connection()
+                    return
+                self._outbound.popleft()
+    
     def _on_data_received(self, data: bytes) -> None:
         """Internal handler for received data that triggers the on_data event."""
         if self.on_data:
@@ -246,3 +777,155 @@ class EventDrivenTCPClient(AsyncTCPClient):
                 self.on_error(error)
             except Exception as e:
                 print(f"Error in on_error callback: {e}")
+
+# %% ../nbs/02_tcp_client.ipynb 18
+class HashRing:
+    """A consistent-hash ring with virtual nodes."""
+    
+    def __init__(self, vnodes: int = 100):
+        """Place each node at `vnodes` points on the ring."""
+        self.vnodes = vnodes
+        self.nodes: List[str] = []
+        self._hashes: List[int] = []   # Sorted points on the ring
+        self._owners: List[str] = []   # The node at each point
+    
+    @staticmethod
+    def _hash(key: Union[str, bytes]) -> int:
+        """Hash a key to a point on the ring."""
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        return int.from_bytes(hashlib.md5(key).digest()[:8], 'big')
+    
+    def add(self, node: str) -> None:
+        """Add a node to the ring."""
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.vnodes):
+            point = self._hash(f"{node}#{i}")
+            index = bisect.bisect(self._hashes, point)
+            self._hashes.insert(index, point)
+            self._owners.insert(index, node)
+    
+    def remove(self, node: str) -> None:
+        """Remove a node from the ring."""
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        points = [(h, owner) for h, owner in zip(self._hashes, self._owners) if owner != node]
+        self._hashes = [h for h, _ in points]
+        self._owners = [owner for _, owner in points]
+    
+    def get(self, key: Union[str, bytes]) -> Optional[str]:
+        """Get the node responsible for a key, or None if the ring is empty."""
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+# %% ../nbs/02_tcp_client.ipynb 20
+@dataclass
+class Shard:
+    """One server behind a ShardedTCPClient, with its connection and counters."""
+    client: TCPClient
+    host: str
+    port: int
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    requests: int = 0
+    errors: int = 0
+
+class ShardedTCPClient:
+    """A client that spreads requests over several servers by key."""
+    
+    def __init__(self, vnodes: int = 100, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 compression: Optional[List[str]] = None):
+        """Initialize the client; pass compression (e.g. []) to frame messages."""
+        self.ring = HashRing(vnodes)
+        self.shards: Dict[str, Shard] = {}
+        self.buffer_size = buffer_size
+        self.compression = compression
+        self._lock = threading.Lock()
+    
+    def add_endpoint(self, host: str, port: int = 0) -> bool:
+        """Add a server to the ring and connect to it."""
+        name = format_address(host, port)
+        client = TCPClient(self.buffer_size)
+        if self.compression is not None:
+            client.set_compression(self.compression)
+        
+        shard = Shard(client, host, port)
+        with self._lock:
+            self.shards[name] = shard
+            self.ring.add(name)
+        return client.connect(host, port)
+    
+    def remove_endpoint(self, host: str, port: int = 0) -> None:
+        """Remove a server from the ring and close its connection."""
+        name = format_address(host, port)
+        with self._lock:
+            self.ring.remove(name)
+            shard = self.shards.pop(name, None)
+        if shard:
+            with shard.lock:
+                shard.client.close()
+    
+    def endpoint_for(self, key: Union[str, bytes]) -> Optional[str]:
+        """Get the name of the server responsible for a key."""
+        return self.ring.get(key)
+    
+    def _shard_for(self, key: Union[str, bytes]) -> Shard:
+        """Get the shard responsible for a key."""
+        with self._lock:
+            name = self.ring.get(key)
+            if name is None:
+                raise ValueError("No endpoints to send to")
+            return self.shards[name]
+    
+    def _call(self, key: Union[str, bytes], data: bytes, wait: bool) -> Optional[bytes]:
+        """Send data to the key's shard, optionally waiting for the response."""
+        shard = self._shard_for(key)
+        with shard.lock:
+            shard.requests += 1
+            client = shard.client
+            
+            if not client.connected and not client.connect(shard.host, shard.port):
+                shard.errors += 1
+                return None
+            
+            if not client.send(data):
+                shard.errors += 1
+                return None
+            if not wait:
+                return None
+            
+            response = client.receive()
+            if response is None:
+                shard.errors += 1
+            return response
+    
+    def request(self, key: Union[str, bytes], data: bytes) -> Optional[bytes]:
+        """Send a request to the server that owns `key` and return its response."""
+        return self._call(key, data, wait=True)
+    
+    def send(self, key: Union[str, bytes], data: bytes) -> bool:
+        """Send data to the server that owns `key` without waiting for a response."""
+        shard = self._shard_for(key)
+        errors = shard.errors
+        self._call(key, data, wait=False)
+        return shard.errors == errors
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the request and error counts for each server."""
+        with self._lock:
+            shards = dict(self.shards)
+        return {name: {'requests': shard.requests, 'errors': shard.errors,
+                       'connected': shard.client.connected}
+                for name, shard in shards.items()}
+    
+    def close(self) -> None:
+        """Close every connection."""
+        with self._lock:
+            shards = list(self.shards.values())
+        for shard in shards:
+            with shard.lock:
+                shard.client.close()
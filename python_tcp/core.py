@@ -3,12 +3,21 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/00_core.ipynb.
 
 # %% auto 0
-__all__ = ['LOCALHOST', 'DEFAULT_BUFFER_SIZE', 'DEFAULT_BACKLOG', 'get_free_port', 'SocketState', 'TCPConnection']
+__all__ = ['LOCALHOST', 'DEFAULT_BUFFER_SIZE', 'DEFAULT_BACKLOG', 'UNIX_SCHEME', 'LOOPBACK_SCHEME', 'DEFAULT_CONNECT_TIMEOUT',
+           'HAPPY_EYEBALLS_DELAY', 'default_dns_cache', 'get_free_port', 'is_unix_address', 'socket_address',
+           'format_address', 'is_loopback_address', 'listen_loopback', 'close_loopback', 'connect_loopback',
+           'resolve_address', 'DNSCache', 'connect_happy_eyeballs', 'configure_keepalive', 'configure_listener',
+           'send_buffers', 'percentile', 'SocketState', 'TCPConnection']
 
 # %% ../nbs/00_core.ipynb 6
+import errno
+import os
+import selectors
 import socket
-from dataclasses import dataclass
-from typing import Optional, List, Tuple, Dict, Any, Union
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+import sys
 import threading
 import time
 import uuid
@@ -23,9 +32,288 @@ def get_free_port() -> int:
 # %% ../nbs/00_core.ipynb 10
 LOCALHOST = '127.0.0.1'
 DEFAULT_BUFFER_SIZE = 1024
-DEFAULT_BACKLOG = 5  # Maximum number of queued connections
+DEFAULT_BACKLOG = socket.SOMAXCONN  # Maximum number of queued connections (the kernel may cap it lower)
 
 # %% ../nbs/00_core.ipynb 12
+UNIX_SCHEME = 'unix:'
+
+def is_unix_address(host: str) -> bool:
+    """Check whether a host string names a Unix domain socket."""
+    return isinstance(host, str) and host.startswith(UNIX_SCHEME)
+
+def socket_address(host: str, port: int = 0) -> Tuple[int, Any]:
+    """Get the socket family and the address to bind or connect to.
+    
+    `unix:/path` is a Unix domain socket on the filesystem and `unix:@name`
+    one in the Linux abstract namespace; an address with colons is IPv6, and
+    anything else an IPv4 host.
+    """
+    if not is_unix_address(host):
+        if ':' in host:
+            return socket.AF_INET6, (host.strip('[]'), port, 0, 0)
+        return socket.AF_INET, (host, port)
+    
+    path = host[len(UNIX_SCHEME):]
+    if path.startswith('@'):
+        if not sys.platform.startswith('linux'):
+            raise ValueError("Abstract Unix domain sockets are only supported on Linux")
+        return socket.AF_UNIX, '\0' + path[1:]
+    return socket.AF_UNIX, path
+
+def format_address(host: str, port: int) -> str:
+    """Format a host and port for display."""
+    if is_unix_address(host) or is_loopback_address(host):
+        return host
+    return f"[{host.strip('[]')}]:{port}" if ':' in host else f"{host}:{port}"
+
+# %% ../nbs/00_core.ipynb 14
+LOOPBACK_SCHEME = 'loop:'
+
+_loopback_listeners: Dict[str, Callable[[socket.socket, Tuple[str, int]], Any]] = {}
+_loopback_lock = threading.Lock()
+
+def is_loopback_address(host: str) -> bool:
+    """Check whether a host string names an in-process loopback listener."""
+    return isinstance(host, str) and host.startswith(LOOPBACK_SCHEME)
+
+def listen_loopback(host: str, accept: Callable[[socket.socket, Tuple[str, int]], Any]) -> None:
+    """Register `accept` to receive the server end of each connection to a `loop:` address."""
+    with _loopback_lock:
+        if host in _loopback_listeners:
+            raise OSError(f"Loopback address {host} is already in use")
+        _loopback_listeners[host] = accept
+
+def close_loopback(host: str, accept: Optional[Callable] = None) -> None:
+    """Stop listening on a `loop:` address (only if `accept` is still its listener, when given)."""
+    with _loopback_lock:
+        if accept is None or _loopback_listeners.get(host) == accept:
+            _loopback_listeners.pop(host, None)
+
+def connect_loopback(host: str) -> socket.socket:
+    """Connect to an in-process listener and return the client's end of the connection."""
+    with _loopback_lock:
+        accept = _loopback_listeners.get(host)
+    if accept is None:
+        raise ConnectionRefusedError(f"Nothing is listening on {host}")
+    
+    client_sock, server_sock = socket.socketpair()
+    try:
+        accept(server_sock, (host, 0))
+    except Exception:
+        client_sock.close()
+        server_sock.close()
+        raise
+    return client_sock
+
+# %% ../nbs/00_core.ipynb 16
+DEFAULT_CONNECT_TIMEOUT = 10.0  # Seconds to wait for a connection before giving up
+HAPPY_EYEBALLS_DELAY = 0.25     # Seconds before starting the next connection attempt
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, errno.EAGAIN,
+                        10035}  # Windows' WSAEWOULDBLOCK
+
+def resolve_address(host: str, port: int) -> List[Tuple[int, Any]]:
+    """Resolve a host and port to (family, address) pairs, without duplicates."""
+    addresses = []
+    for family, _, _, _, address in socket.getaddrinfo(host.strip('[]'), port, type=socket.SOCK_STREAM):
+        if (family, address) not in addresses:
+            addresses.append((family, address))
+    return addresses
+
+class DNSCache:
+    """Cache hostname resolutions for a bounded time."""
+    
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        """Keep up to `max_entries` answers, each for `ttl` seconds."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()  # {(host, port): (addresses, expires_at)}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def resolve(self, host: str, port: int) -> List[Tuple[int, Any]]:
+        """Get the (family, address) pairs for a host and port, from the cache if fresh."""
+        key = (host, port)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+    
+        addresses = resolve_address(host, port)
+        with self._lock:
+            self.entries[key] = (addresses, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return addresses
+    
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """Forget the answers for one host, or for every host."""
+        with self._lock:
+            for key in [key for key in self.entries if host is None or key[0] == host]:
+                del self.entries[key]
+
+default_dns_cache = DNSCache()
+
+def _interleave_families(addresses: List[Tuple[int, Any]]) -> List[Tuple[int, Any]]:
+    """Alternate address families, starting with the family of the first address."""
+    if not addresses:
+        return []
+    first = [entry for entry in addresses if entry[0] == addresses[0][0]]
+    rest = [entry for entry in addresses if entry[0] != addresses[0][0]]
+    interleaved = []
+    for i in range(max(len(first), len(rest))):
+        interleaved.extend(group[i] for group in (first, rest) if i < len(group))
+    return interleaved
+
+# %% ../nbs/00_core.ipynb 17
+def connect_happy_eyeballs(host: str, port: int, timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+                           delay: float = HAPPY_EYEBALLS_DELAY,
+                           resolver: Optional[DNSCache] = default_dns_cache,
+                           configure: Optional[Callable[[socket.socket], None]] = None) -> socket.socket:
+    """Connect to a host, racing its addresses with staggered starts (RFC 8305).
+    
+    `configure` is called on each socket before it connects. Returns the
+    first socket to connect, in blocking mode.
+    """
+    addresses = resolver.resolve(host, port) if resolver else resolve_address(host, port)
+    addresses = _interleave_families(addresses)
+    if not addresses:
+        raise OSError(f"No addresses found for {host}")
+    
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    selector = selectors.DefaultSelector()
+    attempts: Dict[socket.socket, Any] = {}  # {socket: address} for attempts in progress
+    error: Optional[Exception] = None
+    next_index, next_start = 0, time.monotonic()
+    winner = None
+    try:
+        while winner is None:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise TimeoutError(f"Timed out connecting to {format_address(host, port)}")
+    
+            # Start the next attempt when its delay is up, or at once if none are running
+            if next_index < len(addresses) and (now >= next_start or not attempts):
+                family, address = addresses[next_index]
+                next_index += 1
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                try:
+                    if configure:
+                        configure(sock)
+                    sock.setblocking(False)
+                    code = sock.connect_ex(address)
+                except OSError as e:
+                    sock.close()
+                    error = e
+                    continue
+                if code == 0:
+                    winner = sock
+                elif code in _CONNECT_IN_PROGRESS:
+                    attempts[sock] = address
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    next_start = now + delay
+                else:
+                    sock.close()
+                    error = OSError(code, f"{os.strerror(code)}: {address[0]}")
+                continue
+    
+            if not attempts:
+                raise error or OSError(f"Could not connect to {format_address(host, port)}")
+    
+            # Wait for an attempt to finish, the next attempt's start, or the deadline
+            wakeups = [deadline] if deadline is not None else []
+            if next_index < len(addresses):
+                wakeups.append(next_start)
+            wait = max(0.0, min(wakeups) - now) if wakeups else None
+            for key, _ in selector.select(wait):
+                sock = key.fileobj
+                selector.unregister(sock)
+                address = attempts.pop(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0 and winner is None:
+                    winner = sock
+                    continue
+                sock.close()
+                if code:
+                    error = OSError(code, f"{os.strerror(code)}: {address[0]}")
+                    next_start = now  # A failed attempt starts the next one at once
+    finally:
+        for sock in attempts:
+            sock.close()
+        selector.close()
+    
+    winner.setblocking(True)
+    return winner
+
+# %% ../nbs/00_core.ipynb 19
+def configure_keepalive(sock: socket.socket, idle: int = 60, interval: int = 10, count: int = 5) -> None:
+    """Enable TCP keepalive probes on a socket.
+    
+    Options the platform doesn't support are skipped, and non-TCP sockets
+    (such as Unix domain sockets) are left unchanged.
+    """
+    if sock.family not in (socket.AF_INET, getattr(socket, 'AF_INET6', None)):
+        return
+    
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    
+    # macOS calls the idle time option TCP_KEEPALIVE
+    idle_option = getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None))
+    for option, value in ((idle_option, idle),
+                          (getattr(socket, 'TCP_KEEPINTVL', None), interval),
+                          (getattr(socket, 'TCP_KEEPCNT', None), count)):
+        if option is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+# %% ../nbs/00_core.ipynb 21
+def configure_listener(sock: socket.socket, defer_accept: Optional[int] = None,
+                       fastopen: Optional[int] = None) -> None:
+    """Set TCP_DEFER_ACCEPT and TCP_FASTOPEN on a listening socket, where supported."""
+    if sock.family not in (socket.AF_INET, getattr(socket, 'AF_INET6', None)):
+        return
+    
+    for option, value in ((getattr(socket, 'TCP_DEFER_ACCEPT', None), defer_accept),
+                          (getattr(socket, 'TCP_FASTOPEN', None), fastopen)):
+        if option is not None and value is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+# %% ../nbs/00_core.ipynb 23
+try:
+    MAX_IOVECS = os.sysconf('SC_IOV_MAX')  # Most buffers one sendmsg() call accepts
+except (AttributeError, ValueError, OSError):
+    MAX_IOVECS = 1024
+
+def send_buffers(sock: socket.socket, buffers: List[bytes]) -> None:
+    """Write several buffers to a socket with as few system calls as possible."""
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(b''.join(buffers))
+        return
+    
+    views = [memoryview(b) for b in buffers if b]
+    first = 0
+    while first < len(views):
+        sent = sock.sendmsg(views[first:first + MAX_IOVECS])
+        
+        # Skip past the buffers that were written completely
+        while first < len(views) and sent >= len(views[first]):
+            sent -= len(views[first])
+            first += 1
+        if sent:
+            views[first] = views[first][sent:]
+
+# %% ../nbs/00_core.ipynb 25
+def percentile(values: List[float], p: float) -> float:
+    """Get the p-th percentile (0-100) of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+# %% ../nbs/00_core.ipynb 27
 # Socket states
 class SocketState:
     """Constants for socket states."""
@@ -41,7 +329,7 @@ class SocketState:
     LAST_ACK = "LAST_ACK"
     TIME_WAIT = "TIME_WAIT"
 
-# %% ../nbs/00_core.ipynb 14
+# %% ../nbs/00_core.ipynb 29
 @dataclass
 class TCPConnection:
     """Represents a TCP connection with state information."""
@@ -49,6 +337,9 @@ class TCPConnection:
     state: str = SocketState.CLOSED
     remote_address: Optional[Tuple[str, int]] = None
     connection_id: Optional[str] = None
+    protocol: Optional[Any] = None  # Framing/compression state, once negotiated
+    negotiated: bool = False
+    send_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
     
     def __str__(self) -> str:
         addr = f"{self.remote_address[0]}:{self.remote_address[1]}" if self.remote_address else "None"
@@ -0,0 +1,278 @@
+"""Simulating thousands of chat users to find out how far a server can go"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/08_load_testing.ipynb.
+
+# %% auto 0
+__all__ = ['LoadProfile', 'print_load_report', 'run_chat_load']
+
+# %% ../nbs/08_load_testing.ipynb 3
+from .core import *
+from .tracing import LatencyHistogram
+from .routing import Request
+from .chat_app import ChatServer, ChatClient
+from .benchmarks import print_results, quiet
+import heapq
+import multiprocessing
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/08_load_testing.ipynb 5
+@dataclass
+class LoadProfile:
+    """Settings for a chat load test."""
+    users: int = 200                 # Simulated users in total
+    processes: int = 4               # Worker processes to spread the users over
+    join_rate: float = 50.0          # Joins per second, across all processes
+    message_rate: float = 0.5        # Average messages per second, per user
+    duration: float = 10.0           # Seconds to keep sending once everyone has joined
+    message_size: int = 64           # Approximate chat message size in bytes
+    compression: Optional[List[str]] = field(default_factory=list)  # [] frames without compressing
+    window: float = 1.0              # Seconds per row of the timeline
+    saturation_latency: float = 0.25 # p99 fan-out latency (seconds) that counts as saturated
+    drain: float = 2.0               # Seconds to wait for in-flight messages at the end
+
+    @property
+    def ramp_time(self) -> float:
+        """Get the number of seconds it takes for every user to join."""
+        return self.users / self.join_rate
+
+# %% ../nbs/08_load_testing.ipynb 7
+class _LoadRecorder:
+    """Collect join and delivery measurements for one worker process."""
+
+    def __init__(self, start_at: float, window: float):
+        """Measure relative to the wall-clock time `start_at`."""
+        self.start_at = start_at
+        self.window = window
+        self.lock = threading.Lock()
+        self.join_started: Dict[str, float] = {}
+        self.joins: List[Tuple[float, float]] = []  # (seconds since start, join latency)
+        self.join_failures = 0
+        self.sent: Dict[int, int] = {}
+        self.deliveries: Dict[int, LatencyHistogram] = {}
+
+    def _window(self, at: float) -> int:
+        """Get the timeline window a wall-clock time falls in."""
+        return int((at - self.start_at) // self.window)
+
+    def joining(self, username: str) -> None:
+        """Note that a user started connecting."""
+        self.join_started[username] = time.time()
+
+    def joined(self, username: str) -> None:
+        """Note that a user was welcomed by the server."""
+        now = time.time()
+        with self.lock:
+            self.joins.append((now - self.start_at, now - self.join_started[username]))
+
+    def failed(self) -> None:
+        """Note that a user could not connect or join."""
+        with self.lock:
+            self.join_failures += 1
+
+    def sending(self) -> float:
+        """Note that a message is being sent and return its timestamp."""
+        now = time.time()
+        with self.lock:
+            window = self._window(now)
+            self.sent[window] = self.sent.get(window, 0) + 1
+        return now
+
+    def delivered(self, sent_at: float) -> None:
+        """Record the latency of a message that reached one of our users."""
+        now = time.time()
+        with self.lock:
+            window = self._window(sent_at)
+            if window not in self.deliveries:
+                self.deliveries[window] = LatencyHistogram()
+            self.deliveries[window].record(now - sent_at)
+
+    def results(self) -> Dict[str, Any]:
+        """Get everything recorded, ready to send to the parent process."""
+        with self.lock:
+            return {'joins': list(self.joins), 'join_failures': self.join_failures,
+                    'sent': dict(self.sent), 'deliveries': dict(self.deliveries)}
+
+# %% ../nbs/08_load_testing.ipynb 9
+class _SimulatedUser(ChatClient):
+    """A ChatClient that reports its join and message latencies to a recorder."""
+
+    def __init__(self, username: str, recorder: _LoadRecorder, compression: Optional[List[str]]):
+        """Create a user that reports to `recorder`."""
+        super().__init__(username, compression=compression)
+        self.recorder = recorder
+
+    def _handle_welcome(self, request: Request) -> None:
+        """The server accepted our join."""
+        self.recorder.joined(self.username)
+
+    def _handle_chat_message(self, request: Request) -> None:
+        """Measure how long a chat message took to reach us."""
+        try:
+            sent_at = float(request.message.get('content', '').split(' ', 1)[0])
+        except ValueError:
+            return  # Not one of ours
+        self.recorder.delivered(sent_at)
+
+# %% ../nbs/08_load_testing.ipynb 11
+def _load_worker(worker: int, host: str, port: int, indexes: List[int], profile: LoadProfile,
+                 results: Any, start_times: Any) -> None:
+    """Run the simulated users with the given indexes and report the measurements."""
+    with quiet():
+        results.put(('ready', worker))
+        start_at = start_times.get()
+        end_at = start_at + profile.ramp_time + profile.duration
+        recorder = _LoadRecorder(start_at, profile.window)
+        rng = random.Random()
+        padding = 'x' * max(0, profile.message_size - 18)
+        users: Dict[int, _SimulatedUser] = {}
+
+        # (time, user index, is_join)
+        events = [(start_at + i / profile.join_rate, i, True) for i in indexes]
+        heapq.heapify(events)
+
+        while events:
+            at, index, is_join = heapq.heappop(events)
+            if at >= end_at:
+                break
+            delay = at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            if is_join:
+                user = _SimulatedUser(f"load-{index}", recorder, profile.compression)
+                recorder.joining(user.username)
+                if not (user.connect(host, port) and user.join()):
+                    recorder.failed()
+                    continue
+                users[index] = user
+            elif users[index].connected:
+                users[index].send_message(f"{recorder.sending():.6f} {padding}")
+
+            if profile.message_rate > 0:
+                heapq.heappush(events, (max(at, time.time()) + rng.expovariate(profile.message_rate), index, False))
+
+        # Let in-flight messages arrive before disconnecting
+        time.sleep(max(0.0, end_at - time.time()) + profile.drain)
+        for user in users.values():
+            user.client.close()
+
+        results.put(('results', recorder.results()))
+
+# %% ../nbs/08_load_testing.ipynb 13
+def _summarize_load(profile: LoadProfile, reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the workers' measurements into a load test report."""
+    joins = sorted(join for report in reports for join in report['joins'])
+    sent: Dict[int, int] = {}
+    delivered: Dict[int, LatencyHistogram] = {}
+
+    for report in reports:
+        for window, count in report['sent'].items():
+            sent[window] = sent.get(window, 0) + count
+        for window, histogram in report['deliveries'].items():
+            if window not in delivered:
+                delivered[window] = LatencyHistogram()
+            delivered[window].merge(histogram)
+
+    timeline = []
+    overall = LatencyHistogram()
+    saturation = None
+    for window in range(max([*sent, *delivered, -1]) + 1):
+        histogram = delivered.get(window, LatencyHistogram())
+        overall.merge(histogram)
+        end = (window + 1) * profile.window
+        row = {
+            'time_s': end,
+            'users': sum(1 for joined_at, _ in joins if joined_at < end),
+            'sent_per_s': sent.get(window, 0) / profile.window,
+            'delivered_per_s': histogram.count / profile.window,
+            'p50_ms': (histogram.percentile(50) or 0.0) * 1e3,
+            'p99_ms': (histogram.percentile(99) or 0.0) * 1e3,
+        }
+        timeline.append(row)
+        if saturation is None and histogram.count and row['p99_ms'] > profile.saturation_latency * 1e3:
+            saturation = row
+
+    join_latencies = [latency for _, latency in joins]
+    join_span = joins[-1][0] - joins[0][0] if len(joins) > 1 else 0.0
+    fanout = overall.summary()
+    return {
+        'users': profile.users,
+        'joined': len(joins),
+        'join_failures': sum(report['join_failures'] for report in reports),
+        'joins_per_s': (len(joins) - 1) / join_span if join_span else 0.0,
+        'join_p50_ms': percentile(join_latencies, 50) * 1e3,
+        'join_p99_ms': percentile(join_latencies, 99) * 1e3,
+        'messages_sent': sum(sent.values()),
+        'deliveries': overall.count,
+        'fanout_p50_ms': (fanout['p50'] or 0.0) * 1e3,
+        'fanout_p90_ms': (fanout['p90'] or 0.0) * 1e3,
+        'fanout_p99_ms': (fanout['p99'] or 0.0) * 1e3,
+        'fanout_max_ms': (fanout['max'] or 0.0) * 1e3,
+        'saturation': saturation,
+        'timeline': timeline,
+    }
+
+def print_load_report(report: Dict[str, Any]) -> None:
+    """Print a load test report."""
+    print_results(report['timeline'], "Timeline")
+    print()
+    summary = {k: v for k, v in report.items() if k not in ('timeline', 'saturation')}
+    print_results([summary], "Summary")
+    print()
+    saturation = report['saturation']
+    if saturation:
+        print(f"Saturated after {saturation['time_s']:.0f}s with {saturation['users']} users "
+              f"sending {saturation['sent_per_s']:.1f} messages/s "
+              f"({saturation['delivered_per_s']:.0f} deliveries/s, p99 {saturation['p99_ms']:.1f} ms)")
+    else:
+        print("The server did not saturate at this load")
+
+# %% ../nbs/08_load_testing.ipynb 15
+def run_chat_load(profile: Optional[LoadProfile] = None, host: Optional[str] = None,
+                  port: int = 0, verbose: bool = True) -> Dict[str, Any]:
+    """Run a chat load test and return its report."""
+    profile = profile or LoadProfile()
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start_times = context.Queue()
+    processes = []
+    server = None
+
+    with quiet():
+        if host is None:
+            server = ChatServer()
+            host, port = LOCALHOST, server.start()
+
+        try:
+            for worker in range(profile.processes):
+                indexes = list(range(worker, profile.users, profile.processes))
+                process = context.Process(target=_load_worker, daemon=True,
+                                          args=(worker, host, port, indexes, profile, results, start_times))
+                process.start()
+                processes.append(process)
+
+            # Start everyone at the same moment, once all workers are up
+            for _ in processes:
+                results.get(timeout=60)
+            start_at = time.time() + 0.1
+            for _ in processes:
+                start_times.put(start_at)
+
+            timeout = profile.ramp_time + profile.duration + profile.drain + 60
+            reports = [results.get(timeout=timeout)[1] for _ in processes]
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            if server:
+                server.stop()
+
+    report = _summarize_load(profile, reports)
+    if verbose:
+        print_load_report(report)
+    return report
@@ -0,0 +1,242 @@
+"""Finding out which code and which handlers burn a running server's CPU"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/15_profiling.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_SAMPLE_INTERVAL', 'SamplingProfiler', 'profile_to_file', 'CPUAccounting', 'json_field_key']
+
+# %% ../nbs/15_profiling.ipynb 3
+from .core import *
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/15_profiling.ipynb 5
+DEFAULT_SAMPLE_INTERVAL = 0.005  # Seconds between samples
+_THREAD_CLOCKS = hasattr(time, 'pthread_getcpuclockid')
+
+def _thread_cpu_time(thread_id: int) -> Optional[float]:
+    """Get the CPU time used by a thread, if the platform can tell us."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (OSError, AttributeError):
+        return None
+
+_switch_lock = threading.Lock()
+_switch_requests: List[float] = []  # Switch intervals asked for by running profilers
+_original_switch_interval = 0.0      # The interval before the first request
+
+def _request_switch_interval(interval: float) -> None:
+    """Shorten the GIL switch interval while at least one profiler asks for it."""
+    global _original_switch_interval
+    with _switch_lock:
+        if not _switch_requests:
+            _original_switch_interval = sys.getswitchinterval()
+        _switch_requests.append(interval)
+        sys.setswitchinterval(min([_original_switch_interval] + _switch_requests))
+
+def _release_switch_interval(interval: float) -> None:
+    """Withdraw a request, restoring the original interval once none are left."""
+    with _switch_lock:
+        _switch_requests.remove(interval)
+        sys.setswitchinterval(min([_original_switch_interval] + _switch_requests))
+
+def _frame_stack(frame: Any, max_depth: int) -> Tuple[Tuple[str, str, int], ...]:
+    """Get a frame's stack as (function, file, line) entries, outermost first."""
+    stack = []
+    while frame is not None and len(stack) < max_depth:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+# %% ../nbs/15_profiling.ipynb 7
+def _frame_label(entry: Tuple[str, str, int]) -> str:
+    """Label a stack entry as 'function (file:line)'."""
+    function, filename, line = entry
+    return f"{function} ({os.path.basename(filename)}:{line})"
+
+class SamplingProfiler:
+    """Periodically sample every thread's stack, weighted by the CPU it used."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, max_depth: int = 64,
+                 fast_switch: bool = False):
+        """Sample every `interval` seconds, keeping up to `max_depth` frames per stack.
+        
+        With `fast_switch`, the process-wide GIL switch interval is shortened
+        while sampling, so CPU is attributed more precisely at the cost of
+        changing how the measured threads are scheduled.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.max_depth = max_depth
+        self.fast_switch = fast_switch
+        self.mode = 'cpu' if _THREAD_CLOCKS else 'wall'
+        self.stacks: Counter = Counter()  # {stack: CPU microseconds, or samples in wall mode}
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._cpu_times: Dict[int, float] = {}  # {thread_id: CPU time at the last sample}
+        self._switch_request: Optional[float] = None  # Our switch interval request, while running
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the profiler is sampling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self.running:
+            raise RuntimeError("The profiler is already running")
+        self._stopped.clear()
+        self.started_at = time.monotonic()
+        if self.fast_switch:
+            self._switch_request = self.interval / 10
+            _request_switch_interval(self._switch_request)
+        self._thread = threading.Thread(target=self._sample_loop, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling; the collected stacks are kept."""
+        self._stopped.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._switch_request is not None:
+            _release_switch_interval(self._switch_request)
+            self._switch_request = None
+        if self.started_at is not None:
+            self.duration = time.monotonic() - self.started_at
+
+    def _sample_loop(self) -> None:
+        """Take a sample every interval until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Charge each thread's current stack with the CPU it used since the last sample."""
+        own = threading.get_ident()
+        cpu_times = {}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            weight = 1
+            if self.mode == 'cpu':
+                now = _thread_cpu_time(thread_id)
+                if now is None:
+                    continue
+                cpu_times[thread_id] = now
+                previous = self._cpu_times.get(thread_id)
+                weight = round((now - previous) * 1e6) if previous is not None else 0
+                if weight <= 0:
+                    continue  # Idle since the last sample, or first seen
+            self.stacks[_frame_stack(frame, self.max_depth)] += weight
+        self._cpu_times = cpu_times
+        self.samples += 1
+
+    def write_folded(self, path: str) -> None:
+        """Write the stacks in folded format, for flame graph tools."""
+        with open(path, 'w') as f:
+            for stack, weight in self.stacks.most_common():
+                f.write(";".join(_frame_label(entry) for entry in stack) + f" {weight}\n")
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get the functions with the most self time, with their total time."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, weight in self.stacks.items():
+            if not stack:
+                continue
+            own[stack[-1]] += weight
+            for entry in set(stack):
+                total[entry] += weight
+
+        overall = sum(self.stacks.values()) or 1
+        unit = 1e-3 if self.mode == 'cpu' else self.interval * 1e3  # Weight to milliseconds
+        return [{'function': _frame_label(entry),
+                 'self_ms': weight * unit,
+                 'self_pct': 100 * weight / overall,
+                 'total_pct': 100 * total[entry] / overall}
+                for entry, weight in own.most_common(limit)]
+
+# %% ../nbs/15_profiling.ipynb 9
+def profile_to_file(seconds: float, path: str, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                    on_done: Optional[Callable[[SamplingProfiler], None]] = None) -> SamplingProfiler:
+    """Profile every thread for `seconds` in the background, then write folded stacks to `path`."""
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+
+    def finish():
+        time.sleep(seconds)
+        profiler.stop()
+        profiler.write_folded(path)
+        print(f"Wrote {profiler.samples} samples ({profiler.mode} time) to {path}")
+        if on_done:
+            on_done(profiler)
+
+    threading.Thread(target=finish, name='profile-timer', daemon=True).start()
+    return profiler
+
+# %% ../nbs/15_profiling.ipynb 11
+class CPUAccounting:
+    """Running totals of the CPU time used by each kind of handler call."""
+
+    def __init__(self):
+        """Start with no calls recorded."""
+        self.totals: Dict[str, List[float]] = {}  # {name: [calls, cpu seconds, wall seconds]}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, cpu: float, wall: float) -> None:
+        """Add one call's CPU and wall time to a name's totals."""
+        with self._lock:
+            totals = self.totals.get(name)
+            if totals is None:
+                totals = self.totals[name] = [0, 0.0, 0.0]
+            totals[0] += 1
+            totals[1] += cpu
+            totals[2] += wall
+
+    def measure(self, name: str, function: Callable, *args: Any) -> Any:
+        """Call a function, charging its time to `name`."""
+        cpu, wall = time.thread_time(), time.monotonic()
+        try:
+            return function(*args)
+        finally:
+            self.record(name, time.thread_time() - cpu, time.monotonic() - wall)
+
+    def reset(self) -> None:
+        """Forget all recorded calls."""
+        with self._lock:
+            self.totals.clear()
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Get each name's totals, the most CPU first."""
+        with self._lock:
+            items = [(name, list(totals)) for name, totals in self.totals.items()]
+        overall = sum(totals[1] for _, totals in items) or 1.0
+        rows = [{'name': name,
+                 'calls': calls,
+                 'cpu_ms': cpu * 1e3,
+                 'cpu_us_per_call': cpu / calls * 1e6,
+                 'wall_ms': wall * 1e3,
+                 'cpu_pct': 100 * cpu / overall}
+                for name, (calls, cpu, wall) in items]
+        return sorted(rows, key=lambda row: row['cpu_ms'], reverse=True)
+
+# %% ../nbs/15_profiling.ipynb 13
+def json_field_key(field: str = 'type') -> Callable[[str, bytes], str]:
+    """Name JSON messages by the value of one field."""
+    import json
+
+    def key(connection_id: str, data: bytes) -> str:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return 'invalid'
+        return str(message.get(field)) if isinstance(message, dict) else 'other'
+    return key
@@ -0,0 +1,290 @@
+"""Negotiating a framed, optionally compressed protocol when a connection opens"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_protocol.ipynb.
+
+# %% auto 0
+__all__ = ['PROTOCOL_MAGIC', 'PROTOCOL_VERSION', 'HELLO_HEADER', 'FRAME_HEADER', 'MAX_FRAME_SIZE',
+           'DEFAULT_COMPRESSION_THRESHOLD', 'DEFAULT_ZDICT', 'COMPRESSORS', 'build_hello', 'read_hello', 'Compressor',
+           'ZlibCompressor', 'register_compressor', 'choose_compressor', 'FrameType', 'RTTStats', 'MessageProtocol',
+           'create_protocol']
+
+# %% ../nbs/05_protocol.ipynb 3
+from .core import *
+import json
+import socket
+import struct
+import time
+import zlib
+from collections import deque
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable, Deque
+
+# %% ../nbs/05_protocol.ipynb 5
+PROTOCOL_MAGIC = b'\x00PTCP'
+PROTOCOL_VERSION = 1
+HELLO_HEADER = struct.Struct('!5sBH')  # magic, version, options length
+FRAME_HEADER = struct.Struct('!BI')    # frame type, payload length
+MAX_FRAME_SIZE = 16 * 1024 * 1024      # Refuse frames larger than 16 MiB
+DEFAULT_COMPRESSION_THRESHOLD = 64     # Messages smaller than this are sent uncompressed
+
+# %% ../nbs/05_protocol.ipynb 6
+def build_hello(options: Dict[str, Any]) -> bytes:
+    """Build a hello message carrying the given options."""
+    body = json.dumps(options).encode('utf-8')
+    return HELLO_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, len(body)) + body
+
+# %% ../nbs/05_protocol.ipynb 7
+def read_hello(sock: socket.socket, data: bytes = b'') -> Tuple[Optional[Dict[str, Any]], bytes]:
+    """Read a hello from `sock`, starting with any bytes already received.
+
+    Returns the decoded options and any bytes that followed the hello. If
+    the data does not start with a hello, returns `None` and the data unchanged.
+    Only the bytes needed to complete the hello are read from the socket.
+    """
+    while len(data) < HELLO_HEADER.size:
+        if not PROTOCOL_MAGIC.startswith(data[:len(PROTOCOL_MAGIC)]):
+            return None, data
+        chunk = sock.recv(HELLO_HEADER.size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed during protocol negotiation")
+        data += chunk
+
+    magic, version, length = HELLO_HEADER.unpack_from(data)
+    if magic != PROTOCOL_MAGIC:
+        return None, data
+
+    end = HELLO_HEADER.size + length
+    while len(data) < end:
+        chunk = sock.recv(end - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed during protocol negotiation")
+        data += chunk
+
+    return json.loads(data[HELLO_HEADER.size:end].decode('utf-8')), data[end:]
+
+# %% ../nbs/05_protocol.ipynb 9
+class Compressor:
+    """Base class for a stateful, per-connection streaming compressor."""
+    name = 'none'
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress one message, flushing so the peer can decode it immediately."""
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress one message produced by the peer's `compress`."""
+        return data
+
+# %% ../nbs/05_protocol.ipynb 11
+DEFAULT_ZDICT = (
+    b'{"status": "error", "message": "Unknown command: ", "result": '
+    b'{"command": "echo", "data": "'
+    b'{"type": "error", "content": "'
+    b'{"type": "welcome", "content": "Welcome to the chat, '
+    b'{"type": "users", "users": ["'
+    b'{"type": "leave", "username": "'
+    b'{"type": "join", "username": "'
+    b'{"status": "success", "command": "'
+    b'", "timestamp": 17'
+    b'{"type": "message", "username": "", "content": "", "timestamp": 17'
+)
+
+# %% ../nbs/05_protocol.ipynb 12
+class ZlibCompressor(Compressor):
+    """Streaming zlib compression with an optional preset dictionary."""
+    name = 'zlib'
+
+    # Every sync flush ends with these bytes, so we strip them on the wire
+    SYNC_MARKER = b'\x00\x00\xff\xff'
+
+    def __init__(self, level: int = 6, zdict: Optional[bytes] = DEFAULT_ZDICT):
+        """Create the compression and decompression streams for one connection."""
+        if zdict:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=zdict)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a message and sync-flush the stream."""
+        compressed = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return compressed[:-len(self.SYNC_MARKER)]
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a message, restoring the stripped sync marker.
+        
+        Output is capped at the maximum frame size, so a small frame can't
+        inflate into an unbounded amount of memory.
+        """
+        message = self._decompressor.decompress(data + self.SYNC_MARKER, MAX_FRAME_SIZE + 1)
+        if len(message) > MAX_FRAME_SIZE or self._decompressor.unconsumed_tail:
+            raise ValueError("Decompressed message exceeds the maximum frame size")
+        return message
+
+# %% ../nbs/05_protocol.ipynb 13
+# Registry of available compressors: {name: factory}
+COMPRESSORS: Dict[str, Callable[[], Compressor]] = {
+    ZlibCompressor.name: ZlibCompressor,
+}
+
+def register_compressor(name: str, factory: Callable[[], Compressor]) -> None:
+    """Register a compressor factory under a name that peers can negotiate."""
+    COMPRESSORS[name] = factory
+
+def choose_compressor(offered: Optional[List[str]],
+                      accepted: Optional[List[str]] = None) -> Optional[str]:
+    """Pick the first offered compressor that we accept and have registered.
+
+    If `accepted` is None, every registered compressor is accepted.
+    """
+    for name in offered or []:
+        if name in COMPRESSORS and (accepted is None or name in accepted):
+            return name
+    return None
+
+# %% ../nbs/05_protocol.ipynb 15
+class FrameType:
+    """Constants for frame types."""
+    DATA = 0
+    COMPRESSED = 1
+    PING = 2  # Heartbeat request carrying the sender's clock reading
+    PONG = 3  # Heartbeat reply echoing the ping's payload
+
+# %% ../nbs/05_protocol.ipynb 17
+class RTTStats:
+    """Round-trip time measurements for one connection."""
+    
+    def __init__(self, window: int = 100, alpha: float = 0.125):
+        """Keep the last `window` samples and a moving average with weight `alpha`."""
+        self.alpha = alpha
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.average: Optional[float] = None
+        self.last: Optional[float] = None
+        self.count = 0
+    
+    def add(self, rtt: float) -> None:
+        """Record a round-trip time in seconds."""
+        self.samples.append(rtt)
+        self.last = rtt
+        self.count += 1
+        if self.average is None:
+            self.average = rtt
+        else:
+            self.average += self.alpha * (rtt - self.average)
+    
+    def percentile(self, p: float) -> Optional[float]:
+        """Get the p-th percentile of the recent samples, if there are any."""
+        samples = list(self.samples)
+        return percentile(samples, p) if samples else None
+    
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Summarize the measurements, in seconds."""
+        return {
+            'count': self.count,
+            'last': self.last,
+            'average': self.average,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+# %% ../nbs/05_protocol.ipynb 19
+class MessageProtocol:
+    """Frames, compresses and reassembles messages for one negotiated connection."""
+
+    def __init__(self, compressor: Optional[Compressor] = None,
+                 threshold: int = DEFAULT_COMPRESSION_THRESHOLD):
+        """Initialize the protocol with an optional compressor."""
+        self.compressor = compressor
+        self.threshold = threshold
+        self._buffer = bytearray()
+
+        # Statistics: payload bytes vs. bytes actually written to the socket
+        self.bytes_sent = 0
+        self.wire_bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes_received = 0
+        
+        # Heartbeat state
+        self.reply: Optional[Callable[[bytes], None]] = None  # Sends a frame back to the peer
+        self.rtt = RTTStats()
+        self.last_received = time.monotonic()
+
+    @property
+    def compression_name(self) -> Optional[str]:
+        """The name of the negotiated compressor, if any."""
+        return self.compressor.name if self.compressor else None
+
+    @property
+    def compression_ratio(self) -> float:
+        """Ratio of payload bytes to wire bytes sent (higher is better)."""
+        return self.bytes_sent / self.wire_bytes_sent if self.wire_bytes_sent else 1.0
+
+    def encode(self, payload: bytes) -> bytes:
+        """Encode one message as a frame, compressing it if worthwhile."""
+        frame_type = FrameType.DATA
+        body = payload
+
+        if self.compressor and len(payload) >= self.threshold:
+            frame_type = FrameType.COMPRESSED
+            body = self.compressor.compress(payload)
+
+        self.bytes_sent += len(payload)
+        self.wire_bytes_sent += FRAME_HEADER.size + len(body)
+        return FRAME_HEADER.pack(frame_type, len(body)) + body
+    
+    def ping(self) -> bytes:
+        """Encode a ping frame stamped with the current time."""
+        body = struct.pack('!d', time.monotonic())
+        return FRAME_HEADER.pack(FrameType.PING, len(body)) + body
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes and return every message that is now complete."""
+        self._buffer += data
+        self.wire_bytes_received += len(data)
+        self.last_received = time.monotonic()
+
+        messages = []
+        offset = 0
+        while len(self._buffer) - offset >= FRAME_HEADER.size:
+            frame_type, length = FRAME_HEADER.unpack_from(self._buffer, offset)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"Frame of {length} bytes exceeds the maximum frame size")
+
+            end = offset + FRAME_HEADER.size + length
+            if len(self._buffer) < end:
+                break  # Wait for the rest of the frame
+
+            body = bytes(self._buffer[offset + FRAME_HEADER.size:end])
+            offset = end
+
+            if frame_type == FrameType.COMPRESSED:
+                if not self.compressor:
+                    raise ValueError("Received a compressed frame but no compression was negotiated")
+                body = self.compressor.decompress(body)
+            elif frame_type == FrameType.PING:
+                if self.reply:
+                    self.reply(FRAME_HEADER.pack(FrameType.PONG, len(body)) + body)
+                continue
+            elif frame_type == FrameType.PONG:
+                self.rtt.add(time.monotonic() - struct.unpack('!d', body)[0])
+                continue
+            elif frame_type != FrameType.DATA:
+                raise ValueError(f"Unknown frame type: {frame_type}")
+
+            self.bytes_received += len(body)
+            messages.append(body)
+
+        # Drop consumed frames in one go rather than once per frame
+        del self._buffer[:offset]
+        return messages
+
+# %% ../nbs/05_protocol.ipynb 21
+def create_protocol(options: Dict[str, Any],
+                    threshold: int = DEFAULT_COMPRESSION_THRESHOLD) -> MessageProtocol:
+    """Create a `MessageProtocol` for the negotiated options."""
+    name = options.get('compression')
+    if name is not None and (not isinstance(name, str) or name not in COMPRESSORS):
+        raise ValueError(f"Unsupported compression: {name!r}")
+    compressor = COMPRESSORS[name]() if name else None
+    return MessageProtocol(compressor, threshold)
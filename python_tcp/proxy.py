@@ -0,0 +1,171 @@
+"""Forwarding connections to a pool of backend servers"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/10_proxy.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_PROXY_BUFFER_SIZE', 'Backend', 'BalanceStrategy', 'set_nodelay', 'TCPProxy']
+
+# %% ../nbs/10_proxy.ipynb 3
+from .core import *
+from .server import TCPServer
+from .client import TCPClient
+import itertools
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/10_proxy.ipynb 5
+DEFAULT_PROXY_BUFFER_SIZE = 64 * 1024
+
+@dataclass
+class Backend:
+    """A server behind the proxy, with its load and latency."""
+    host: str
+    port: int
+    active: int = 0                 # Connections currently forwarded to it
+    total: int = 0                  # Connections forwarded to it in total
+    errors: int = 0                 # Failed connection attempts
+    failures: int = 0               # Failed attempts since the last success
+    latency: Optional[float] = None # Smoothed connect time, in seconds
+
+    @property
+    def name(self) -> str:
+        """Get a display name for the backend."""
+        return format_address(self.host, self.port)
+
+    def record_latency(self, seconds: float, alpha: float = 0.2) -> None:
+        """Fold a new connect time into the smoothed latency."""
+        self.latency = seconds if self.latency is None else (1 - alpha) * self.latency + alpha * seconds
+
+# %% ../nbs/10_proxy.ipynb 7
+class BalanceStrategy:
+    """Constants for backend selection strategies."""
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"
+    LEAST_LATENCY = "least_latency"
+
+# %% ../nbs/10_proxy.ipynb 9
+def set_nodelay(sock: socket.socket) -> None:
+    """Disable Nagle's algorithm on a TCP socket (other sockets are left alone)."""
+    if sock.family in (socket.AF_INET, getattr(socket, 'AF_INET6', None)):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+# %% ../nbs/10_proxy.ipynb 11
+class TCPProxy(TCPServer):
+    """A TCP server that forwards each connection to a backend from a pool."""
+
+    def __init__(self, backends: List[Tuple[str, int]], host: str = LOCALHOST, port: int = 0,
+                 strategy: str = BalanceStrategy.ROUND_ROBIN,
+                 backlog: int = DEFAULT_BACKLOG,
+                 buffer_size: int = DEFAULT_PROXY_BUFFER_SIZE):
+        """Initialize the proxy with a list of (host, port) backends."""
+        super().__init__(host, port, backlog, buffer_size)
+        self.backends = [Backend(backend_host, backend_port) for backend_host, backend_port in backends]
+        self._round_robin = itertools.count()
+        self._backend_lock = threading.Lock()
+        self.bytes_forwarded = 0
+        self.set_strategy(strategy)
+
+    def set_strategy(self, strategy: str) -> None:
+        """Choose how backends are picked for new connections."""
+        strategies = {
+            BalanceStrategy.ROUND_ROBIN: self._pick_round_robin,
+            BalanceStrategy.LEAST_CONNECTIONS: self._pick_least_connections,
+            BalanceStrategy.LEAST_LATENCY: self._pick_least_latency,
+        }
+        if strategy not in strategies:
+            raise ValueError(f"Unknown balancing strategy: {strategy}")
+        self.strategy = strategy
+        self._pick = strategies[strategy]
+
+    def _pick_round_robin(self, candidates: List[Backend]) -> Backend:
+        """Pick backends in turn."""
+        return candidates[next(self._round_robin) % len(candidates)]
+
+    def _pick_least_connections(self, candidates: List[Backend]) -> Backend:
+        """Pick the backend with the fewest active connections."""
+        return min(candidates, key=lambda backend: backend.active)
+
+    def _pick_least_latency(self, candidates: List[Backend]) -> Backend:
+        """Pick the backend with the lowest connect time, failing ones last."""
+        return min(candidates, key=lambda backend: (backend.failures > 0, backend.latency or 0.0))
+
+    def _connect_backend(self) -> Tuple[Optional[Backend], Optional[TCPClient]]:
+        """Connect to a backend, trying each one at most once."""
+        candidates = list(self.backends)
+        while candidates:
+            with self._backend_lock:
+                backend = self._pick(candidates)
+                backend.active += 1
+
+            client = TCPClient(self.buffer_size)
+            start = time.perf_counter()
+            if client.connect(backend.host, backend.port):
+                with self._backend_lock:
+                    backend.total += 1
+                    backend.failures = 0
+                    backend.record_latency(time.perf_counter() - start)
+                return backend, client
+
+            with self._backend_lock:
+                backend.active -= 1
+                backend.errors += 1
+                backend.failures += 1
+            candidates.remove(backend)
+        return None, None
+
+    def _handle_client(self, connection: TCPConnection) -> None:
+        """Forward a client connection to a backend until either side closes."""
+        backend, client = self._connect_backend()
+        if backend is None:
+            print(f"No backend available for {connection.connection_id}")
+            self._close_connection(connection)
+            return
+
+        print(f"Forwarding {connection.connection_id} to {backend.name}")
+        backend_sock = client.sock
+        for sock in (connection.sock, backend_sock):
+            set_nodelay(sock)
+
+        upstream = threading.Thread(target=self._forward, args=(connection.sock, backend_sock), daemon=True)
+        upstream.start()
+        try:
+            self._forward(backend_sock, connection.sock)
+            upstream.join()
+        finally:
+            client.close()
+            self._close_connection(connection)
+            with self._backend_lock:
+                backend.active -= 1
+
+    def _forward(self, source: socket.socket, destination: socket.socket) -> None:
+        """Copy bytes from one socket to another, reusing a single buffer."""
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        forwarded = 0
+        try:
+            while True:
+                count = source.recv_into(buffer)
+                if not count:
+                    break
+                destination.sendall(view[:count])
+                forwarded += count
+        except OSError:
+            pass  # One side went away; the finally block passes that on
+        finally:
+            with self._backend_lock:
+                self.bytes_forwarded += forwarded
+            try:
+                destination.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    def backend_stats(self) -> List[Dict[str, Any]]:
+        """Get the load, error count and latency of each backend."""
+        with self._backend_lock:
+            return [{'backend': backend.name, 'active': backend.active, 'total': backend.total,
+                     'errors': backend.errors,
+                     'latency_ms': backend.latency * 1e3 if backend.latency is not None else None}
+                    for backend in self.backends]
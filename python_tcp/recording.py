@@ -0,0 +1,294 @@
+"""Capturing a server's real traffic and playing it back at any speed"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/14_recording.ipynb.
+
+# %% auto 0
+__all__ = ['RECORDING_MAGIC', 'RECORD_FRAMED', 'RecordKind', 'RecordedEvent', 'TrafficRecorder', 'read_recording',
+           'replay_recording']
+
+# %% ../nbs/14_recording.ipynb 3
+from .core import *
+from .client import TCPClient
+from .tracing import LatencyHistogram
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable, Iterator
+
+# %% ../nbs/14_recording.ipynb 5
+RECORDING_MAGIC = b'PTCPREC1'
+_RECORD_HEADER = struct.Struct('<BBIQI')  # kind, flags, connection, nanoseconds, length
+
+class RecordKind:
+    """Constants for the kinds of recorded events."""
+    OPEN = 1
+    MESSAGE = 2
+    CLOSE = 3
+
+RECORD_FRAMED = 0x01  # Flag: the connection used the framed protocol
+
+@dataclass
+class RecordedEvent:
+    """One event read back from a recording."""
+    kind: int
+    connection: int
+    time: float       # Seconds since the recording started
+    data: bytes = b''
+    framed: bool = False
+
+# %% ../nbs/14_recording.ipynb 7
+class TrafficRecorder:
+    """Record a server's connections and inbound messages to an append-only file."""
+
+    def __init__(self, path: str, flush_interval: float = 0.5, max_bytes: Optional[int] = None):
+        """Start recording to `path`, replacing any recording already there."""
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.file = open(path, 'wb')
+        self.file.write(RECORDING_MAGIC)
+        self.bytes_written = self.file.tell()
+        self.start = time.monotonic_ns()
+        self.connections: Dict[str, int] = {}  # {connection_id: connection number}
+        self.next_connection = 0
+        self.records = 0
+        self.dropped = 0
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _append(self, kind: int, connection_id: str, data: bytes = b'', flags: int = 0) -> None:
+        """Pack one record into the buffer (call with the lock held)."""
+        number = self.connections.get(connection_id)
+        if number is None:
+            number = self.connections[connection_id] = self.next_connection
+            self.next_connection += 1
+
+        size = _RECORD_HEADER.size + len(data)
+        if self.max_bytes is not None and self.bytes_written + len(self._buffer) + size > self.max_bytes:
+            self.dropped += 1
+            return
+
+        self._buffer += _RECORD_HEADER.pack(kind, flags, number, time.monotonic_ns() - self.start, len(data))
+        self._buffer += data
+        self.records += 1
+
+    def connection_opened(self, connection_id: str) -> None:
+        """Record a new connection."""
+        with self._lock:
+            self._append(RecordKind.OPEN, connection_id)
+
+    def messages_received(self, connection_id: str, messages: List[bytes], framed: bool = False) -> None:
+        """Record the messages decoded from one read."""
+        flags = RECORD_FRAMED if framed else 0
+        with self._lock:
+            for data in messages:
+                self._append(RecordKind.MESSAGE, connection_id, data, flags)
+
+    def connection_closed(self, connection_id: str) -> None:
+        """Record a closed connection."""
+        with self._lock:
+            if connection_id in self.connections:
+                self._append(RecordKind.CLOSE, connection_id)
+                del self.connections[connection_id]
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        with self._lock:
+            data, self._buffer = self._buffer, bytearray()
+        if data and not self.file.closed:
+            self.file.write(data)
+            self.file.flush()
+            self.bytes_written += len(data)
+
+    def _write_loop(self) -> None:
+        """Flush the buffer regularly until stopped."""
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self) -> None:
+        """Stop recording, writing out everything buffered."""
+        self._stopped.set()
+        self._writer.join()
+        self.flush()
+        self.file.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of records written or buffered, dropped records and file size."""
+        with self._lock:
+            return {'records': self.records, 'dropped': self.dropped,
+                    'bytes': self.bytes_written + len(self._buffer)}
+
+# %% ../nbs/14_recording.ipynb 9
+def read_recording(path: str) -> Iterator[RecordedEvent]:
+    """Read the events from a recording file."""
+    with open(path, 'rb') as f:
+        if f.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a traffic recording")
+
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            kind, flags, connection, nanos, length = _RECORD_HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield RecordedEvent(kind, connection, nanos / 1e9, data, bool(flags & RECORD_FRAMED))
+
+# %% ../nbs/14_recording.ipynb 11
+@dataclass
+class _ConnectionScript:
+    """What one recorded connection did, in seconds since the recording started."""
+    opened: float
+    framed: bool = False
+    closed: Optional[float] = None
+    messages: Optional[List[Tuple[float, bytes]]] = None
+
+def _build_scripts(events: Iterator[RecordedEvent]) -> List[_ConnectionScript]:
+    """Group recorded events into one script per connection."""
+    scripts: Dict[int, _ConnectionScript] = {}
+    for event in events:
+        script = scripts.get(event.connection)
+        if script is None:
+            script = scripts[event.connection] = _ConnectionScript(event.time, messages=[])
+        if event.kind == RecordKind.MESSAGE:
+            script.framed = script.framed or event.framed
+            script.messages.append((event.time, event.data))
+        elif event.kind == RecordKind.CLOSE:
+            script.closed = event.time
+    return list(scripts.values())
+
+# %% ../nbs/14_recording.ipynb 12
+class _ReplayConnection:
+    """Follow one connection's script against a server, timing the responses."""
+
+    def __init__(self, script: _ConnectionScript, host: str, port: int,
+                 start: float, speed: Optional[float], drain: float):
+        """Prepare to replay `script` against host:port, with times counted from `start`."""
+        self.script = script
+        self.host = host
+        self.port = port
+        self.start = start
+        self.speed = speed
+        self.drain = drain
+        self.histogram = LatencyHistogram()
+        self.sent = 0
+        self.responses = 0
+        self.failed = False
+        self.max_lag = 0.0
+        self._waiting: deque = deque()  # Send times of messages awaiting a response
+        self._answered = threading.Condition()
+
+    def _wait_until(self, recorded_time: float) -> None:
+        """Sleep until a recorded moment comes round in the replay."""
+        if self.speed is None:
+            return
+        due = self.start + recorded_time / self.speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self.max_lag = max(self.max_lag, -delay)
+
+    def run(self) -> None:
+        """Connect, send the messages on schedule, then disconnect."""
+        self._wait_until(self.script.opened)
+        client = TCPClient(buffer_size=64 * 1024)
+        if self.script.framed:
+            client.set_compression([])
+        if not client.connect(self.host, self.port):
+            self.failed = True
+            return
+
+        reader = threading.Thread(target=self._read_responses, args=(client,), daemon=True)
+        reader.start()
+        try:
+            for recorded_time, data in self.script.messages:
+                self._wait_until(recorded_time)
+                with self._answered:
+                    if not self.script.framed:
+                        # Keep raw messages apart: wait for the previous one's response
+                        self._answered.wait_for(lambda: not self._waiting, timeout=self.drain)
+                        self._waiting.clear()
+                    self._waiting.append(time.monotonic())
+                if not client.send(data):
+                    self.failed = True
+                    break
+                self.sent += 1
+
+            if self.script.closed is not None:
+                self._wait_until(self.script.closed)
+
+            # Half-close, and read the remaining responses until the server closes too
+            try:
+                client.sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            reader.join(timeout=self.drain)
+        finally:
+            client.close()
+
+    def _read_responses(self, client: TCPClient) -> None:
+        """Pair each response with the oldest message still waiting for one."""
+        while client.connected:
+            response = client.receive()
+            if response is None:
+                return
+            now = time.monotonic()
+            with self._answered:
+                self.responses += 1
+                if self._waiting:
+                    self.histogram.record(now - self._waiting.popleft())
+                    self._answered.notify()
+
+# %% ../nbs/14_recording.ipynb 13
+def replay_recording(path: str, host: str = LOCALHOST, port: int = 8000,
+                     speed: Optional[float] = 1.0, drain: float = 2.0,
+                     verbose: bool = True) -> Dict[str, Any]:
+    """Replay a recording against a server and report response latencies.
+
+    A `speed` of 2 replays twice as fast as recorded; None replays as fast as possible.
+    """
+    from python_tcp.benchmarks import print_results, quiet
+
+    if speed is not None and speed <= 0:
+        raise ValueError("speed must be positive, or None for maximum speed")
+    scripts = _build_scripts(read_recording(path))
+
+    start = time.monotonic()
+    connections = [_ReplayConnection(script, host, port, start, speed, drain) for script in scripts]
+    threads = [threading.Thread(target=c.run, daemon=True) for c in connections]
+    with quiet():
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.monotonic() - start
+
+    histogram = LatencyHistogram()
+    for connection in connections:
+        histogram.merge(connection.histogram)
+    summary = histogram.summary()
+    sent = sum(c.sent for c in connections)
+
+    report = {
+        'connections': len(connections),
+        'failed': sum(c.failed for c in connections),
+        'sent': sent,
+        'responses': sum(c.responses for c in connections),
+        'elapsed_s': elapsed,
+        'messages_per_s': sent / elapsed if elapsed else 0.0,
+        'max_lag_ms': max((c.max_lag for c in connections), default=0.0) * 1e3,
+    }
+    for key in ('p50', 'p90', 'p99', 'max'):
+        report[f"{key}_ms"] = summary[key] * 1e3 if summary[key] is not None else 0.0
+
+    if verbose:
+        print_results([report], f"Replay of {path} at {f'{speed:g}x' if speed else 'maximum'} speed")
+    return report
@@ -0,0 +1,193 @@
+"""Dispatching messages to handlers with a lookup table and a middleware chain"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/09_routing.ipynb.
+
+# %% auto 0
+__all__ = ['Handler', 'Middleware', 'Request', 'RouteError', 'chain', 'error_response', 'MessageRouter', 'require',
+           'require_fields', 'RateLimiter']
+
+# %% ../nbs/09_routing.ipynb 3
+from .core import *
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/09_routing.ipynb 5
+@dataclass
+class Request:
+    """A received message on its way through a router."""
+    connection_id: Optional[str]
+    data: bytes
+    message: Any = None          # The decoded JSON
+    route: Optional[str] = None  # The value of the router's key, if any
+    decoded: bool = True         # False if the data wasn't valid JSON
+    state: Dict[str, Any] = field(default_factory=dict)
+
+class RouteError(Exception):
+    """Raised by handlers and middleware to reject a message with an error response."""
+    pass
+
+# %% ../nbs/09_routing.ipynb 7
+Handler = Callable[[Request], Any]
+Middleware = Callable[[Request, Handler], Any]
+
+def _wrap(middleware: Middleware, next_handler: Handler) -> Handler:
+    """Wrap a handler in one middleware."""
+    return lambda request: middleware(request, next_handler)
+
+def chain(handler: Handler, middleware: List[Middleware]) -> Handler:
+    """Wrap a handler in middleware; the first middleware runs first."""
+    for m in reversed(middleware):
+        handler = _wrap(m, handler)
+    return handler
+
+def error_response(request: Request, reason: str) -> Dict[str, Any]:
+    """Build the default error response, in the format of our chat protocol."""
+    return {'type': 'error', 'content': reason, 'timestamp': time.time()}
+
+# %% ../nbs/09_routing.ipynb 9
+class MessageRouter:
+    """Dispatch JSON messages to handlers by the value of one key."""
+
+    def __init__(self, key: str = 'type',
+                 on_error: Callable[[Request, str], Any] = error_response):
+        """Route on `key`, building error responses with `on_error`."""
+        self.key = key
+        self.on_error = on_error
+        self.routes: Dict[Any, Handler] = {}
+        self.middleware: List[Middleware] = []
+        self.default_handler: Optional[Handler] = None
+        self.invalid_handler: Optional[Handler] = None
+        self._pipeline: Optional[Handler] = None
+        self._lock = threading.Lock()
+
+    def route(self, name: Any, handler: Optional[Handler] = None,
+              middleware: Optional[List[Middleware]] = None) -> Any:
+        """Register a handler for messages whose key equals `name`.
+
+        Can also be used as a decorator: `@router.route('join')`.
+        """
+        def register(handler: Handler) -> Handler:
+            self.routes[name] = chain(handler, middleware or [])
+            return handler
+
+        return register(handler) if handler else register
+
+    def use(self, middleware: Middleware) -> None:
+        """Add middleware that runs for every message, in the order added."""
+        with self._lock:
+            self.middleware.append(middleware)
+            self._pipeline = None
+
+    def set_default_handler(self, handler: Optional[Handler]) -> None:
+        """Set the handler for messages that match no route."""
+        self.default_handler = handler
+
+    def set_invalid_handler(self, handler: Optional[Handler]) -> None:
+        """Set the handler for data that isn't valid JSON."""
+        self.invalid_handler = handler
+
+    def build(self) -> Handler:
+        """Build the middleware chain around the dispatcher."""
+        with self._lock:
+            if self._pipeline is None:
+                self._pipeline = chain(self._dispatch, self.middleware)
+            return self._pipeline
+
+    def _dispatch(self, request: Request) -> Any:
+        """Pass a request to the handler for its route."""
+        if not request.decoded:
+            if self.invalid_handler is None:
+                raise RouteError("Invalid JSON format")
+            return self.invalid_handler(request)
+
+        handler = self.routes.get(request.route)
+        if handler is None:
+            if self.default_handler is None:
+                raise RouteError(f"Unknown message {self.key}")
+            handler = self.default_handler
+        return handler(request)
+
+    def dispatch(self, data: bytes, connection_id: Optional[str] = None) -> Optional[bytes]:
+        """Route one message and return the encoded response, if any."""
+        pipeline = self._pipeline or self.build()
+        request = Request(connection_id, data)
+
+        try:
+            request.message = json.loads(data)
+            if isinstance(request.message, dict):
+                request.route = request.message.get(self.key)
+        except ValueError:  # Includes JSON and Unicode decoding errors
+            request.decoded = False
+
+        try:
+            response = pipeline(request)
+        except RouteError as e:
+            response = self.on_error(request, str(e))
+        except Exception as e:
+            print(f"Error handling {self.key} {request.route!r}: {e}")
+            response = self.on_error(request, str(e))
+
+        return _encode_response(response)
+
+    def __call__(self, connection_id: str, data: bytes) -> Optional[bytes]:
+        """Route a message; lets a router be passed to `set_message_handler`."""
+        return self.dispatch(data, connection_id)
+
+def _encode_response(response: Any) -> Optional[bytes]:
+    """Encode a handler's response for sending."""
+    if response is None or isinstance(response, bytes):
+        return response
+    if isinstance(response, str):
+        return response.encode('utf-8')
+    return json.dumps(response).encode('utf-8')
+
+# %% ../nbs/09_routing.ipynb 11
+def require(check: Callable[[Request], bool], reason: str) -> Middleware:
+    """Middleware that rejects messages for which `check` returns False."""
+    def middleware(request: Request, next_handler: Handler) -> Any:
+        if not check(request):
+            raise RouteError(reason)
+        return next_handler(request)
+    return middleware
+
+def require_fields(*fields: str) -> Middleware:
+    """Middleware that rejects messages missing any of the given (non-empty) fields."""
+    def middleware(request: Request, next_handler: Handler) -> Any:
+        message = request.message if isinstance(request.message, dict) else {}
+        for name in fields:
+            if not message.get(name):
+                raise RouteError(f"{name.capitalize()} is required")
+        return next_handler(request)
+    return middleware
+
+# %% ../nbs/09_routing.ipynb 12
+class RateLimiter:
+    """Middleware that limits each connection to `rate` messages per second."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """Allow bursts of `burst` messages (default: one second's worth)."""
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.buckets: Dict[Optional[str], Tuple[float, float]] = {}  # {connection_id: (tokens, updated)}
+        self._lock = threading.Lock()
+
+    def __call__(self, request: Request, next_handler: Handler) -> Any:
+        """Pass the message on if the connection has a token to spend."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self.buckets.get(request.connection_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            self.buckets[request.connection_id] = (tokens - 1 if allowed else tokens, now)
+
+        if not allowed:
+            raise RouteError("Rate limit exceeded")
+        return next_handler(request)
+
+    def forget(self, connection_id: str) -> None:
+        """Drop the state for a connection that has closed."""
+        with self._lock:
+            self.buckets.pop(connection_id, None)
@@ -3,17 +3,31 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/01_tcp_server.ipynb.
 
 # %% auto 0
-__all__ = ['TCPServer', 'EnhancedTCPServer', 'EventDrivenTCPServer']
+__all__ = ['DEFAULT_ACCEPT_BATCH_SIZE', 'ACCEPT_POLL_INTERVAL', 'TCPServer', 'EnhancedTCPServer', 'EventDrivenTCPServer']
 
 # %% ../nbs/01_tcp_server.ipynb 3
 from .core import *
+from .protocol import *
+from .tracing import *
+import os
+import random
+import selectors
 import socket
-from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+import stat
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable, TYPE_CHECKING
 import threading
 import time
 import uuid
 
+if TYPE_CHECKING:
+    # Only for type hints: these are imported when first used, to keep imports fast
+    from python_tcp.recording import TrafficRecorder
+    from python_tcp.profiling import SamplingProfiler, CPUAccounting
+
 # %% ../nbs/01_tcp_server.ipynb 5
+DEFAULT_ACCEPT_BATCH_SIZE = 64  # Most connections accepted per wakeup
+ACCEPT_POLL_INTERVAL = 0.5      # Seconds between checks that the server is still running
+
 class TCPServer:
     """A simple TCP server that can handle multiple clients."""
     
@@ -22,98 +36,204 @@ class TCPServer:
                  buffer_size: int = DEFAULT_BUFFER_SIZE):
         """Initialize the server with host, port, and other parameters.
         
-        If port is 0, a random available port will be assigned.
+        If port is 0, a random available port will be assigned. Use a host of
+        `unix:/path` or `unix:@name` to listen on a Unix domain socket instead,
+        or `loop:name` to accept in-process loopback connections.
         """
         self.host = host
-        self.port = port if port != 0 else get_free_port()
+        self.port = port if port != 0 or is_unix_address(host) or is_loopback_address(host) else get_free_port()
         self.backlog = backlog
         self.buffer_size = buffer_size
         self.sock = None
         self.state = SocketState.CLOSED
         self.connections: Dict[str, TCPConnection] = {}
+        self._close_lock = threading.Lock()  # Makes sure each connection is closed only once
         self.running = False
         self.accept_thread = None
         
+        # Compressors clients may negotiate (None accepts every registered one)
+        self.compressors: Optional[List[str]] = None
+        self.compression_threshold = DEFAULT_COMPRESSION_THRESHOLD
+        
+        # Whether same-host clients may move their connection into shared memory, and how we wait there
+        self.shared_memory = False
+        self.shared_memory_mode = 'wakeup'
+        
+        # Liveness checks, both off by default
+        self.heartbeat_interval: Optional[float] = None
+        self.heartbeat_timeout: Optional[float] = None
+        self.heartbeat_thread = None
+        self.keepalive: Optional[Tuple[int, int, int]] = None
+        
+        # Accept path tuning: connections accepted per wakeup, and listening socket options
+        self.accept_batch_size = DEFAULT_ACCEPT_BATCH_SIZE
+        self.defer_accept: Optional[int] = None
+        self.fastopen: Optional[int] = None
+        
+        # The runtime profiler, once one has been started with profile()
+        self.profiler: Optional['SamplingProfiler'] = None
+        
     def __str__(self) -> str:
         """String representation of the server."""
         return f"TCPServer at {self.host}:{self.port} (state: {self.state})"
     
     def start(self) -> None:
         """Start the server: create socket, bind, and begin listening."""
-        if self.sock:
+        if self.sock or self.running:
             print("Server already started")
             return
-            
-        # Create a TCP socket
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        
+        if is_loopback_address(self.host):
+            # Loopback connections are handed to us directly by connect_loopback(),
+            # so there is no socket to bind and no accept loop
+            listen_loopback(self.host, self._start_connection)
+        else:
+            self._listen()
+        self.state = SocketState.LISTEN
+        self.running = True
+        
+        print(f"Server started on {format_address(self.host, self.port)}")
+        
+        # Start accepting connections in a separate thread
+        if self.sock:
+            self.accept_thread = threading.Thread(target=self._accept_connections, args=(self.sock,))
+            self.accept_thread.daemon = True
+            self.accept_thread.start()
+        
+        # Start pinging clients if heartbeats are enabled
+        if self.heartbeat_interval:
+            self.heartbeat_thread = threading.Thread(target=self._heartbeat_loop, args=(self.sock,))
+            self.heartbeat_thread.daemon = True
+            self.heartbeat_thread.start()
+    
+    def _listen(self) -> None:
+        """Create the listening socket, bind it and start listening."""
+        # Work out whether we're listening on TCP or a Unix domain socket
+        family, address = socket_address(self.host, self.port)
+        
+        # Create a stream socket
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
         
         # Set socket options
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         
+        # A socket file left behind by a previous run would make bind() fail
+        self._remove_socket_file()
+        
         # Bind the socket to the address
-        self.sock.bind((self.host, self.port))
+        self.sock.bind(address)
         
         # Get the actual port (in case 0 was specified)
-        if self.port == 0:
+        if family in (socket.AF_INET, socket.AF_INET6) and self.port == 0:
             self.port = self.sock.getsockname()[1]
             
-        # Start listening for incoming connections
+        # Start listening for incoming connections; accept() won't block,
+        # so the accept loop can take every queued connection per wakeup
+        configure_listener(self.sock, self.defer_accept, self.fastopen)
         self.sock.listen(self.backlog)
-        self.state = SocketState.LISTEN
-        self.running = True
+        self.sock.setblocking(False)
+    
+    def _accept_connections(self, listening_sock: socket.socket) -> None:
+        """Wait for incoming connections and accept them in batches."""
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(listening_sock, selectors.EVENT_READ)
+            
+            # Stop when the server stops, or is restarted with a new socket
+            while self.running and self.sock is listening_sock:
+                # Wake up when connections are queued, or now and then to check running
+                if selector.select(timeout=ACCEPT_POLL_INTERVAL):
+                    self._accept_pending(listening_sock)
+        except Exception as e:
+            if self.running:  # Only show error if we're supposed to be running
+                print(f"Error accepting connection: {e}")
+        finally:
+            selector.close()
+    
+    def _accept_pending(self, listening_sock: socket.socket) -> None:
+        """Accept queued connections until none are left or a batch is done."""
+        for _ in range(self.accept_batch_size):
+            try:
+                client_sock, client_address = listening_sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return  # The queue is empty
+            except ConnectionAbortedError:
+                continue  # The client gave up before we got to it
+            self._start_connection(client_sock, client_address)
+    
+    def _start_connection(self, client_sock: socket.socket, client_address: Any) -> TCPConnection:
+        """Register an accepted connection and handle it in a new thread."""
+        client_address = self._peer_address(client_address)
+        self._configure_client_socket(client_sock)
         
-        print(f"Server started on {self.host}:{self.port}")
+        # Create a connection ID and store connection info
+        conn_id = str(uuid.uuid4())
+        connection = TCPConnection(
+            sock=client_sock, 
+            state=SocketState.ESTABLISHED,
+            remote_address=client_address,
+            connection_id=conn_id
+        )
         
-        # Start accepting connections in a separate thread
-        self.accept_thread = threading.Thread(target=self._accept_connections)
-        self.accept_thread.daemon = True
-        self.accept_thread.start()
+        self.connections[conn_id] = connection
+        self._connection_opened(connection)
+        
+        # Handle client in a new thread
+        client_thread = threading.Thread(
+            target=self._handle_client, 
+            args=(connection,)
+        )
+        client_thread.daemon = True
+        client_thread.start()
+        
+        print(f"New connection from {format_address(*client_address)} (ID: {conn_id})")
+        return connection
     
-    def _accept_connections(self) -> None:
-        """Accept incoming connections in a loop."""
-        while self.running:
-            try:
-                # Accept a connection
-                client_sock, client_address = self.sock.accept()
-                
-                # Create a connection ID and store connection info
-                conn_id = str(uuid.uuid4())
-                connection = TCPConnection(
-                    sock=client_sock, 
-                    state=SocketState.ESTABLISHED,
-                    remote_address=client_address,
-                    connection_id=conn_id
-                )
-                
-                self.connections[conn_id] = connection
-                
-                # Handle client in a new thread
-                client_thread = threading.Thread(
-                    target=self._handle_client, 
-                    args=(connection,)
-                )
-                client_thread.daemon = True
-                client_thread.start()
-                
-                print(f"New connection from {client_address[0]}:{client_address[1]} (ID: {conn_id})")
-            except Exception as e:
-                if self.running:  # Only show error if we're supposed to be running
-                    print(f"Error accepting connection: {e}")
-                break
+    def _connection_opened(self, connection: TCPConnection) -> None:
+        """Called when a connection is accepted, before its thread starts."""
+        pass
+    
+    def _peer_address(self, address: Any) -> Tuple[str, int]:
+        """Normalize a peer address to a (host, port) tuple.
+        
+        Unix domain peers are usually unnamed, so they are reported by the
+        server's own socket address with port 0.
+        """
+        if isinstance(address, tuple):
+            return address[:2]  # IPv6 addresses also carry flow info and scope ID
+        return (self.host, 0)
+    
+    def _configure_client_socket(self, client_sock: socket.socket) -> None:
+        """Apply per-connection socket options to a newly accepted socket."""
+        if self.keepalive:
+            configure_keepalive(client_sock, *self.keepalive)
+    
+    def _remove_socket_file(self) -> None:
+        """Remove the file of a filesystem Unix domain socket, if there is one."""
+        family, address = socket_address(self.host, self.port)
+        if family != socket.AF_UNIX or address.startswith('\0'):
+            return
+        
+        try:
+            if stat.S_ISSOCK(os.stat(address).st_mode):
+                os.unlink(address)
+        except FileNotFoundError:
+            pass
     
     def _handle_client(self, connection: TCPConnection) -> None:
         """Handle communication with a client."""
         try:
             while self.running and connection.state == SocketState.ESTABLISHED:
-                # Receive data from the client
-                data = connection.sock.recv(self.buffer_size)
+                # Receive the next messages from the client
+                messages = self._receive_messages(connection)
                 
-                if not data:  # Empty data means the client closed the connection
+                if messages is None:  # The client closed the connection
                     break
                 
-                # Process the received data (echo it back in this simple example)
-                print(f"Received from {connection.connection_id}: {data.decode('utf-8')}")
-                connection.sock.sendall(data)
+                for data in messages:
+                    # Process the received data (echo it back in this simple example)
+                    print(f"Received from {connection.connection_id}: {data.decode('utf-8')}")
+                    self._send_data(connection, data)
         except Exception as e:
             print(f"Error handling client {connection.connection_id}: {e}")
         finally:
@@ -129,20 +249,198 @@ class TCPServer:
         connection = self.connections[connection_id]
         
         try:
-            connection.sock.sendall(data)
+            self._send_data(connection, data)
             return True
         except Exception as e:
             print(f"Error sending data to {connection_id}: {e}")
             self._close_connection(connection)
             return False
     
-    def _close_connection(self, connection: TCPConnection) -> None:
-        """Close a specific connection."""
+    def set_compression(self, compressors: Optional[List[str]] = None,
+                        threshold: int = DEFAULT_COMPRESSION_THRESHOLD) -> None:
+        """Choose which compressors clients may negotiate.
+        
+        None accepts every registered compressor and an empty list disables
+        compression. Messages shorter than threshold are sent uncompressed.
+        """
+        self.compressors = compressors
+        self.compression_threshold = threshold
+    
+    def set_shared_memory(self, enabled: bool = True, mode: str = 'wakeup') -> None:
+        """Let clients on this host exchange messages through shared memory rings.
+        
+        `mode` is the SharedMemoryMode our side waits for data with (default:
+        WAKEUP); clients don't get to choose it.
+        """
+        self.shared_memory = enabled
+        self.shared_memory_mode = mode
+    
+    def _protocol_options(self, requested: Dict[str, Any]) -> Dict[str, Any]:
+        """Choose the protocol options to answer a client's hello with."""
+        return {
+            'compression': choose_compressor(requested.get('compression'), self.compressors)
+        }
+    
+    def _negotiate(self, connection: TCPConnection, data: bytes) -> bytes:
+        """Switch to the framed protocol if the first bytes are a hello.
+        
+        Returns any data that arrived after the hello.
+        """
+        connection.negotiated = True
+        requested, data = read_hello(connection.sock, data)
+        if requested is None:
+            return data  # A plain client: keep the raw byte stream
+        
+        options = self._protocol_options(requested)
+        channel = None
+        if 'shm' in requested:
+            channel = self._accept_shared_memory(connection, requested['shm'])
+            options['shm'] = channel is not None
+        
+        with connection.send_lock:
+            connection.sock.sendall(build_hello(options))
+            connection.protocol = create_protocol(options, self.compression_threshold)
+            connection.protocol.reply = lambda frame: self._send_frame(connection, frame)
+            
+            # From now on the socket only carries wakeups; messages go through the rings
+            if channel is not None:
+                from python_tcp import shm
+                block, size = channel
+                connection.sock = shm.open_shared_socket(connection.sock, block, size, server=True,
+                                                         mode=self.shared_memory_mode)
+        
+        print(f"Connection {connection.connection_id} negotiated {options}")
+        return data
+    
+    def _accept_shared_memory(self, connection: TCPConnection, offer: Any) -> Optional[Tuple[Any, int]]:
+        """Attach to the shared memory a client offered, returning the block and ring size, or None to decline."""
+        if not self.shared_memory:
+            return None
+        
+        # Imported on first use rather than with the server, as it loads multiprocessing
+        from python_tcp import shm
+        if not shm.is_local_peer(connection.sock):
+            print(f"Connection {connection.connection_id} offered shared memory from another host")
+            return None
         try:
-            if connection.sock:
-                connection.sock.close()
+            return shm.attach_shared_channel(offer)
+        except Exception as e:
+            print(f"Connection {connection.connection_id} can't use shared memory: {e}")
+            return None
+    
+    def _receive_messages(self, connection: TCPConnection) -> Optional[List[bytes]]:
+        """Receive the next messages from a client, or None if it disconnected."""
+        data = connection.sock.recv(self.buffer_size)
+        
+        if not data:  # Empty data means the client closed the connection
+            return None
+        return self._decode_messages(connection, data)
+    
+    def _decode_messages(self, connection: TCPConnection, data: bytes) -> List[bytes]:
+        """Turn bytes read from a client into messages, negotiating first if needed."""
+        if not connection.negotiated:
+            data = self._negotiate(connection, data)
+        
+        if connection.protocol:
+            return connection.protocol.feed(data)
+        return [data] if data else []
+    
+    def _send_data(self, connection: TCPConnection, data: bytes) -> None:
+        """Write a message to a connection, framing it if negotiated."""
+        with connection.send_lock:
+            if connection.protocol:
+                data = connection.protocol.encode(data)
+            connection.sock.sendall(data)
+    
+    def _send_frame(self, connection: TCPConnection, frame: bytes) -> None:
+        """Write an already encoded control frame to a connection."""
+        with connection.send_lock:
+            connection.sock.sendall(frame)
+    
+    def set_heartbeat(self, interval: Optional[float] = 5.0, timeout: Optional[float] = None) -> None:
+        """Ping framed clients every `interval` seconds (None disables).
+        
+        Connections that send nothing for `timeout` seconds (three intervals
+        by default) are closed. Call before `start()`.
+        """
+        self.heartbeat_interval = interval
+        self.heartbeat_timeout = timeout if timeout is not None or interval is None else 3 * interval
+    
+    def set_keepalive(self, idle: Optional[int] = 60, interval: int = 10, count: int = 5) -> None:
+        """Enable TCP keepalive on accepted connections (an idle of None disables)."""
+        self.keepalive = (idle, interval, count) if idle is not None else None
+    
+    def set_accept_options(self, batch_size: int = DEFAULT_ACCEPT_BATCH_SIZE,
+                           defer_accept: Optional[int] = None,
+                           fastopen: Optional[int] = None) -> None:
+        """Tune how connections are accepted; takes effect on the next start().
+        
+        Up to `batch_size` queued connections are accepted per wakeup.
+        `defer_accept` (seconds) and `fastopen` (queue length) turn on
+        TCP_DEFER_ACCEPT and TCP_FASTOPEN where the platform supports them.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.accept_batch_size = batch_size
+        self.defer_accept = defer_accept
+        self.fastopen = fastopen
+    
+    def _heartbeat_loop(self, listening_sock: socket.socket) -> None:
+        """Ping every framed connection and close the ones that went quiet."""
+        # Stop when the server stops, or is restarted with a new socket
+        while self.running and self.sock is listening_sock:
+            time.sleep(self.heartbeat_interval)
+            now = time.monotonic()
             
+            for connection in list(self.connections.values()):
+                protocol = connection.protocol
+                if not protocol:
+                    continue  # Plain clients can't answer pings
+                
+                if self.heartbeat_timeout and now - protocol.last_received > self.heartbeat_timeout:
+                    print(f"Connection {connection.connection_id} timed out")
+                    self._close_connection(connection)
+                    continue
+                
+                try:
+                    self._send_frame(connection, protocol.ping())
+                except Exception as e:
+                    print(f"Error sending heartbeat to {connection.connection_id}: {e}")
+                    self._close_connection(connection)
+    
+    def get_rtt(self, connection_id: str) -> Optional[RTTStats]:
+        """Get the round-trip time measurements for a connection, if it is framed."""
+        connection = self.connections.get(connection_id)
+        if connection and connection.protocol:
+            return connection.protocol.rtt
+        return None
+    
+    def rtt_summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Summarize round-trip times for every framed connection."""
+        return {conn_id: connection.protocol.rtt.summary()
+                for conn_id, connection in list(self.connections.items())
+                if connection.protocol}
+    
+    def _close_connection(self, connection: TCPConnection) -> bool:
+        """Close a specific connection; returns False if it was already closed.
+        
+        Both the heartbeat and a connection's handler thread may close it,
+        so only the first call does anything.
+        """
+        with self._close_lock:
+            if connection.state == SocketState.CLOSED:
+                return False
             connection.update_state(SocketState.CLOSED)
+        
+        try:
+            if connection.sock:
+                # Shut down first so the client sees the close even while
+                # another thread is blocked reading from this socket
+                try:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # Already disconnected
+                connection.sock.close()
             
             if connection.connection_id in self.connections:
                 del self.connections[connection.connection_id]
@@ -150,29 +448,56 @@ class TCPServer:
             print(f"Connection {connection.connection_id} closed")
         except Exception as e:
             print(f"Error closing connection {connection.connection_id}: {e}")
+        return True
+    
+    def profile(self, seconds: float, path: str,
+                interval: Optional[float] = None) -> 'SamplingProfiler':
+        """Profile the running server for `seconds`, then write folded stacks to `path`.
+        
+        Returns at once; the profile is taken in the background, sampling
+        every `interval` seconds (default: DEFAULT_SAMPLE_INTERVAL).
+        """
+        from python_tcp.profiling import DEFAULT_SAMPLE_INTERVAL, profile_to_file
+        
+        if self.profiler and self.profiler.running:
+            raise RuntimeError("A profile is already being taken")
+        self.profiler = profile_to_file(seconds, path, interval or DEFAULT_SAMPLE_INTERVAL)
+        return self.profiler
     
     def stop(self) -> None:
         """Stop the server and close all connections."""
         self.running = False
         
+        # Refuse new loopback connections
+        if is_loopback_address(self.host):
+            close_loopback(self.host, self._start_connection)
+        
         # Close all client connections
-        for conn_id in list(self.connections.keys()):
-            self._close_connection(self.connections[conn_id])
+        for connection in list(self.connections.values()):
+            self._close_connection(connection)
+        
+        # Shut down the server socket to wake the accept loop, and wait for it
+        # to finish before closing (closing first would swallow the wakeup)
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Not every platform allows shutting down a listening socket
+        
+        if self.accept_thread and self.accept_thread.is_alive():
+            self.accept_thread.join(timeout=1.0)
         
         # Close the server socket
         if self.sock:
             try:
                 self.sock.close()
+                self._remove_socket_file()
                 print("Server socket closed")
             except Exception as e:
                 print(f"Error closing server socket: {e}")
         
         self.sock = None
         self.state = SocketState.CLOSED
-        
-        # Wait for accept thread to finish
-        if self.accept_thread and self.accept_thread.is_alive():
-            self.accept_thread.join(timeout=1.0)
             
         print("Server stopped")
 
@@ -186,6 +511,7 @@ class EnhancedTCPServer(TCPServer):
         """Initialize the enhanced server."""
         super().__init__(host, port, backlog, buffer_size)
         self.message_handler: Optional[Callable[[str, bytes], Optional[bytes]]] = None
+        self.batch_handler: Optional[Callable[[str, List[bytes]], Optional[List[Optional[bytes]]]]] = None
         
     def set_message_handler(self, handler: Callable[[str, bytes], Optional[bytes]]) -> None:
         """Set a custom message handler that will be called when data is received.
@@ -195,33 +521,67 @@ class EnhancedTCPServer(TCPServer):
         """
         self.message_handler = handler
     
+    def set_batch_handler(self, handler: Optional[Callable[[str, List[bytes]], Optional[List[Optional[bytes]]]]]) -> None:
+        """Set a handler for all the messages decoded from one read (None removes it).
+        
+        The handler receives the connection_id and a list of messages, and
+        returns a list of responses (None entries are skipped), which are
+        written back with a single send. It takes precedence over the
+        message handler.
+        """
+        self.batch_handler = handler
+    
+    def _handle_batch(self, connection: TCPConnection, messages: List[bytes]) -> None:
+        """Pass a batch of messages to the batch handler and send its responses."""
+        responses = self.batch_handler(connection.connection_id, messages)
+        if responses:
+            self._send_batch(connection, [response for response in responses if response])
+    
+    def _send_batch(self, connection: TCPConnection, messages: List[bytes]) -> None:
+        """Write several messages to a connection with one scatter-gather send."""
+        with connection.send_lock:
+            if connection.protocol:
+                messages = [connection.protocol.encode(message) for message in messages]
+            send_buffers(connection.sock, messages)
+    
     def _handle_client(self, connection: TCPConnection) -> None:
         """Override the client handler to use the custom message handler."""
         try:
             while self.running and connection.state == SocketState.ESTABLISHED:
-                # Receive data from the client
-                data = connection.sock.recv(self.buffer_size)
+                # Receive the next messages from the client
+                messages = self._receive_messages(connection)
                 
-                if not data:  # Empty data means the client closed the connection
+                if messages is None:  # The client closed the connection
                     break
                 
-                # Process the received data using the custom handler if available
-                print(f"Received from {connection.connection_id}: {data.decode('utf-8')}")
+                if self.batch_handler:
+                    if messages:
+                        print(f"Received {len(messages)} messages from {connection.connection_id}")
+                        self._handle_batch(connection, messages)
+                    continue
                 
-                if self.message_handler:
-                    response = self.message_handler(connection.connection_id, data)
-                    if response:
-                        connection.sock.sendall(response)
-                else:
-                    # Default behavior: echo the data back
-                    connection.sock.sendall(data)
+                for data in messages:
+                    # Process the received data using the custom handler if available
+                    print(f"Received from {connection.connection_id}: {data.decode('utf-8')}")
+                    
+                    if self.message_handler:
+                        response = self.message_handler(connection.connection_id, data)
+                        if response:
+                            self._send_data(connection, response)
+                    else:
+                        # Default behavior: echo the data back
+                        self._send_data(connection, data)
         except Exception as e:
             print(f"Error handling client {connection.connection_id}: {e}")
         finally:
             # Clean up the connection
             self._close_connection(connection)
 
-# %% ../nbs/01_tcp_server.ipynb 9
+# %% ../nbs/01_tcp_server.ipynb 10
+def _handler_name(handler: Callable) -> str:
+    """Name a handler function or callable object."""
+    return getattr(handler, '__name__', type(handler).__name__)
+
 class EventDrivenTCPServer(EnhancedTCPServer):
     """A TCP server that triggers events for connection lifecycle."""
     
@@ -233,45 +593,43 @@ class EventDrivenTCPServer(EnhancedTCPServer):
         self.on_connect: Optional[Callable[[str, Tuple[str, int]], None]] = None
         self.on_disconnect: Optional[Callable[[str], None]] = None
         self.on_data: Optional[Callable[[str, bytes], None]] = None
+        self.tracer: Optional[Tracer] = None
+        self.trace_sample_rate = 0.0
+        self.recorder: Optional['TrafficRecorder'] = None
+        self.cpu_accounting: Optional['CPUAccounting'] = None
+        self.cpu_key: Optional[Callable[[str, bytes], str]] = None
+    
+    def set_tracer(self, tracer: Optional[Tracer], sample_rate: float = 0.01) -> None:
+        """Trace a random `sample_rate` fraction of messages (None disables tracing)."""
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.tracer = tracer
+        self.trace_sample_rate = sample_rate if tracer else 0.0
     
-    def _accept_connections(self) -> None:
-        """Accept incoming connections and trigger the on_connect event."""
-        while self.running:
+    def set_cpu_accounting(self, accounting: Optional['CPUAccounting'],
+                           key: Optional[Callable[[str, bytes], str]] = None) -> None:
+        """Charge the CPU time of on_data and handler calls to `accounting` (None disables).
+        
+        Handler calls are charged to the name `key(connection_id, data)` returns,
+        or to the handler's name if no key is given.
+        """
+        self.cpu_key = key
+        self.cpu_accounting = accounting
+    
+    def set_recorder(self, recorder: Optional['TrafficRecorder']) -> None:
+        """Record connections and inbound messages to a traffic recording (None stops)."""
+        self.recorder = recorder
+    
+    def _connection_opened(self, connection: TCPConnection) -> None:
+        """Trigger the on_connect event for a newly accepted connection."""
+        recorder = self.recorder
+        if recorder:
+            recorder.connection_opened(connection.connection_id)
+        if self.on_connect:
             try:
-                # Accept a connection
-                client_sock, client_address = self.sock.accept()
-                
-                # Create a connection ID and store connection info
-                conn_id = str(uuid.uuid4())
-                connection = TCPConnection(
-                    sock=client_sock, 
-                    state=SocketState.ESTABLISHED,
-                    remote_address=client_address,
-                    connection_id=conn_id
-                )
-                
-                self.connections[conn_id] = connection
-                
-                # Trigger the on_connect event
-                if self.on_connect:
-                    try:
-                        self.on_connect(conn_id, client_address)
-                    except Exception as e:
-                        print(f"Error in on_connect callback: {e}")
-                
-                # Handle client in a new thread
-                client_thread = threading.Thread(
-                    target=self._handle_client, 
-                    args=(connection,)
-                )
-                client_thread.daemon = True
-                client_thread.start()
-                
-                print(f"New connection from {client_address[0]}:{client_address[1]} (ID: {conn_id})")
+                self.on_connect(connection.connection_id, connection.remote_address)
             except Exception as e:
-                if self.running:  # Only show error if we're supposed to be running
-                    print(f"Error accepting connection: {e}")
-                break
+                print(f"Error in on_connect callback: {e}")
     
     def _handle_client(self, connection: TCPConnection) -> None:
         """Handle client communication and trigger the on_data event."""
@@ -283,32 +641,129 @@ class EventDrivenTCPServer(EnhancedTCPServer):
                 if not data:  # Empty data means the client closed the connection
                     break
                 
-                # Trigger the on_data event
-                if self.on_data:
-                    try:
-                        self.on_data(connection.connection_id, data)
-                    except Exception as e:
-                        print(f"Error in on_data callback: {e}")
+                read_at = time.monotonic() if self.tracer else 0.0
+                messages = self._decode_messages(connection, data)
+                
+                recorder = self.recorder
+                if recorder and messages:
+                    recorder.messages_received(connection.connection_id, messages,
+                                               connection.protocol is not None)
+                
+                if self.batch_handler:
+                    if messages:
+                        self._handle_event_batch(connection, messages, read_at)
+                    continue
                 
-                # Process the received data using the custom handler if available
-                if self.message_handler:
-                    response = self.message_handler(connection.connection_id, data)
+                for data in messages:
+                    # Only a sampled fraction of messages is traced
+                    span = None
+                    if self.tracer and random.random() < self.trace_sample_rate:
+                        span = MessageSpan(connection.connection_id, len(data), read_at, time.monotonic())
+                    
+                    accounting = self.cpu_accounting
+                    if accounting and self.on_data:
+                        accounting.measure('on_data', self._trigger_on_data, connection, data)
+                    else:
+                        self._trigger_on_data(connection, data)
+                    
+                    if span:
+                        span.on_data = time.monotonic()
+                    
+                    # Process the received data using the custom handler if available
+                    if self.message_handler:
+                        if accounting:
+                            response = accounting.measure(self._cpu_account_name(connection, data),
+                                                          self.message_handler, connection.connection_id, data)
+                        else:
+                            response = self.message_handler(connection.connection_id, data)
+                    else:
+                        # Default behavior: echo the data back
+                        response = data
+                    
+                    if span:
+                        span.handled = time.monotonic()
+                    
                     if response:
-                        connection.sock.sendall(response)
-                else:
-                    # Default behavior: echo the data back
-                    connection.sock.sendall(data)
+                        self._send_data(connection, response)
+                    
+                    if span:
+                        span.sent = time.monotonic()
+                        self._record_span(span)
         except Exception as e:
             print(f"Error handling client {connection.connection_id}: {e}")
         finally:
             # Clean up the connection
             self._close_connection(connection)
     
-    def _close_connection(self, connection: TCPConnection) -> None:
-        """Close a connection and trigger the on_disconnect event."""
+    def _trigger_on_data(self, connection: TCPConnection, data: bytes) -> None:
+        """Trigger the on_data event for one message."""
+        if self.on_data:
+            try:
+                self.on_data(connection.connection_id, data)
+            except Exception as e:
+                print(f"Error in on_data callback: {e}")
+    
+    def _handle_event_batch(self, connection: TCPConnection, messages: List[bytes], read_at: float) -> None:
+        """Trigger on_data for a batch of messages, then run the batch handler."""
+        # A sampled batch is traced as a single span
+        span = None
+        if self.tracer and random.random() < self.trace_sample_rate:
+            span = MessageSpan(connection.connection_id, sum(map(len, messages)), read_at, time.monotonic())
+        
+        accounting = self.cpu_accounting
+        for data in messages:
+            if accounting and self.on_data:
+                accounting.measure('on_data', self._trigger_on_data, connection, data)
+            else:
+                self._trigger_on_data(connection, data)
+        
+        if span:
+            span.on_data = time.monotonic()
+        
+        if accounting:
+            responses = accounting.measure(_handler_name(self.batch_handler), self.batch_handler,
+                                           connection.connection_id, messages)
+        else:
+            responses = self.batch_handler(connection.connection_id, messages)
+        
+        if span:
+            span.handled = time.monotonic()
+        
+        if responses:
+            self._send_batch(connection, [response for response in responses if response])
+        
+        if span:
+            span.sent = time.monotonic()
+            self._record_span(span)
+    
+    def _cpu_account_name(self, connection: TCPConnection, data: bytes) -> str:
+        """Name the account a message handler call is charged to."""
+        if self.cpu_key:
+            try:
+                return self.cpu_key(connection.connection_id, data)
+            except Exception as e:
+                print(f"Error in CPU accounting key: {e}")
+        return _handler_name(self.message_handler)
+    
+    def _record_span(self, span: MessageSpan) -> None:
+        """Pass a finished span to the tracer without letting it break the connection."""
+        tracer = self.tracer
+        if tracer:
+            try:
+                tracer.record(span)
+            except Exception as e:
+                print(f"Error in tracer: {e}")
+    
+    def _close_connection(self, connection: TCPConnection) -> bool:
+        """Close a connection and trigger the on_disconnect event, once."""
         conn_id = connection.connection_id
         
-        super()._close_connection(connection)
+        if not super()._close_connection(connection):
+            return False
+        
+        recorder = self.recorder
+        if recorder:
+            recorder.connection_closed(conn_id)
         
         # Trigger the on_disconnect event
         if self.on_disconnect:
@@ -316,3 +771,4 @@ class EventDrivenTCPServer(EnhancedTCPServer):
                 self.on_disconnect(conn_id)
             except Exception as e:
                 print(f"Error in on_disconnect callback: {e}")
+        return True
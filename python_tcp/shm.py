@@ -0,0 +1,307 @@
+"""Passing messages between processes on the same host through shared memory ring buffers"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/16_shm.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_RING_SIZE', 'MIN_RING_SIZE', 'MAX_RING_SIZE', 'RING_HEADER_SIZE', 'SPIN_TIME', 'WAKEUP_TIMEOUT',
+           'WRITE_BACKOFF', 'SHM_NAME_PREFIX', 'SPSCRing', 'SharedMemoryMode', 'SharedMemorySocket', 'is_same_host',
+           'is_local_peer', 'check_ring_size', 'unlink_shared_channel', 'create_shared_channel',
+           'attach_shared_channel', 'open_shared_socket']
+
+# %% ../nbs/16_shm.ipynb 3
+from .core import *
+import ipaddress
+import os
+import re
+import secrets
+import selectors
+import socket
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+if os.name == 'posix':
+    import _posixshmem
+
+# %% ../nbs/16_shm.ipynb 5
+DEFAULT_RING_SIZE = 1024 * 1024  # Bytes of buffer in each direction
+MIN_RING_SIZE = 4 * 1024         # Ring sizes a server accepts: powers of two in this range
+MAX_RING_SIZE = 64 * 1024 * 1024
+RING_HEADER_SIZE = 192           # Counters and flags, on separate cache lines
+_HEAD, _TAIL, _WAITING, _CLOSED = 0, 64, 128, 132
+_COUNTER = struct.Struct('<Q')
+_FLAG = struct.Struct('<I')
+
+class SPSCRing:
+    """A single-producer, single-consumer byte ring in a shared buffer."""
+
+    def __init__(self, buf: memoryview, offset: int, capacity: int):
+        """Use `RING_HEADER_SIZE + capacity` bytes of `buf`, starting at `offset`."""
+        self.buf = buf
+        self.offset = offset
+        self.start = offset + RING_HEADER_SIZE
+        self.capacity = capacity
+
+    def _counter(self, field: int) -> int:
+        """Read one of the counters."""
+        return _COUNTER.unpack_from(self.buf, self.offset + field)[0]
+
+    def _flag(self, field: int) -> bool:
+        """Read one of the flags."""
+        return bool(_FLAG.unpack_from(self.buf, self.offset + field)[0])
+
+    def _set_flag(self, field: int, value: bool) -> None:
+        """Set or clear one of the flags."""
+        _FLAG.pack_into(self.buf, self.offset + field, int(value))
+
+    waiting = property(lambda self: self._flag(_WAITING), lambda self, value: self._set_flag(_WAITING, value),
+                       doc="Whether the reader is sleeping until it is woken up.")
+    closed = property(lambda self: self._flag(_CLOSED), lambda self, value: self._set_flag(_CLOSED, value),
+                      doc="Whether the writer has finished writing.")
+
+    def available(self) -> int:
+        """Count the bytes waiting to be read."""
+        return self._counter(_HEAD) - self._counter(_TAIL)
+
+    def write(self, data: Union[bytes, memoryview]) -> int:
+        """Copy as much of `data` as fits into the ring and return how many bytes that was."""
+        head = self._counter(_HEAD)
+        count = min(len(data), self.capacity - (head - self._counter(_TAIL)))
+        if count <= 0:
+            return 0
+
+        # Copy in up to two pieces: to the end of the buffer, then from its start
+        position = head % self.capacity
+        first = min(count, self.capacity - position)
+        self.buf[self.start + position:self.start + position + first] = data[:first]
+        if count > first:
+            self.buf[self.start:self.start + count - first] = data[first:count]
+
+        _COUNTER.pack_into(self.buf, self.offset + _HEAD, head + count)
+        return count
+
+    def read(self, limit: int) -> bytes:
+        """Copy up to `limit` waiting bytes out of the ring (empty if there are none)."""
+        tail = self._counter(_TAIL)
+        count = min(limit, self._counter(_HEAD) - tail)
+        if count <= 0:
+            return b''
+
+        position = tail % self.capacity
+        first = min(count, self.capacity - position)
+        data = bytes(self.buf[self.start + position:self.start + position + first])
+        if count > first:
+            data += bytes(self.buf[self.start:self.start + count - first])
+
+        _COUNTER.pack_into(self.buf, self.offset + _TAIL, tail + count)
+        return data
+
+# %% ../nbs/16_shm.ipynb 9
+SPIN_TIME = 50e-6 if (os.cpu_count() or 1) > 1 else 0.0  # Seconds a reader polls before sleeping
+WAKEUP_TIMEOUT = 0.05  # Longest sleep, in case a wakeup was missed
+WRITE_BACKOFF = 0.001  # Longest sleep of a writer waiting for room in the ring
+
+class SharedMemoryMode:
+    """Constants for how a reader waits for data."""
+    WAKEUP = 'wakeup'  # Poll briefly, then sleep until the writer signals the socket
+    POLL = 'poll'      # Poll continuously: lowest latency, but a busy CPU core per reader
+
+class SharedMemorySocket:
+    """A socket-like byte stream over a pair of shared memory rings.
+
+    Data goes through the rings; the original socket only carries wakeups
+    and tells each side when the other has gone away.
+    """
+
+    def __init__(self, sock: socket.socket, block: shared_memory.SharedMemory,
+                 inbound: SPSCRing, outbound: SPSCRing,
+                 mode: str = SharedMemoryMode.WAKEUP, spin: float = SPIN_TIME):
+        """Wrap a connected socket and the rings to read from and write to."""
+        self.sock = sock
+        self.block = block  # Keeps the shared memory mapped while we use it
+        self.inbound = inbound
+        self.outbound = outbound
+        self.mode = mode
+        self.spin = spin
+        self.closed = False
+        self.peer_gone = False
+        self.reader_asleep = False  # Whether a thread is in `recv`, asleep on the socket
+
+        # Wakeups are one-byte writes that Nagle's algorithm would hold back for an ACK
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Wakeups are drained without blocking, after a selector says they're there
+        self.sock.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ)
+
+    def recv(self, bufsize: int) -> bytes:
+        """Read up to `bufsize` bytes, waiting until some arrive (empty at the end)."""
+        spin_until = None
+        polls = 0
+        while True:
+            data = self.inbound.read(bufsize)
+            if data:
+                return data
+            if self.closed or self.peer_gone or self.inbound.closed:
+                return b''
+
+            if self.mode == SharedMemoryMode.POLL:
+                # Check the socket now and then, in case the peer died without closing
+                polls += 1
+                if polls % 1024 == 0:
+                    self._wait(0.0)
+                time.sleep(0)  # Let our other threads run
+                continue
+
+            now = time.perf_counter()
+            if spin_until is None:
+                spin_until = now + self.spin
+            if now < spin_until:
+                time.sleep(0)
+                continue
+
+            # Nothing came while spinning: ask to be woken, then check once more before sleeping
+            self.inbound.waiting = True
+            if not self.inbound.available():
+                self.reader_asleep = True
+                self._wait(WAKEUP_TIMEOUT)
+                self.reader_asleep = False
+            self.inbound.waiting = False
+            spin_until = None
+
+    def _wait(self, timeout: float) -> None:
+        """Wait up to `timeout` seconds for a wakeup, noticing if the socket closed."""
+        if not self.selector.select(timeout):
+            return
+        try:
+            if not self.sock.recv(4096):  # Wakeup bytes carry no data
+                self.peer_gone = True
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self.peer_gone = True
+
+    def sendall(self, data: bytes) -> None:
+        """Write all of `data` to the peer's ring, waiting while it's full."""
+        view = memoryview(data)
+        delay = 0.0
+        while view:
+            if self.closed or self.peer_gone or self.inbound.closed:
+                raise BrokenPipeError("The shared memory connection is closed")
+
+            written = self.outbound.write(view)
+            if written:
+                view = view[written:]
+                self._wake_peer()
+                delay = 0.0
+                continue
+
+            # The ring is full: check that the reader is still there, then give it time to catch up
+            if not self.reader_asleep:
+                self._wait(0.0)
+            time.sleep(delay)
+            delay = min(2 * delay or 10e-6, WRITE_BACKOFF)
+
+    def _wake_peer(self) -> None:
+        """Send the peer a wakeup byte if it's asleep."""
+        if not self.outbound.waiting:
+            return
+        self.outbound.waiting = False
+        try:
+            self.sock.send(b'\x01')
+        except (BlockingIOError, InterruptedError):
+            pass  # The socket is full of wakeups already
+
+    def shutdown(self, how: int) -> None:
+        """Tell the peer we're done and wake it, then shut down the socket."""
+        self.outbound.closed = True
+        if how != socket.SHUT_WR:
+            self.closed = True
+        self.sock.shutdown(how)
+
+    def close(self) -> None:
+        """Close the connection; the shared memory is unmapped once we're no longer referenced."""
+        self.closed = True
+        self.outbound.closed = True
+        self.selector.close()
+        self.sock.close()
+
+# %% ../nbs/16_shm.ipynb 14
+def is_same_host(host: str) -> bool:
+    """Check whether a server address is certainly on this host."""
+    if is_unix_address(host) or is_loopback_address(host) or host == 'localhost':
+        return True
+    try:
+        address = ipaddress.ip_address(host.strip('[]').split('%')[0])
+    except ValueError:
+        return False
+    # IPv4 clients of a dual-stack socket show up as ::ffff:127.0.0.1
+    return (getattr(address, 'ipv4_mapped', None) or address).is_loopback
+
+def is_local_peer(sock: socket.socket) -> bool:
+    """Check whether the other end of a connected socket is certainly on this host."""
+    if sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return sock.family == getattr(socket, 'AF_UNIX', None)
+    try:
+        return is_same_host(sock.getpeername()[0])
+    except OSError:
+        return False
+
+SHM_NAME_PREFIX = 'ptcp_'
+_SHM_NAME = re.compile(re.escape(SHM_NAME_PREFIX) + r'[0-9a-f]{16}')
+
+def check_ring_size(size: Any) -> int:
+    """Make sure a ring size is a power of two in the accepted range, and return it."""
+    if (not isinstance(size, int) or isinstance(size, bool) or not MIN_RING_SIZE <= size <= MAX_RING_SIZE
+            or size & (size - 1)):
+        raise ValueError(f"Ring size must be a power of two from {MIN_RING_SIZE} to {MAX_RING_SIZE} bytes")
+    return size
+
+def _open_untracked(**kwargs: Any) -> shared_memory.SharedMemory:
+    """Create or attach to a shared memory block that the resource tracker ignores."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(track=False, **kwargs)
+    block = shared_memory.SharedMemory(**kwargs)
+    if os.name == 'posix':
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+def unlink_shared_channel(block: shared_memory.SharedMemory) -> None:
+    """Remove the name of an untracked block; the memory lives on while it's mapped."""
+    if sys.version_info >= (3, 13) or os.name != 'posix':
+        block.unlink()
+    else:
+        _posixshmem.shm_unlink(block._name)  # unlink() would also unregister it from the tracker
+
+def create_shared_channel(size: int = DEFAULT_RING_SIZE) -> shared_memory.SharedMemory:
+    """Create a shared memory block for a pair of `size`-byte rings."""
+    check_ring_size(size)
+    return _open_untracked(create=True, name=SHM_NAME_PREFIX + secrets.token_hex(8),
+                           size=2 * (RING_HEADER_SIZE + size))
+
+def attach_shared_channel(offer: Any) -> Tuple[shared_memory.SharedMemory, int]:
+    """Check the offer a client made, then attach to its block; returns the block and ring size."""
+    if not isinstance(offer, dict):
+        raise ValueError("Malformed shared memory offer")
+    name, size = offer.get('name'), check_ring_size(offer.get('size'))
+    if not isinstance(name, str) or not _SHM_NAME.fullmatch(name):
+        raise ValueError(f"{name!r} is not a shared memory block created by this library")
+
+    block = _open_untracked(name=name)
+    if block.size < 2 * (RING_HEADER_SIZE + size):
+        block.close()
+        raise ValueError(f"Shared memory block {name} is too small for its rings")
+    return block, size
+
+def open_shared_socket(sock: socket.socket, block: shared_memory.SharedMemory, size: int,
+                       server: bool, mode: str = SharedMemoryMode.WAKEUP) -> SharedMemorySocket:
+    """Wrap one end of a connection in a socket that uses the block's rings."""
+    to_server = SPSCRing(block.buf, 0, size)
+    to_client = SPSCRing(block.buf, RING_HEADER_SIZE + size, size)
+    if server:
+        return SharedMemorySocket(sock, block, to_server, to_client, mode)
+    return SharedMemorySocket(sock, block, to_client, to_server, mode)
@@ -0,0 +1,146 @@
+"""Finding out where the time goes when a server gets slow"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_tracing.ipynb.
+
+# %% auto 0
+__all__ = ['TRACE_STAGES', 'MessageSpan', 'Tracer', 'LatencyHistogram', 'HistogramTracer']
+
+# %% ../nbs/07_tracing.ipynb 3
+from .core import *
+import threading
+from dataclasses import dataclass
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/07_tracing.ipynb 5
+TRACE_STAGES = ('read', 'on_data', 'handler', 'send', 'total')
+
+@dataclass
+class MessageSpan:
+    """Monotonic timestamps for one message's trip through the server."""
+    connection_id: str
+    size: int
+    read: float            # recv() returned
+    started: float = 0.0   # Processing of this message started
+    on_data: float = 0.0   # on_data callback finished
+    handled: float = 0.0   # message_handler returned
+    sent: float = 0.0      # Response written to the socket
+
+    def stages(self) -> Dict[str, float]:
+        """Get the duration of each stage, in seconds."""
+        return {
+            'read': self.started - self.read,
+            'on_data': self.on_data - self.started,
+            'handler': self.handled - self.on_data,
+            'send': self.sent - self.handled,
+            'total': self.sent - self.read,
+        }
+
+# %% ../nbs/07_tracing.ipynb 7
+class Tracer:
+    """Base class for receivers of sampled message spans."""
+
+    def record(self, span: MessageSpan) -> None:
+        """Handle one finished span."""
+        pass
+
+# %% ../nbs/07_tracing.ipynb 9
+class LatencyHistogram:
+    """A log-linear (HDR-style) histogram of latencies with bounded relative error."""
+
+    def __init__(self, precision_bits: int = 5):
+        """Split each power of two into 2**precision_bits buckets."""
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _bucket(self, nanos: int) -> int:
+        """Get the bucket index for a value in nanoseconds."""
+        if nanos < self._sub_buckets:
+            return nanos  # Small values are recorded exactly
+        exponent = nanos.bit_length() - self.precision_bits
+        return exponent * self._sub_buckets + (nanos >> exponent)
+
+    def _bucket_value(self, bucket: int) -> float:
+        """Get the value, in seconds, that a bucket stands for (its midpoint)."""
+        exponent, mantissa = divmod(bucket, self._sub_buckets)
+        if exponent == 0:
+            return mantissa / 1e9
+        return ((mantissa << exponent) + (1 << exponent) / 2) / 1e9
+
+    def record(self, seconds: float) -> None:
+        """Record one latency, in seconds."""
+        bucket = self._bucket(max(0, int(seconds * 1e9)))
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add another histogram's recordings (with the same precision) to this one."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Get the p-th percentile (0-100) in seconds, if anything was recorded."""
+        if not self.count:
+            return None
+        if p >= 100:
+            return self.max
+        target = max(1, round(p / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._bucket_value(bucket), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Summarize the histogram, in seconds."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+            'max': self.max,
+        }
+
+# %% ../nbs/07_tracing.ipynb 11
+class HistogramTracer(Tracer):
+    """A tracer that aggregates per-stage latency histograms."""
+
+    def __init__(self, precision_bits: int = 5):
+        """Create an empty histogram for every stage."""
+        self.histograms = {stage: LatencyHistogram(precision_bits) for stage in TRACE_STAGES}
+        self._lock = threading.Lock()
+
+    def record(self, span: MessageSpan) -> None:
+        """Add a span's stage durations to the histograms."""
+        with self._lock:
+            for stage, seconds in span.stages().items():
+                self.histograms[stage].record(seconds)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Get per-stage latency percentiles, in microseconds."""
+        with self._lock:
+            summaries = {stage: h.summary() for stage, h in self.histograms.items()}
+
+        report = []
+        for stage, summary in summaries.items():
+            row = {'stage': stage, 'count': summary['count']}
+            for key in ('p50', 'p90', 'p99', 'p999', 'max'):
+                row[f"{key}_us"] = summary[key] * 1e6 if summary[key] is not None else 0.0
+            report.append(row)
+        return report
@@ -0,0 +1,84 @@
+"""Running CPU-bound message handlers outside the server process"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/12_workers.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_SHARED_MEMORY_THRESHOLD', 'ProcessPoolHandler']
+
+# %% ../nbs/12_workers.ipynb 3
+from .core import *
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable
+
+# %% ../nbs/12_workers.ipynb 5
+DEFAULT_SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+def _share(data: bytes) -> Tuple[str, int]:
+    """Copy data into a new shared memory block and return its (name, size)."""
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    block.buf[:len(data)] = data
+    block.close()
+    return block.name, len(data)
+
+def _take(shared: Tuple[str, int], unlink: bool) -> bytes:
+    """Read the data from a shared memory block, unlinking it if we're its owner."""
+    name, size = shared
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(block.buf[:size])
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+def _unlink(shared: Tuple[str, int]) -> None:
+    """Free a shared memory block we created."""
+    block = shared_memory.SharedMemory(name=shared[0])
+    block.close()
+    block.unlink()
+
+def _run_handler(handler: Callable[[str, bytes], Optional[bytes]], connection_id: str,
+                 data: Optional[bytes], shared: Optional[Tuple[str, int]],
+                 threshold: int) -> Tuple[Optional[bytes], Optional[Tuple[str, int]]]:
+    """Run a handler in a worker process, sharing a large response."""
+    if shared is not None:
+        data = _take(shared, unlink=False)
+    response = handler(connection_id, data)
+    if response is not None and len(response) >= threshold:
+        return None, _share(response)
+    return response, None
+
+# %% ../nbs/12_workers.ipynb 7
+class ProcessPoolHandler:
+    """Run a message handler in a pool of worker processes."""
+
+    def __init__(self, handler: Callable[[str, bytes], Optional[bytes]],
+                 max_workers: Optional[int] = None,
+                 shared_memory_threshold: int = DEFAULT_SHARED_MEMORY_THRESHOLD):
+        """Start a pool of `max_workers` processes (default: one per CPU)."""
+        self.handler = handler
+        self.shared_memory_threshold = shared_memory_threshold
+        self.executor = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+    def __call__(self, connection_id: str, data: bytes) -> Optional[bytes]:
+        """Run the handler for one message in a worker and wait for its response."""
+        shared = _share(data) if len(data) >= self.shared_memory_threshold else None
+        try:
+            future = self.executor.submit(_run_handler, self.handler, connection_id,
+                                          None if shared else data, shared,
+                                          self.shared_memory_threshold)
+            response, shared_response = future.result()
+        finally:
+            if shared is not None:
+                _unlink(shared)
+
+        if shared_response is not None:
+            return _take(shared_response, unlink=True)
+        return response
+
+    def close(self) -> None:
+        """Stop the worker processes once queued messages are handled."""
+        self.executor.shutdown(wait=True)